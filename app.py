@@ -1,260 +1,311 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import re
-import requests
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import descargas
+import instantanea
+import cuotas
+import historial
+from cuotas import procesar_cuotas
+from equipos import indice as indice_equipos
+from jugadores import TablaJugadores, Paginador
+from buscador import IndiceJugadores, documentos_fbref, documentos_whoscored
+from modelo import ModeloGoles
+from rasgos import RasgosEquipos, ETIQUETAS_RADAR
+from render import radar_svg, forma_cache, html_tabla, html_cuotas, html_escaner, html_movimiento, html_cierre, html_cascada, insertar_probabilidades, tarjeta_pick, render_porcentaje, render_tendencia
+import datos
+import medicion
+import paginas
+import recursos
+import refresco
+from config import LIGAS_LISTA, MAPEO_ARCHIVOS, MAPEO_ODDS_API
 
 # ────────────────────────────────────────────────
 # CONFIGURACIÓN DE PÁGINA
 # ────────────────────────────────────────────────
 st.set_page_config(page_title="InsideBet", layout="wide")
 
+traza = medicion.iniciar_traza()
+
 try:
     API_KEY = st.secrets["odds_api_key"]
 except:
     API_KEY = None
 
-USER = "InsideBet" 
-REPO = "picks-top-web"
-BASE_URL = f"https://raw.githubusercontent.com/{USER}/{REPO}/main/datos_fbref"
-
-LIGAS_LISTA = ["Champions League", "Premier League", "La Liga", "Serie A", "Bundesliga", "Ligue 1", "Primeira Liga", "Eredivisie"]
-
-MAPEO_ARCHIVOS = {
-    "Premier League": "Premier_League", "La Liga": "La_Liga", "Serie A": "Serie_A",
-    "Bundesliga": "Bundesliga", "Ligue 1": "Ligue_1", "Primeira Liga": "Primeira_Liga",
-    "Eredivisie": "Eredivisie", "Champions League": "Champions_League"
-}
+# ────────────────────────────────────────────────
+# FUNCIONES DE CARGA Y PROCESAMIENTO
+# ────────────────────────────────────────────────
 
-MAPEO_ODDS_API = {
-    "Premier League": "soccer_epl", "La Liga": "soccer_spain_la_liga", "Serie A": "soccer_italy_serie_a",
-    "Bundesliga": "soccer_germany_bundesliga", "Ligue 1": "soccer_france_ligue_1",
-    "Primeira Liga": "soccer_portugal_primeira_liga", "Eredivisie": "soccer_netherlands_eredivisie",
-    "Champions League": "soccer_uefa_champions_league"
+# Memoria de cada tabla cargada (archivo -> tamaño), para el panel ?perf=1
+@st.cache_resource(show_spinner=False)
+def _memoria_tablas():
+    return {}
+
+def registrar(ruta_archivo, tipo, version, df):
+    if df is not None:
+        actual, sin_compactar = datos.memoria(df)
+        _memoria_tablas()[ruta_archivo] = {"TIPO": tipo, "VERSIÓN": version, "FILAS": len(df), "COLUMNAS": len(df.columns),
+                                           "KB": actual / 1024, "KB_SIN_COMPACTAR": sin_compactar / 1024}
+    return df
+
+# Un cargador cacheado por tipo; el parseo solo se repite cuando cambia la versión del archivo (ETag / contenido).
+# cache_resource: todas las sesiones leen el mismo DataFrame (tipos compactos de datos.compactar) en vez de una
+# copia deserializada por acceso; nadie lo modifica en sitio (cargar_excel entrega una copia superficial)
+@st.cache_resource(max_entries=50, show_spinner=False)
+def cargar_clasificacion(ruta_archivo, version, ruta_local):
+    medicion.anotar(cache="miss")
+    return registrar(ruta_archivo, "clasificacion", version, datos.leer(ruta_local, "clasificacion"))
+
+@st.cache_resource(max_entries=50, show_spinner=False)
+def cargar_stats(ruta_archivo, version, ruta_local):
+    medicion.anotar(cache="miss")
+    return registrar(ruta_archivo, "stats", version, datos.leer(ruta_local, "stats"))
+
+@st.cache_resource(max_entries=50, show_spinner=False)
+def cargar_fixture(ruta_archivo, version, ruta_local):
+    medicion.anotar(cache="miss")
+    return registrar(ruta_archivo, "fixture", version, datos.leer(ruta_local, "fixture"))
+
+@st.cache_resource(max_entries=50, show_spinner=False)
+def cargar_jugadores(ruta_archivo, version, ruta_local):
+    medicion.anotar(cache="miss")
+    return registrar(ruta_archivo, "jugadores", version, datos.leer(ruta_local, "jugadores"))
+
+@st.cache_resource(max_entries=50, show_spinner=False)
+def cargar_picks(ruta_archivo, version, ruta_local):
+    medicion.anotar(cache="miss")
+    return registrar(ruta_archivo, "picks", version, datos.leer(ruta_local, "picks"))
+
+@st.cache_resource(max_entries=50, show_spinner=False)
+def cargar_whoscored(ruta_archivo, version, ruta_local):
+    medicion.anotar(cache="miss")
+    return registrar(ruta_archivo, "whoscored", version, datos.leer(ruta_local, "whoscored"))
+
+@st.cache_resource(max_entries=50, show_spinner=False)
+def cargar_general(ruta_archivo, version, ruta_local):
+    medicion.anotar(cache="miss")
+    return registrar(ruta_archivo, "general", version, datos.leer(ruta_local, "general"))
+
+CARGADORES = {
+    "clasificacion": cargar_clasificacion, "stats": cargar_stats, "fixture": cargar_fixture,
+    "jugadores": cargar_jugadores, "picks": cargar_picks, "whoscored": cargar_whoscored, "general": cargar_general,
 }
 
-BANDERAS = {
-    "Champions League": "https://i.postimg.cc/XYHkj56d/7.png", "Premier League": "https://i.postimg.cc/v1L6Fk5T/1.png",
-    "La Liga": "https://i.postimg.cc/sByvcmbd/8.png", "Serie A": "https://i.postimg.cc/vDmxkPTQ/4.png",
-    "Bundesliga": "https://i.postimg.cc/vg0gDnqQ/3.png", "Ligue 1": "https://i.postimg.cc/7GHJx9NR/2.png",
-    "Primeira Liga": "https://i.postimg.cc/QH99xHcb/5.png", "Eredivisie": "https://i.postimg.cc/dLb77wB8/6.png"
-}
+def cargar_excel(ruta_archivo, tipo="general"):
+    if REFRESCADOR is not None: REFRESCADOR.usar(ruta_archivo, tipo)
+    with medicion.tramo(f"cargar_excel:{tipo}", archivo=ruta_archivo, cache="hit"):
+        try:
+            with medicion.tramo("revalidar", archivo=ruta_archivo):
+                version, ruta_local = instantanea.revalidar(ruta_archivo, tipo)
+        except Exception:
+            medicion.anotar(cache="error")
+            return None
+        df = CARGADORES[tipo](ruta_archivo, version, ruta_local)
+        # Copia superficial: comparte los datos (copy-on-write) y las columnas que añada la vista no llegan a la caché
+        return df.copy(deep=False) if df is not None else None
 
-TRADUCCIONES = {
-    'Rk': 'POS', 'Squad': 'EQUIPO', 'MP': 'PJ', 'W': 'G', 'D': 'E', 'L': 'P',
-    'GF': 'GF', 'GA': 'GC', 'GD': 'DG', 'Pts': 'PTS', 'PTS': 'PTS',
-    'Last 5': 'ÚLTIMOS 5', 'Wk': 'JORNADA', 'Date': 'FECHA', 'Time': 'HORA',
-    'Home': 'LOCAL', 'Away': 'VISITANTE', 'Venue': 'ESTADIO',
-    'Poss': 'POSESIÓN', 'Gls': 'GOLES', 'Ast': 'ASISTENCIAS', 
-    'CrdY': '🟨', 'CrdR': '🟥', 'xG': 'xG',
-    'Player': 'JUGADOR', 'Pos': 'POS', 'Min': 'MIN', 'Sh': 'REMATES', 'SoT': 'REMATES A PUERTA', 'Fls': 'FALTAS COMETIDAS', 'Fld': 'FALTAS RECIBIDAS'
-}
+# ────────────────────────────────────────────────
+# REFRESCO EN SEGUNDO PLANO (UNO POR PROCESO)
+# ────────────────────────────────────────────────
+# Archivos y cuotas se renuevan en un hilo aparte y los usuarios siempre reciben la última versión publicada.
+# INSIDEBET_REFRESCO=0 vuelve a la revalidación dentro de la petición.
+def calentar(usados):
+    for archivo, tipo in usados:
+        cargar_excel(archivo, tipo)
+
+@st.cache_resource(show_spinner=False)
+def _refrescador():
+    return refresco.Refrescador(calentar).iniciar()
+
+REFRESCADOR = _refrescador() if os.environ.get("INSIDEBET_REFRESCO") != "0" else None
+
+# Estructuras derivadas (cache_resource, compartidas entre sesiones y de solo lectura): se construyen
+# una vez por versión del archivo y cada vista las consulta directamente
+def cargar_derivado(ruta_archivo, construir, etapa):
+    with medicion.tramo(etapa, archivo=ruta_archivo, cache="hit"):
+        try:
+            version, ruta_local = instantanea.revalidar(ruta_archivo)
+        except Exception:
+            return None
+        return construir(ruta_archivo, version, ruta_local)
+
+# Órdenes por columna precalculados de cada SUPER_STATS
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _tabla_jugadores(ruta_archivo, version, ruta_local):
+    df = cargar_jugadores(ruta_archivo, version, ruta_local)
+    medicion.anotar(cache="miss")
+    return TablaJugadores(df) if df is not None else None
+
+def cargar_tabla_jugadores(ruta_archivo):
+    return cargar_derivado(ruta_archivo, _tabla_jugadores, "tabla_jugadores")
+
+# Top picks de cada liga ya limpios, deduplicados y ordenados
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _picks_por_liga(ruta_archivo, version, ruta_local):
+    df = cargar_picks(ruta_archivo, version, ruta_local)
+    medicion.anotar(cache="miss")
+    return datos.particionar_picks(df) if df is not None else None
+
+def picks_por_liga():
+    return cargar_derivado("picks_finales_fiables.xlsx", _picks_por_liga, "picks_por_liga")
+
+# Plantillas de WhoScored por (liga, equipo)
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _plantillas(ruta_archivo, version, ruta_local):
+    df = cargar_whoscored(ruta_archivo, version, ruta_local)
+    medicion.anotar(cache="miss")
+    return datos.Plantillas(df, indice_equipos()) if df is not None else None
+
+def plantillas():
+    return cargar_derivado("jugadoreswhoscored.xlsx", _plantillas, "plantillas")
+
+# Derivados de CLASIFICACION + RESUMEN_STATS de una liga (las stats son opcionales)
+def cargar_derivado_liga(liga_nombre, construir, etapa):
+    sufijo = MAPEO_ARCHIVOS.get(liga_nombre)
+    archivo_clas, archivo_stats = f"CLASIFICACION_LIGA_{sufijo}.xlsx", f"RESUMEN_STATS_{sufijo}.xlsx"
+    with medicion.tramo(etapa, liga=liga_nombre, cache="hit"):
+        try:
+            clas = instantanea.revalidar(archivo_clas, "clasificacion")
+        except Exception:
+            return None
+        try:
+            stats = instantanea.revalidar(archivo_stats, "stats")
+        except Exception:
+            stats = (None, None)
+        return construir(archivo_clas, *clas, archivo_stats, *stats)
+
+def _construir_liga(clase, archivo_clas, version_clas, ruta_clas, archivo_stats, version_stats, ruta_stats):
+    medicion.anotar(cache="miss")
+    df_clas = cargar_clasificacion(archivo_clas, version_clas, ruta_clas)
+    df_stats = cargar_stats(archivo_stats, version_stats, ruta_stats) if version_stats else None
+    try:
+        return clase(df_clas, df_stats)
+    except Exception:
+        return None
 
-MAPEO_POSICIONES = {
-    'FW': 'DEL', 'MF': 'MED', 'DF': 'DEF', 'GK': 'POR',
-    'FW,MF': 'DEL/MED', 'MF,FW': 'MED/DEL', 'DF,MF': 'DEF/MED', 'MF,DF': 'MED/DEF'
-}
+# Modelo Poisson de la liga
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _modelo_goles(*archivos):
+    return _construir_liga(ModeloGoles, *archivos)
+
+def modelo_goles(liga_nombre):
+    return cargar_derivado_liga(liga_nombre, _modelo_goles, "modelo_goles")
+
+# Rasgos por equipo (radar, confianza, pts/PJ, forma) para H2H e índice de confianza
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _rasgos_equipos(*archivos):
+    return _construir_liga(RasgosEquipos, *archivos)
+
+def rasgos_equipos(liga_nombre):
+    return cargar_derivado_liga(liga_nombre, _rasgos_equipos, "rasgos_equipos")
+
+# Índice de búsqueda de todas las ligas: solo se reconstruye si cambia la versión de algún archivo
+ARCHIVOS_BUSQUEDA = [(f"SUPER_STATS_{MAPEO_ARCHIVOS[l]}.xlsx", l) for l in LIGAS_LISTA] + [("jugadoreswhoscored.xlsx", None)]
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _indice_busqueda(versiones):
+    docs = []
+    for (archivo, liga), (version, ruta_local) in zip(ARCHIVOS_BUSQUEDA, versiones):
+        if version is None: continue
+        if liga is None:
+            df = cargar_whoscored(archivo, version, ruta_local)
+            docs.append(documentos_whoscored(df) if df is not None else None)
+        else:
+            df = cargar_jugadores(archivo, version, ruta_local)
+            docs.append(documentos_fbref(df, liga) if df is not None else None)
+    medicion.anotar(cache="miss")
+    return IndiceJugadores(docs)
+
+def indice_busqueda():
+    with medicion.tramo("indice_busqueda", cache="hit"):
+        versiones = []
+        for archivo, liga in ARCHIVOS_BUSQUEDA:
+            try:
+                versiones.append(instantanea.revalidar(archivo, "jugadores" if liga else "whoscored"))
+            except Exception:
+                versiones.append((None, None))
+        return _indice_busqueda(tuple(versiones))
 
 # ────────────────────────────────────────────────
-# FUNCIONES DE FORMATO (ORIGINALES SIN TOCAR)
+# PRECARGA CONCURRENTE
 # ────────────────────────────────────────────────
+ARCHIVOS_COMUNES = [("picks_finales_fiables.xlsx", "picks"), ("jugadoreswhoscored.xlsx", "whoscored")]
 
-def limpiar_nombre_equipo(nombre):
-    if pd.isna(nombre) or str(nombre).lower() == 'nan': return ""
-    txt = str(nombre).strip()
-    txt = re.sub(r'^[a-z]{2,3}\s+', '', txt, flags=re.IGNORECASE)
-    txt = re.sub(r'\s+[a-z]{2,3}$', '', txt, flags=re.IGNORECASE)
-    return txt.strip()
+def archivos_liga(liga):
+    sufijo = MAPEO_ARCHIVOS.get(liga)
+    return [
+        (f"CLASIFICACION_LIGA_{sufijo}.xlsx", "clasificacion"), (f"RESUMEN_STATS_{sufijo}.xlsx", "stats"),
+        (f"SUPER_STATS_{sufijo}.xlsx", "jugadores"), (f"CARTELERA_PROXIMOS_{sufijo}.xlsx", "fixture"),
+    ] + ARCHIVOS_COMUNES
 
-def formatear_xg_badge(val):
-    try:
-        num = float(val)
-        color = "#137031" if num > 1.50 else "#821f1f"
-        return f'<div style="display: flex; justify-content: center;"><span style="background-color: {color}; color: white; padding: 4px 10px; border-radius: 6px; font-weight: bold; font-size: 12px; min-width: 45px; text-align: center;">+{num:.1f}</span></div>'
-    except: return val
+@st.cache_resource(show_spinner=False)
+def _pool_precarga():
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="precarga")
 
-def html_barra_posesion(valor):
-    try:
-        num_str = str(valor).replace('%', '').strip()
-        num_clean = re.findall(r"[-+]?\d*\.\d+|\d+", num_str)[0]
-        num = float(num_clean)
-        percent = min(max(int(num), 0), 100)
-        return f'''
-        <div style="position: relative; width: 100%; background-color: #2d3139; border-radius: 4px; height: 20px; overflow: hidden; border: 1px solid #4b5563;">
-            <div style="width: {percent}%; background-color: #1ed7de; height: 100%;"></div>
-            <div style="position: absolute; top: 0; left: 0; width: 100%; height: 100%; display: flex; align-items: center; justify-content: center; color: white; font-size: 11px; font-weight: bold; text-shadow: 1px 1px 2px black;">
-                {percent}%
-            </div>
-        </div>
-        '''
-    except: return valor
-
-def grafico_picos_forma(valor, alineacion="left"):
-    if pd.isna(valor) or valor == "": return ""
-    letras = list(str(valor).upper().replace(" ", ""))[:5]
-    if not letras: return ""
-    mapeo_y = {'W': 4, 'D': 11, 'L': 18}
-    colores_puntos = {'W': '#137031', 'D': '#b59410', 'L': '#821f1f'}
-    puntos_coords = []
-    puntos_svg = []
-    for i, l in enumerate(letras):
-        x = 10 + (i * 25) 
-        y = mapeo_y.get(l, 11)
-        puntos_coords.append(f"{x},{y}")
-        puntos_svg.append(f'<circle cx="{x}" cy="{y}" r="3" fill="{colores_puntos.get(l, "#4b5563")}" stroke="#0e1117" stroke-width="0.5" />')
-    path_d = "M " + " L ".join(puntos_coords)
-    svg = f'''
-    <div style="width: 100%; height: 30px; display: flex; align-items: center; justify-content: {'flex-start' if alineacion=='left' else 'flex-end'};">
-        <svg width="130" height="22" viewBox="0 0 130 22" preserveAspectRatio="xMidYMid meet">
-            <path d="{path_d}" fill="none" stroke="#1ed7de" stroke-width="1.2" stroke-linecap="round" stroke-linejoin="round" opacity="0.4" />
-            {''.join(puntos_svg)}
-        </svg>
-    </div>
-    '''
-    return svg
-
-def generar_radar_svg(val_l, val_v, labels):
-    size = 200
-    center = size / 2
-    radius = 70
-    def get_coords(value, angle, max_val=100):
-        v = float(value) if pd.notna(value) else 0
-        r = (min(v, max_val) / max_val) * radius
-        x = center + r * np.cos(angle - np.pi/2)
-        y = center + r * np.sin(angle - np.pi/2)
-        return f"{x},{y}"
-    angles = np.linspace(0, 2*np.pi, len(labels), endpoint=False)
-    grid = ""
-    for r_f in [0.25, 0.5, 0.75, 1.0]:
-        pts = [f"{center + (radius*r_f)*np.cos(a-np.pi/2)},{center + (radius*r_f)*np.sin(a-np.pi/2)}" for a in angles]
-        grid += f'<polygon points="{" ".join(pts)}" fill="none" stroke="#4b5563" stroke-width="0.5" stroke-dasharray="2,2" />'
-    pts_l = [get_coords(v, a) for v, a in zip(val_l, angles)]
-    pts_v = [get_coords(v, a) for v, a in zip(val_v, angles)]
-    radar = f'''
-    <svg width="100%" height="{size}" viewBox="0 0 {size} {size}">
-        {grid}
-        <polygon points="{" ".join(pts_l)}" fill="#1ed7de22" stroke="#1ed7de" stroke-width="2" />
-        <polygon points="{" ".join(pts_v)}" fill="#b5941022" stroke="#b59410" stroke-width="2" />
-        {''.join([f'<text x="{center + (radius+20)*np.cos(a-np.pi/2)}" y="{center + (radius+20)*np.sin(a-np.pi/2)}" fill="#9ca3af" font-size="9" text-anchor="middle">{l}</text>' for l, a in zip(labels, angles)])}
-    </svg>
-    '''
-    return radar
-
-def formatear_last_5(valor):
-    if pd.isna(valor) or valor == "": return ""
-    trad = {'W': 'G', 'L': 'P', 'D': 'E'}
-    letras = list(str(valor).upper().replace(" ", ""))[:5]
-    html_str = '<div style="display: flex; gap: 4px; justify-content: center;">'
-    for l in letras:
-        clase_color = "#137031" if l == 'W' else "#821f1f" if l == 'L' else "#82711f" if l == 'D' else "#2d3139"
-        html_str += f'<span style="background-color: {clase_color}; color: white; padding: 2px 6px; border-radius: 4px; font-size: 11px; font-weight: bold; min-width: 20px; text-align: center;">{trad.get(l, l)}</span>'
-    return html_str + '</div>'
+# Lanza la descarga + parseo de todos los archivos en paralelo; cargar_excel espera por clave si ya está en curso
+def precargar(archivos):
+    pool = _pool_precarga()
+    return [pool.submit(cargar_excel, archivo, tipo) for archivo, tipo in dict.fromkeys(archivos)]
 
-# ────────────────────────────────────────────────
-# FUNCIONES DE CARGA Y PROCESAMIENTO
-# ────────────────────────────────────────────────
+def precargar_liga(liga):
+    return precargar(archivos_liga(liga))
 
-@st.cache_data(ttl=300)
-def cargar_excel(ruta_archivo, tipo="general"):
-    if "picks_finales_fiables" in ruta_archivo:
-        url = f"{BASE_URL}/{ruta_archivo}"
-    elif "SUPER_STATS" in ruta_archivo:
-        url = f"{BASE_URL}/Estadisticas_Jugadores/{ruta_archivo}"
-    else:
-        url = f"{BASE_URL}/{ruta_archivo}"
-        
-    try:
-        # Se añade soporte para el CSV de scrapeo
-        if ruta_archivo.endswith('.csv'):
-            df = pd.read_csv(url)
-        else:
-            df = pd.read_excel(url)
-            
-        if 'Home' in df.columns and 'Away' in df.columns:
-            df = df.dropna(subset=['Home', 'Away'], how='all')
-        if tipo == "stats":
-            if 'Squad' in df.columns:
-                df['Squad'] = df['Squad'].apply(limpiar_nombre_equipo)
-            if len(df.columns) >= 17:
-                df = df.rename(columns={df.columns[16]: 'xG'})
-            df['xG_val'] = df['xG'].fillna(0)
-            if 'Poss' in df.columns:
-                df['Poss_num'] = df['Poss'].apply(lambda x: re.findall(r"\d+", str(x))[0] if re.findall(r"\d+", str(x)) else "0")
-                df['Poss'] = df['Poss'].apply(html_barra_posesion)
-            if 'xG' in df.columns: df['xG'] = df['xG'].apply(formatear_xg_badge)
-            cols_ok = ['Squad', 'MP', 'Poss', 'Poss_num', 'Gls', 'Ast', 'CrdY', 'CrdR', 'xG', 'xG_val']
-            df = df[[c for c in cols_ok if c in df.columns]]
-            df = df.rename(columns=TRADUCCIONES)
-        elif tipo == "clasificacion":
-            if 'Squad' in df.columns:
-                df['Squad'] = df['Squad'].apply(limpiar_nombre_equipo)
-            drop_c = ['Notes', 'Goalkeeper', 'Top Team Scorer', 'Attendance', 'Pts/MP', 'Pts/PJ']
-            df = df.drop(columns=[c for c in drop_c if c in df.columns])
-            df = df.rename(columns=TRADUCCIONES)
-            if 'EQUIPO' in df.columns:
-                df = df[df['EQUIPO'] != ""]
-            cols = list(df.columns)
-            if 'EQUIPO' in cols and 'PTS' in cols:
-                cols.remove('PTS')
-                idx = cols.index('EQUIPO')
-                cols.insert(idx + 1, 'PTS')
-                df = df[cols]
-        elif tipo == "fixture":
-            drop_f = ['Round', 'Day', 'Score', 'Referee', 'Match Report', 'Notes', 'Attendance', 'Wk']
-            df = df.drop(columns=[c for c in drop_f if c in df.columns])
-            df = df.rename(columns=TRADUCCIONES)
-            if 'LOCAL' in df.columns:
-                df['LOCAL'] = df['LOCAL'].apply(limpiar_nombre_equipo)
-            if 'VISITANTE' in df.columns:
-                df['VISITANTE'] = df['VISITANTE'].apply(limpiar_nombre_equipo)
-            df = df[df['LOCAL'] != ""]
-            if 'FECHA' in df.columns: 
-                df['FECHA'] = df['FECHA'].apply(lambda x: str(x).split(' ')[0] if pd.notna(x) else "TBD")
-            if 'HORA' in df.columns: 
-                df['HORA'] = df['HORA'].fillna("Por definir")
-        return df.dropna(how='all').reset_index(drop=True)
-    except: 
-        return None
+@st.cache_resource(show_spinner=False)
+def _precalentar_todas():
+    return precargar([a for liga in LIGAS_LISTA for a in archivos_liga(liga)])
+
+# Calentamiento opcional al arrancar el proceso: INSIDEBET_PRECALENTAR=1
+if os.environ.get("INSIDEBET_PRECALENTAR") == "1":
+    _precalentar_todas()
 
 def obtener_cuotas_api(liga_nombre):
-    sport_key = MAPEO_ODDS_API.get(liga_nombre)
-    if not sport_key or not API_KEY: return None
-    url = f"https://api.the-odds-api.com/v4/sports/{sport_key}/odds/"
-    params = {'apiKey': API_KEY, 'regions': 'eu', 'markets': 'h2h', 'oddsFormat': 'decimal'}
-    try:
-        response = requests.get(url, params=params)
-        return response.json()
-    except: return None
-
-def badge_cuota(val, es_minimo=False, tiene_valor=False):
-    color_bg = "#b59410" if tiene_valor else ("#137031" if es_minimo else "#2d3139")
-    color_text = "white" if tiene_valor else ("#00ff88" if es_minimo else "#ced4da")
-    label = " ⭐" if tiene_valor else ""
-    return f'<div style="display: flex; justify-content: center;"><span style="background-color: {color_bg}; color: {color_text}; padding: 5px 12px; border-radius: 6px; font-weight: bold; font-size: 13px; min-width: 60px; text-align: center; border: 1px solid #4b5563;">{val:.2f}{label}</span></div>'
-
-def procesar_cuotas(data, df_clas):
-    if not data or not isinstance(data, list): return None
-    rows = []
-    puntos_dict = pd.Series(df_clas.PTS.values, index=df_clas.EQUIPO).to_dict() if df_clas is not None else {}
-    for match in data:
-        home, away = match.get('home_team'), match.get('away_team')
-        commence = pd.to_datetime(match.get('commence_time')).strftime('%d/%m %H:%M')
-        h, d, a = 0.0, 0.0, 0.0
-        if match.get('bookmakers'):
-            bk = next((b for b in match['bookmakers'] if b['key'].lower() == 'bet365'), match['bookmakers'][0])
-            outcomes = bk['markets'][0]['outcomes']
-            for o in outcomes:
-                if o['name'] == home: h = float(o['price'])
-                elif o['name'] == away: a = float(o['price'])
-                else: d = float(o['price'])
-        val_h = False
-        if home in puntos_dict and away in puntos_dict:
-            pts_h, pts_a = puntos_dict[home], puntos_dict[away]
-            prob_est = (pts_h + 5) / (pts_h + pts_a + 10)
-            if h > ((1/prob_est) * 1.15): val_h = True
-        rows.append({"FECHA": commence, "LOCAL": home, "VISITANTE": away, "1": h, "X": d, "2": a, "VAL_H": val_h})
-    return pd.DataFrame(rows)
+    with medicion.tramo("obtener_cuotas_api", liga=liga_nombre):
+        peticiones = cuotas.contadores["peticiones"]
+        raw = cuotas.obtener(MAPEO_ODDS_API.get(liga_nombre), API_KEY)
+        medicion.anotar(api="peticion" if cuotas.contadores["peticiones"] > peticiones else "cache")
+        return raw
+
+# Escáner de todas las ligas: las peticiones a la API salen a la vez y, mientras tanto, se precargan
+# clasificaciones y stats; cada respuesta se cruza con su clasificación y su modelo de goles
+def escanear_ligas():
+    with medicion.tramo("escaner_valor"):
+        ligas = [l for l in LIGAS_LISTA if MAPEO_ODDS_API.get(l)]
+        precargar([a for l in ligas for a in archivos_liga(l)[:2]])
+        with medicion.tramo("obtener_cuotas_api", liga="todas"):
+            peticiones = cuotas.contadores["peticiones"]
+            raws = cuotas.obtener_varias([MAPEO_ODDS_API[l] for l in ligas], API_KEY)
+            medicion.anotar(api="peticion" if cuotas.contadores["peticiones"] > peticiones else "cache")
+        por_liga = []
+        for l in ligas:
+            df_clas = cargar_excel(f"CLASIFICACION_LIGA_{MAPEO_ARCHIVOS[l]}.xlsx", "clasificacion")
+            df = procesar_cuotas(raws.get(MAPEO_ODDS_API[l]), df_clas)
+            if df is None or df.empty: continue
+            modelo = modelo_goles(l)
+            por_liga.append((l, df, modelo.partidos_por_id(df['ID_LOCAL'], df['ID_VISITANTE']) if modelo is not None else None))
+        return cuotas.tabla_valor(por_liga)
+
+# Un rerun solo de fragmento no llega al panel de rendimiento del final: el fragmento pinta su propia cascada
+def cascada_fragmento(traza):
+    if st.query_params.get("perf") == "1":
+        st.markdown(html_cascada(traza), unsafe_allow_html=True)
+
+# "Ver más" solo vuelve a ejecutar este fragmento y añade la página siguiente al HTML ya generado
+BOTONES_PAGINA = {"ataque": ("Ver más jugadores (Ataque)", "btn_atk"), "disciplina": ("Ver más jugadores (Disciplina)", "btn_disc")}
+
+@st.fragment
+@medicion.medido("fragmento:paginas", cascada_fragmento)
+def tabla_jugadores_paginada(tabla, pestana, mask, clave_filtro, primera=None):
+    pag = st.session_state.get(f"pag_{pestana}")
+    if pag is None or pag.tabla is not tabla or pag.clave != clave_filtro:
+        pag = st.session_state[f"pag_{pestana}"] = Paginador(tabla, pestana, mask, clave_filtro)
+    with medicion.tramo(f"to_html:{pestana}"):
+        html = primera if primera is not None and len(pag.paginas) == 1 else pag.html()
+    st.markdown(f'<div class="table-container">{html}</div>', unsafe_allow_html=True)
+    if pag.hay_mas():
+        etiqueta, clave_btn = BOTONES_PAGINA[pestana]
+        st.button(etiqueta, key=clave_btn, on_click=pag.siguiente)
 
 # ────────────────────────────────────────────────
 # ESTILOS CSS
@@ -304,20 +355,297 @@ st.markdown("""
     .card-stat-item { text-align: center; }
     .card-stat-val { font-size: 1.1rem; font-weight: bold; color: #e5e7eb; display: block; margin-bottom: 4px; }
     .card-stat-lbl { font-size: 0.65rem; color: #9ca3af; text-transform: uppercase; letter-spacing: 0.5px; }
+    .icono-tiro { display: block; width: 45px; height: 45px; margin-bottom: 2px; background: center / contain no-repeat; }
+    .escudo { width: 20px; height: 20px; object-fit: contain; vertical-align: middle; margin-right: 6px; }
 </style>
 """, unsafe_allow_html=True)
+st.markdown(f"<style>{recursos.css()}</style>", unsafe_allow_html=True)
+
+# ────────────────────────────────────────────────
+# VISTAS Y PANELES (FRAGMENTOS)
+# ────────────────────────────────────────────────
+# Cada vista y cada panel de Picks & Cuotas es un st.fragment: un widget de dentro solo vuelve a ejecutar
+# su fragmento (sin CSS, cabecera ni las demás vistas). Cada uno carga lo que necesita de las cachés compartidas.
+@st.fragment
+@medicion.medido("fragmento:players", cascada_fragmento)
+def vista_jugadores(liga):
+    sufijo = MAPEO_ARCHIVOS.get(liga)
+    st.markdown(f"#### 👤 Rendimiento Individual - {liga}")
+
+    # --- SECCIÓN TOP PICKS CON CONFIANZA ---
+    pagina = paginas.obtener(liga, "players", cargar_excel)
+    if pagina is not None:
+        cartas = pagina["picks"]
+    else:
+        picks = picks_por_liga()
+        top_6 = picks.get(sufijo, pd.DataFrame()) if picks is not None else pd.DataFrame()
+        cartas = [tarjeta_pick(row) for _, row in top_6.iterrows()]
+    if cartas:
+        st.markdown("##### 🔥 TOP PICKS DE ÉLITE (Algoritmo IA)")
+        p_cols = st.columns(3)
+        for idx, carta in enumerate(cartas):
+            with p_cols[idx % 3]:
+                st.markdown(carta, unsafe_allow_html=True)
+
+        # LEYENDA ACTUALIZADA CON COLORES SEMÁFORO
+        st.markdown("""
+                        <div class="leyenda-grid" style="margin-bottom:25px;">
+                            <div class="leyenda-item">
+                                <span style="color:#b59410; font-weight:bold; font-size:1.1rem;">% Confianza:</span>
+                                <span>Muestra la probabilidad de éxito basándose en la regularidad del jugador en sus últimos partidos.</span>
+                            </div>
+                            <div class="leyenda-item">
+                                <span style="color:#1ed7de; font-weight:bold; font-size:1.1rem;">Fiabilidad:</span>
+                                <span>Indica la solidez del pick según el histórico de minutos jugados; a mayor fiabilidad, más estable es el dato. 
+                                <span style="color:#FF3131; font-weight:bold;">Baja</span> - 
+                                <span style="color:#FFFF00; font-weight:bold;">Media</span> - 
+                                <span style="color:#39FF14; font-weight:bold;">Alta</span></span>
+                            </div>
+                        </div>
+                        """, unsafe_allow_html=True)
+
+    # --- TABLAS DE JUGADORES ---
+    tabla_p = cargar_tabla_jugadores(f"SUPER_STATS_{sufijo}.xlsx")
+    if tabla_p is not None:
+        f_col1, f_col2, f_col4 = st.columns([2, 2, 2])
+        with f_col1:
+            eq_list = ["Todos"] + tabla_p.equipos
+            eq_f = st.selectbox("Filtrar por Equipo", eq_list)
+        with f_col2:
+            p_sel = st.multiselect("Posiciones", tabla_p.posiciones, default=tabla_p.posiciones)
+        with f_col4:
+            p_busq = st.text_input("🔍 Buscar Jugador", "").strip().lower()
+
+        mask = tabla_p.filtrar(p_sel, eq_f, p_busq)
+        clave_filtro = (tuple(p_sel), eq_f, p_busq)
+        # Con los filtros por defecto la primera página de cada pestaña ya está prerenderizada
+        por_defecto = pagina if pagina is not None and clave_filtro == (tuple(tabla_p.posiciones), "Todos", "") else {}
+
+        t1, t2 = st.tabs(["🎯 ATAQUE & REMATES", "🛡️ DISCIPLINA"])
+
+        with t1:
+            tabla_jugadores_paginada(tabla_p, "ataque", mask, clave_filtro, por_defecto.get("ataque"))
+
+        with t2:
+            tabla_jugadores_paginada(tabla_p, "disciplina", mask, clave_filtro, por_defecto.get("disciplina"))
+
+        if p_busq:
+            df_otras = indice_busqueda().buscar(p_busq, limite=10)
+            if not df_otras.empty:
+                st.markdown("##### 🌍 Coincidencias en todas las ligas")
+                df_otras = df_otras[['JUGADOR', 'EQUIPO', 'LIGA', 'FUENTE']]
+                with medicion.tramo("to_html:busqueda"):
+                    html = df_otras.style.hide(axis="index").to_html(escape=False)
+                st.markdown(f'<div class="table-container">{html}</div>', unsafe_allow_html=True)
+    else: st.info("ℹ️ Datos de jugadores no disponibles.")
+
+@st.fragment
+@medicion.medido("fragmento:h2h", cascada_fragmento)
+def panel_h2h(liga):
+    sufijo = MAPEO_ARCHIVOS.get(liga)
+    df_clas_base = cargar_excel(f"CLASIFICACION_LIGA_{sufijo}.xlsx", "clasificacion")
+    df_stats_base = cargar_excel(f"RESUMEN_STATS_{sufijo}.xlsx", "stats")
+    if st.button("⚔️ COMPARADOR H2H", use_container_width=True):
+        st.session_state.h2h_op = not st.session_state.h2h_op
+    if st.session_state.h2h_op and df_clas_base is not None and df_stats_base is not None:
+        equipos = sorted(df_clas_base['EQUIPO'].unique())
+        f1, f2, f3 = st.columns([2, 2, 1])
+        eq_l = f1.selectbox("Equipo Local", equipos, index=0)
+        eq_v = f2.selectbox("Equipo Visitante", equipos, index=min(1, len(equipos)-1))
+        tipo_filtro = f3.selectbox("Filtro Stats", ["Global", "Local vs Visitante"])
+        try:
+            rs = rasgos_equipos(liga)
+            if not (rs.completo(eq_l) and rs.completo(eq_v)): raise KeyError(eq_l)
+            d_l, d_v = rs.fila(eq_l), rs.fila(eq_v)
+            radar_l, radar_v = rs.radar(eq_l), rs.radar(eq_v)
+            # Cruce del modelo Poisson (local = primer equipo)
+            modelo = modelo_goles(liga)
+            p_m = modelo.partido(eq_l, eq_v) if modelo is not None else None
+            fila_h2h = '<div style="display:flex; justify-content:space-between; border-bottom:1px solid #2d3139; padding:8px 0;">'
+            filas_modelo = "" if p_m is None else f"""{fila_h2h}<span>{p_m['XG_LOCAL']:.2f}</span><span style="color:#9ca3af; font-size:0.8rem;">GOLES ESPERADOS</span><span>{p_m['XG_VISITANTE']:.2f}</span></div>{fila_h2h}<span style="color:#1ed7de; font-weight:bold;">{p_m['1']:.0%}</span><span style="color:#9ca3af; font-size:0.8rem;">PROB. VICTORIA (EMPATE {p_m['X']:.0%})</span><span style="color:#1ed7de; font-weight:bold;">{p_m['2']:.0%}</span></div>{fila_h2h}<span>{p_m['O2.5']:.0%}</span><span style="color:#9ca3af; font-size:0.8rem;">+2.5 GOLES · AMBOS MARCAN</span><span>{p_m['BTTS']:.0%}</span></div>"""
+            c1, c2 = st.columns([1, 2])
+            with c1:
+                st.markdown(radar_svg(radar_l, radar_v, ETIQUETAS_RADAR), unsafe_allow_html=True)
+                st.markdown(f'<div style="text-align:center; font-size:10px;"><span style="color:#1ed7de">■ {eq_l}</span> <span style="color:#b59410">■ {eq_v}</span></div>', unsafe_allow_html=True)
+            with c2:
+                st.markdown(f"""<div style="background:#1f2937; padding:15px; border-radius:12px; border:1px solid #1ed7de44;"><div style="display:flex; justify-content:space-between; border-bottom:1px solid #2d3139; padding:8px 0;"><span style="color:#1ed7de; font-weight:bold;">{d_l['PTS']:g}</span><span style="color:#9ca3af; font-size:0.8rem;">PUNTOS</span><span style="color:#1ed7de; font-weight:bold;">{d_v['PTS']:g}</span></div><div style="display:flex; justify-content:space-between; border-bottom:1px solid #2d3139; padding:8px 0;"><span>{d_l['G']:g}</span><span style="color:#9ca3af; font-size:0.8rem;">VICTORIAS</span><span>{d_v['G']:g}</span></div><div style="display:flex; justify-content:space-between; border-bottom:1px solid #2d3139; padding:8px 0;"><span>{d_l['xG']:.1f}</span><span style="color:#9ca3af; font-size:0.8rem;">xG</span><span>{d_v['xG']:.1f}</span></div>{filas_modelo}<div style="margin-top:15px; display:flex; justify-content:space-between;">{forma_cache(d_l['ÚLTIMOS 5'], "left")}<span style="color:#9ca3af; font-size:0.8rem;">FORMA</span>{forma_cache(d_v['ÚLTIMOS 5'], "right")}</div></div>""", unsafe_allow_html=True)
+        except: st.warning("Faltan datos para la comparativa.")
+        st.divider()
+
+@st.fragment
+@medicion.medido("fragmento:confianza", cascada_fragmento)
+def panel_confianza(liga):
+    sufijo = MAPEO_ARCHIVOS.get(liga)
+    df_clas_base = cargar_excel(f"CLASIFICACION_LIGA_{sufijo}.xlsx", "clasificacion")
+    df_stats_base = cargar_excel(f"RESUMEN_STATS_{sufijo}.xlsx", "stats")
+    if st.button("🎯 ÍNDICE DE CONFIANZA", use_container_width=True):
+        st.session_state.conf_op = not st.session_state.conf_op
+    if st.session_state.conf_op and df_clas_base is not None and df_stats_base is not None:
+        equipos = sorted(df_clas_base['EQUIPO'].unique())
+        eq_sel = st.selectbox("Selecciona equipo", equipos)
+        try:
+            rs = rasgos_equipos(liga)
+            c_r = rs.fila(eq_sel)
+            if not np.isfinite(c_r['PORC']): raise KeyError(eq_sel)
+            perc = int(c_r['PORC'])
+            st.markdown(f"""
+                        <div style="background:#161b22; padding:20px; border-radius:12px; border:1px solid #1ed7de;">
+                            <h4 style="color:#1ed7de; margin-top:0;">{eq_sel} - Reporte de Confianza</h4>
+                            <div style="display:flex; align-items:center; gap:15px; margin:15px 0;">
+                                <div style="flex:1; background:#2d3139; height:12px; border-radius:6px; overflow:hidden;">
+                                    <div style="width:{perc}%; background:#1ed7de; height:100%;"></div>
+                                </div>
+                                <span style="font-weight:bold; color:#1ed7de;">{perc}%</span>
+                            </div>
+                            <p style="font-size:0.9rem; color:#9ca3af; margin:0;"><b>Factor xG:</b> {c_r['xG']:.1f} | <b>Puntos/PJ:</b> {c_r['PTS_PJ']:.2f}</p>
+                        </div>
+                        """, unsafe_allow_html=True)
+
+            # Ranking de toda la liga: sale de la misma matriz, sin coste extra
+            st.markdown(f"##### 🏆 Ranking de Confianza - {liga}")
+            df_rank = rs.ranking()
+            df_rank['CONFIANZA'] = render_porcentaje(df_rank['CONFIANZA'] / 100)
+            df_rank['PTS/PJ'] = df_rank['PTS/PJ'].map(lambda v: f"{v:.2f}")
+            with medicion.tramo("to_html:ranking"):
+                html = html_tabla(df_rank)
+            st.markdown(f'<div class="table-container">{html}</div>', unsafe_allow_html=True)
+        except: st.error("No se pudo calcular.")
+        st.divider()
+
+@st.fragment
+@medicion.medido("fragmento:escaner", cascada_fragmento)
+def panel_escaner():
+    if st.button("🌍 ESCÁNER DE VALOR (TODAS LAS LIGAS)", use_container_width=True):
+        st.session_state.escaner_op = not st.session_state.escaner_op
+    if st.session_state.escaner_op:
+        df_valor = escanear_ligas()
+        if df_valor is not None:
+            if st.checkbox("Solo value bets (⭐)", key="solo_valor"):
+                df_valor = df_valor[df_valor['VALOR']]
+            with medicion.tramo("to_html:escaner"):
+                html = html_escaner(df_valor)
+            st.markdown(f'<div class="table-container">{html}</div>', unsafe_allow_html=True)
+        else:
+            st.info("No hay cuotas disponibles ahora mismo.")
+        st.divider()
+
+@st.fragment
+@medicion.medido("fragmento:cuotas", cascada_fragmento)
+def panel_cuotas(liga):
+    sufijo = MAPEO_ARCHIVOS.get(liga)
+    df_clas_base = cargar_excel(f"CLASIFICACION_LIGA_{sufijo}.xlsx", "clasificacion")
+    st.subheader("📊 Picks & Cuotas")
+    raw = obtener_cuotas_api(liga)
+    with medicion.tramo("procesar_cuotas"):
+        df_odds = procesar_cuotas(raw, df_clas_base)
+    if df_odds is not None and not df_odds.empty:
+        modelo = modelo_goles(liga)
+        prob = modelo.partidos_por_id(df_odds['ID_LOCAL'], df_odds['ID_VISITANTE']) if modelo is not None else None
+        df_odds['TENDENCIA'] = render_tendencia(prob['O2.5'] if prob is not None else np.full(len(df_odds), np.nan))
+        with medicion.tramo("to_html:odds"):
+            html = html_cuotas(df_odds)
+        st.markdown(f'<div class="table-container">{html}</div>', unsafe_allow_html=True)
+        st.markdown("""<div class="leyenda-grid"><div class="leyenda-item"><div class="color-box" style="background:#b59410;"></div><span><b>Value Bet (⭐):</b> Valor Estadístico.</span></div><div class="leyenda-item"><div class="color-box" style="background:#137031;"></div><span><b>Favorito:</b> Más probable.</span></div><div class="leyenda-item"><span style="color:#1ed7de; font-weight:bold;">🔥 Over:</span><span>+2.5 Goles (probabilidad del modelo Poisson).</span></div><div class="leyenda-item"><span style="color:#9ca3af; font-weight:bold;">🛡️ Under:</span><span>-2.5 Goles.</span></div></div>""", unsafe_allow_html=True)
+
+        # Movimiento de línea desde el historial local: no gasta créditos de la API
+        if st.button("📈 MOVIMIENTO DE CUOTAS", use_container_width=True):
+            st.session_state.movimiento_op = not st.session_state.movimiento_op
+        if st.session_state.movimiento_op:
+            sport_key = MAPEO_ODDS_API.get(liga)
+            try:
+                with medicion.tramo("historial:movimiento"):
+                    mov = historial.movimiento(sport_key, df_odds['ID'])
+                with medicion.tramo("to_html:movimiento"):
+                    html = html_movimiento(df_odds, mov)
+                st.markdown(f'<div class="table-container">{html}</div>', unsafe_allow_html=True)
+                with medicion.tramo("historial:cierre"):
+                    df_cierre = historial.cierre(sport_key)
+                if df_cierre is not None:
+                    st.markdown("##### ⏱️ Cierre y CLV (partidos ya empezados)")
+                    st.markdown(f'<div class="table-container">{html_cierre(df_cierre)}</div>', unsafe_allow_html=True)
+            except: st.info("ℹ️ Historial de cuotas no disponible.")
+
+def vista_cuotas(liga):
+    panel_h2h(liga)
+    panel_confianza(liga)
+    panel_escaner()
+    panel_cuotas(liga)
+
+@st.fragment
+@medicion.medido("fragmento:equipos", cascada_fragmento)
+def vista_equipos(liga, view):
+    sufijo = MAPEO_ARCHIVOS.get(liga)
+    # SECCIÓN STATS EQUIPOS (ORIGINAL CON INTEGRACIÓN DE SCRAPEO)
+    configs = {"clas": (f"CLASIFICACION_LIGA_{sufijo}.xlsx", "clasificacion"), "stats": (f"RESUMEN_STATS_{sufijo}.xlsx", "stats"), "fix": (f"CARTELERA_PROXIMOS_{sufijo}.xlsx", "fixture")}
+    archivo, tipo = configs[view]
+    df = cargar_excel(archivo, tipo=tipo)
+    if df is not None:
+        # FILTRO DUAL MEJORADO (SIN TOCAR ESTÉTICA)
+        lista_equipos = sorted(df['EQUIPO'].unique().tolist()) if 'EQUIPO' in df.columns else []
+        f1, f2 = st.columns([1, 1])
+        with f1:
+            busqueda = st.text_input("🔍 Escribir equipo...", "").strip().lower()
+        with f2:
+            seleccion_lista = st.selectbox("📋 O selecciona de la lista:", [""] + lista_equipos)
+
+        equipo_final = seleccion_lista if seleccion_lista else busqueda
+
+        with medicion.tramo(f"to_html:{view}"):
+            # Sin filtro la tabla sale de las páginas prerenderizadas (una vez por versión de los datos)
+            pagina = paginas.obtener(liga, view, cargar_excel) if not equipo_final else None
+            if pagina is not None:
+                html = pagina["tabla"]
+            else:
+                # Fixture: probabilidades del modelo Poisson junto a cada cruce
+                modelo = modelo_goles(liga) if view == "fix" and 'VISITANTE' in df.columns else None
+                df_view = insertar_probabilidades(df, modelo) if modelo is not None else df
+                if equipo_final and 'EQUIPO' in df_view.columns:
+                    df_view = df_view[df_view['EQUIPO'].str.lower().str.contains(equipo_final.lower())]
+                html = html_tabla(df_view)
+        st.markdown(f'<div class="table-container">{html}</div>', unsafe_allow_html=True)
+
+        # INTEGRACIÓN DEL EXCEL DE JUGADORES (SCRAPEO)
+        if equipo_final:
+            st.markdown(f"#### 🏟️ Plantilla y Stats Individuales")
+            plantillas_ws = plantillas() # Scrapeo desde github, ya limpio y partido por liga/equipo
+            if plantillas_ws is not None:
+                # Filtrar por equipo y liga
+                if seleccion_lista:
+                    df_res = plantillas_ws.de_equipo(liga, indice_equipos().id_de(seleccion_lista))
+                else:
+                    df_res = plantillas_ws.buscar(liga, equipo_final)
+
+                if not df_res.empty:
+                    # Diccionario de usuario/apostador para las columnas del scrapeo
+                    mapeo_scrapeo = {
+                        'Jugador': 'JUGADOR', 'Mins': '⏱️ MIN', 'Rating': '⭐ RATING',
+                        'Amarillas': '🟨', 'Rojas': '🟥', 'Entradas_Std': 'ENTRADAS',
+                        'Regates_p90': 'REGATES', 'Goles': 'GOLES', 'Asistencias': 'ASIST',
+                        'Pases Clave': 'PASES CLAVE', 'Tiros_Arco_p90': 'TIROS AL ARCO', 'Faltas recibidas': 'FALTAS RECIBIDAS'
+                    }
+                    cols_mostrar = [c for c in mapeo_scrapeo.keys() if c in df_res.columns]
+                    df_final_jug = df_res[cols_mostrar].rename(columns=mapeo_scrapeo)
+
+                    # Mostramos con tu tabla característica
+                    with medicion.tramo("to_html:plantilla"):
+                        html = df_final_jug.style.hide(axis="index").to_html(escape=False)
+                    st.markdown(f'<div class="table-container">{html}</div>', unsafe_allow_html=True)
+
+VISTAS = {"players": vista_jugadores, "odds": vista_cuotas}
+
 
 # ────────────────────────────────────────────────
 # ESTRUCTURA DE LA APP
 # ────────────────────────────────────────────────
-st.markdown('<div class="main-logo-container"><img src="https://i.postimg.cc/SKPzCcyV/33.png" class="main-logo-img"></div>', unsafe_allow_html=True)
+st.markdown(f'<div class="main-logo-container"><img src="{recursos.logo()}" class="main-logo-img"></div>', unsafe_allow_html=True)
 
 if "liga_sel" not in st.session_state: st.session_state.liga_sel = None
 if "vista_activa" not in st.session_state: st.session_state.vista_activa = None
 if "menu_op" not in st.session_state: st.session_state.menu_op = False
 if "h2h_op" not in st.session_state: st.session_state.h2h_op = False
 if "conf_op" not in st.session_state: st.session_state.conf_op = False
-if "num_jugadores_mostrados" not in st.session_state: st.session_state.num_jugadores_mostrados = 10
+if "escaner_op" not in st.session_state: st.session_state.escaner_op = False
+if "movimiento_op" not in st.session_state: st.session_state.movimiento_op = False
 
 if st.button("COMPETENCIAS", use_container_width=True):
     st.session_state.menu_op = not st.session_state.menu_op
@@ -327,12 +655,13 @@ if st.session_state.menu_op:
     if sel != "Selecciona Liga/Competencia":
         st.session_state.liga_sel = sel
         st.session_state.menu_op = False
+        precargar_liga(sel)
         st.session_state.vista_activa = "clas"
         st.rerun()
 
 if st.session_state.liga_sel:
     liga = st.session_state.liga_sel
-    st.markdown(f'<div class="header-container"><img src="{BANDERAS.get(liga, "")}" style="width:40px; height:auto;"><span class="header-title">{liga}</span></div>', unsafe_allow_html=True)
+    st.markdown(f'<div class="header-container"><img src="{recursos.bandera(liga)}" style="width:40px; height:auto;"><span class="header-title">{liga}</span></div>', unsafe_allow_html=True)
     
     v_act = st.session_state.vista_activa
     st.markdown(f"""
@@ -355,264 +684,36 @@ if st.session_state.liga_sel:
     for i, label in enumerate(labels):
         if cols[i].button(label, use_container_width=True):
             st.session_state.vista_activa = keys[i] if st.session_state.vista_activa != keys[i] else None
-            st.session_state.num_jugadores_mostrados = 10
+            for p in BOTONES_PAGINA: st.session_state.pop(f"pag_{p}", None)
             st.rerun()
 
     st.divider()
 
     view = st.session_state.vista_activa
     if view:
-        sufijo = MAPEO_ARCHIVOS.get(liga)
-        df_clas_base = cargar_excel(f"CLASIFICACION_LIGA_{sufijo}.xlsx", "clasificacion")
-        df_stats_base = cargar_excel(f"RESUMEN_STATS_{sufijo}.xlsx", "stats")
-
-        if view == "players":
-            st.markdown(f"#### 👤 Rendimiento Individual - {liga}")
-            
-            # --- SECCIÓN TOP PICKS CON CONFIANZA ---
-            df_picks = cargar_excel("picks_finales_fiables.xlsx")
-            if df_picks is not None:
-                df_picks = df_picks.dropna(subset=['Jugador', 'Equipo'])
-                df_picks = df_picks[(df_picks['Jugador'].astype(str).str.lower() != 'nan') & (df_picks['Equipo'].astype(str).str.lower() != 'nan')]
-                
-                df_liga_picks = df_picks[df_picks['Liga'] == sufijo].copy()
-                df_liga_picks = df_liga_picks.sort_values(by='Score_Pick', ascending=False)
-                df_liga_picks = df_liga_picks.drop_duplicates(subset=['Jugador'], keep='first')
-                
-                top_6 = df_liga_picks.head(6)
-                if not top_6.empty:
-                    st.markdown("##### 🔥 TOP PICKS DE ÉLITE (Algoritmo IA)")
-                    p_cols = st.columns(3)
-                    for idx, row in top_6.reset_index(drop=True).iterrows():
-                        conf_vis = min(float(row['Score_Pick']), 100.0)
-                        
-                        # ASIGNACIÓN DE COLORES ACTUALIZADA (SEMÁFORO)
-                        fiab_str = str(row['Fiabilidad']).upper()
-                        if "ALTA" in fiab_str:
-                            color_f = "#39FF14" # Verde Neón para Alta
-                        elif "MEDIA" in fiab_str:
-                            color_f = "#FFFF00" # Amarillo Neón para Media
-                        elif "BAJA" in fiab_str:
-                            color_f = "#FF3131" # Rojo Neón para Baja
-                        else:
-                            color_f = "#9ca3af"
-
-                        with p_cols[idx % 3]:
-                            st.markdown(f"""
-                            <div class="top-pick-card">
-                                <div class="card-header">
-                                    <span class="card-fiabilidad" style="color:{color_f}; border-color:{color_f}77;">{row['Fiabilidad']}</span>
-                                    <span style="font-size:0.7rem; color:#9ca3af;">PROYECCIÓN POR PARTIDO</span>
-                                </div>
-                                <div class="card-name">{row['Jugador']}</div>
-                                <div class="card-team">{row['Equipo']}</div>
-                                <div class="card-stats-grid">
-                                    <div class="card-stat-item">
-                                        <span class="card-stat-val">{row['Faltas_90']:.2f}</span>
-                                        <span class="card-stat-lbl">Faltas</span>
-                                    </div>
-                                    <div class="card-stat-item">
-                                        <span class="card-stat-val">{row['Tiros_90']:.2f}</span>
-                                        <div style="display: flex; flex-direction: column; align-items: center; gap: 4px;">
-                                            <img src="https://i.postimg.cc/8cpyfzqN/3131.png" width="45" height="45" style="margin-bottom: 2px;">
-                                            <span class="card-stat-lbl">Tiros</span>
-                                        </div>
-                                    </div>
-                                    <div class="card-stat-item">
-                                        <span class="card-stat-val" style="color:#b59410;">{conf_vis:.1f}%</span>
-                                        <span class="card-stat-lbl">Confianza</span>
-                                    </div>
-                                </div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                    
-                    # LEYENDA ACTUALIZADA CON COLORES SEMÁFORO
-                    st.markdown("""
-                    <div class="leyenda-grid" style="margin-bottom:25px;">
-                        <div class="leyenda-item">
-                            <span style="color:#b59410; font-weight:bold; font-size:1.1rem;">% Confianza:</span>
-                            <span>Muestra la probabilidad de éxito basándose en la regularidad del jugador en sus últimos partidos.</span>
-                        </div>
-                        <div class="leyenda-item">
-                            <span style="color:#1ed7de; font-weight:bold; font-size:1.1rem;">Fiabilidad:</span>
-                            <span>Indica la solidez del pick según el histórico de minutos jugados; a mayor fiabilidad, más estable es el dato. 
-                            <span style="color:#FF3131; font-weight:bold;">Baja</span> - 
-                            <span style="color:#FFFF00; font-weight:bold;">Media</span> - 
-                            <span style="color:#39FF14; font-weight:bold;">Alta</span></span>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-            # --- TABLAS DE JUGADORES ---
-            df_p = cargar_excel(f"SUPER_STATS_{sufijo}.xlsx", "general")
-            if df_p is not None:
-                if 'Pos' in df_p.columns:
-                    df_p['Pos'] = df_p['Pos'].replace(MAPEO_POSICIONES)
-                if 'Squad' in df_p.columns:
-                    df_p['Squad'] = df_p['Squad'].apply(limpiar_nombre_equipo)
-                
-                f_col1, f_col2, f_col4 = st.columns([2, 2, 2])
-                with f_col1:
-                    eq_list = ["Todos"] + sorted(df_p['Squad'].unique().tolist())
-                    eq_f = st.selectbox("Filtrar por Equipo", eq_list)
-                with f_col2:
-                    p_sel = st.multiselect("Posiciones", df_p['Pos'].unique(), default=df_p['Pos'].unique())
-                with f_col4:
-                    p_busq = st.text_input("🔍 Buscar Jugador", "").strip().lower()
-                
-                mask = (df_p['Pos'].isin(p_sel))
-                if eq_f != "Todos": mask = mask & (df_p['Squad'] == eq_f)
-                if p_busq: mask = mask & (df_p['Player'].str.lower().str.contains(p_busq))
-                df_f = df_p[mask].copy()
-
-                t1, t2 = st.tabs(["🎯 ATAQUE & REMATES", "🛡️ DISCIPLINA"])
-                
-                with t1:
-                    c_atk = ['Player', 'Squad', 'Gls', 'Ast', 'Sh', 'SoT']
-                    df_t1 = df_f[c_atk].sort_values(by='Gls', ascending=False)
-                    df_t1_view = df_t1.head(st.session_state.num_jugadores_mostrados)
-                    st.markdown(f'<div class="table-container">{df_t1_view.rename(columns=TRADUCCIONES).style.hide(axis="index").to_html(escape=False)}</div>', unsafe_allow_html=True)
-                    if len(df_t1) > st.session_state.num_jugadores_mostrados:
-                        if st.button("Ver más jugadores (Ataque)", key="btn_atk"):
-                            st.session_state.num_jugadores_mostrados += 10
-                            st.rerun()
-
-                with t2:
-                    c_disc = ['Player', 'Squad', 'Fls', 'Fld', 'CrdY', 'CrdR']
-                    df_t2 = df_f[c_disc].sort_values(by='Fls', ascending=False)
-                    df_t2_view = df_t2.head(st.session_state.num_jugadores_mostrados)
-                    st.markdown(f'<div class="table-container">{df_t2_view.rename(columns=TRADUCCIONES).style.hide(axis="index").to_html(escape=False)}</div>', unsafe_allow_html=True)
-                    if len(df_t2) > st.session_state.num_jugadores_mostrados:
-                        if st.button("Ver más jugadores (Disciplina)", key="btn_disc"):
-                            st.session_state.num_jugadores_mostrados += 10
-                            st.rerun()
-            else: st.info("ℹ️ Datos de jugadores no disponibles.")
-
-        elif view == "odds":
-            if st.button("⚔️ COMPARADOR H2H", use_container_width=True):
-                st.session_state.h2h_op = not st.session_state.h2h_op
-            if st.session_state.h2h_op and df_clas_base is not None and df_stats_base is not None:
-                equipos = sorted(df_clas_base['EQUIPO'].unique())
-                f1, f2, f3 = st.columns([2, 2, 1])
-                eq_l = f1.selectbox("Equipo Local", equipos, index=0)
-                eq_v = f2.selectbox("Equipo Visitante", equipos, index=min(1, len(equipos)-1))
-                tipo_filtro = f3.selectbox("Filtro Stats", ["Global", "Local vs Visitante"])
-                try:
-                    d_l, d_v = df_clas_base[df_clas_base['EQUIPO'] == eq_l].iloc[0], df_clas_base[df_clas_base['EQUIPO'] == eq_v].iloc[0]
-                    s_l, s_v = df_stats_base[df_stats_base['EQUIPO'] == eq_l].iloc[0], df_stats_base[df_stats_base['EQUIPO'] == eq_v].iloc[0]
-                    radar_labels = ["PTS", "POSS", "GF", "xG", "VICT"]
-                    radar_l = [min(d_l['PTS']*1.5, 100), float(s_l['Poss_num']), min(d_l['GF']*1.2, 100), min(float(s_l['xG_val'])*20, 100), min(d_l['G']*5, 100)]
-                    radar_v = [min(d_v['PTS']*1.5, 100), float(s_v['Poss_num']), min(d_v['GF']*1.2, 100), min(float(s_v['xG_val'])*20, 100), min(d_v['G']*5, 100)]
-                    c1, c2 = st.columns([1, 2])
-                    with c1:
-                        st.markdown(generar_radar_svg(radar_l, radar_v, radar_labels), unsafe_allow_html=True)
-                        st.markdown(f'<div style="text-align:center; font-size:10px;"><span style="color:#1ed7de">■ {eq_l}</span> <span style="color:#b59410">■ {eq_v}</span></div>', unsafe_allow_html=True)
-                    with c2:
-                        st.markdown(f"""<div style="background:#1f2937; padding:15px; border-radius:12px; border:1px solid #1ed7de44;"><div style="display:flex; justify-content:space-between; border-bottom:1px solid #2d3139; padding:8px 0;"><span style="color:#1ed7de; font-weight:bold;">{d_l['PTS']}</span><span style="color:#9ca3af; font-size:0.8rem;">PUNTOS</span><span style="color:#1ed7de; font-weight:bold;">{d_v['PTS']}</span></div><div style="display:flex; justify-content:space-between; border-bottom:1px solid #2d3139; padding:8px 0;"><span>{d_l['G']}</span><span style="color:#9ca3af; font-size:0.8rem;">VICTORIAS</span><span>{d_v['G']}</span></div><div style="display:flex; justify-content:space-between; border-bottom:1px solid #2d3139; padding:8px 0;"><span>{s_l['xG_val']:.1f}</span><span style="color:#9ca3af; font-size:0.8rem;">xG</span><span>{s_v['xG_val']:.1f}</span></div><div style="margin-top:15px; display:flex; justify-content:space-between;">{grafico_picos_forma(d_l['ÚLTIMOS 5'], "left")}<span style="color:#9ca3af; font-size:0.8rem;">FORMA</span>{grafico_picos_forma(d_v['ÚLTIMOS 5'], "right")}</div></div>""", unsafe_allow_html=True)
-                except: st.warning("Faltan datos para la comparativa.")
-                st.divider()
-
-            if st.button("🎯 ÍNDICE DE CONFIANZA", use_container_width=True):
-                st.session_state.conf_op = not st.session_state.conf_op
-            if st.session_state.conf_op and df_clas_base is not None and df_stats_base is not None:
-                equipos = sorted(df_clas_base['EQUIPO'].unique())
-                eq_sel = st.selectbox("Selecciona equipo", equipos)
-                try:
-                    s_r, c_r = df_stats_base[df_stats_base['EQUIPO']==eq_sel].iloc[0], df_clas_base[df_clas_base['EQUIPO']==eq_sel].iloc[0]
-                    score = (float(s_r['xG_val']) * 0.4) + (float(c_r['PTS'])/(c_r['PJ'] or 1) * 15) + (str(c_r['ÚLTIMOS 5']).count('W') * 5)
-                    perc = min(int(score * 2), 100)
-                    st.markdown(f"""
-                    <div style="background:#161b22; padding:20px; border-radius:12px; border:1px solid #1ed7de;">
-                        <h4 style="color:#1ed7de; margin-top:0;">{eq_sel} - Reporte de Confianza</h4>
-                        <div style="display:flex; align-items:center; gap:15px; margin:15px 0;">
-                            <div style="flex:1; background:#2d3139; height:12px; border-radius:6px; overflow:hidden;">
-                                <div style="width:{perc}%; background:#1ed7de; height:100%;"></div>
-                            </div>
-                            <span style="font-weight:bold; color:#1ed7de;">{perc}%</span>
-                        </div>
-                        <p style="font-size:0.9rem; color:#9ca3af; margin:0;"><b>Factor xG:</b> {s_r['xG_val']:.1f} | <b>Puntos/PJ:</b> {(c_r['PTS']/c_r['PJ']):.2f}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                except: st.error("No se pudo calcular.")
-                st.divider()
-
-            st.subheader("📊 Picks & Cuotas")
-            raw = obtener_cuotas_api(liga)
-            df_odds = procesar_cuotas(raw, df_clas_base)
-            if df_odds is not None and not df_odds.empty:
-                if df_stats_base is not None:
-                    def predecir_goles(r):
-                        try:
-                            xg_l = df_stats_base[df_stats_base['EQUIPO'] == r['LOCAL']]['xG_val'].values[0]
-                            xg_v = df_stats_base[df_stats_base['EQUIPO'] == r['VISITANTE']]['xG_val'].values[0]
-                            return "🔥 Over" if (float(xg_l) + float(xg_v)) > 2.7 else "🛡️ Under"
-                        except: return "---"
-                    df_odds['TENDENCIA'] = df_odds.apply(predecir_goles, axis=1)
-                def aplicar_estilo(row):
-                    m = min(row['1'], row['X'], row['2'])
-                    row['1'] = badge_cuota(row['1'], row['1']==m, row['VAL_H'])
-                    row['X'] = badge_cuota(row['X'], row['X']==m)
-                    row['2'] = badge_cuota(row['2'], row['2']==m)
-                    return row
-                styler_df = df_odds.apply(aplicar_estilo, axis=1)
-                html = styler_df[['FECHA','LOCAL','VISITANTE','1','X','2','TENDENCIA']].style.hide(axis="index").to_html(escape=False)
-                st.markdown(f'<div class="table-container">{html}</div>', unsafe_allow_html=True)
-                st.markdown("""<div class="leyenda-grid"><div class="leyenda-item"><div class="color-box" style="background:#b59410;"></div><span><b>Value Bet (⭐):</b> Valor Estadístico.</span></div><div class="leyenda-item"><div class="color-box" style="background:#137031;"></div><span><b>Favorito:</b> Más probable.</span></div><div class="leyenda-item"><span style="color:#1ed7de; font-weight:bold;">🔥 Over:</span><span>+2.5 Goles.</span></div><div class="leyenda-item"><span style="color:#9ca3af; font-weight:bold;">🛡️ Under:</span><span>-2.5 Goles.</span></div></div>""", unsafe_allow_html=True)
-
-        else:
-            # SECCIÓN STATS EQUIPOS (ORIGINAL CON INTEGRACIÓN DE SCRAPEO)
-            configs = {"clas": (f"CLASIFICACION_LIGA_{sufijo}.xlsx", "clasificacion"), "stats": (f"RESUMEN_STATS_{sufijo}.xlsx", "stats"), "fix": (f"CARTELERA_PROXIMOS_{sufijo}.xlsx", "fixture")}
-            archivo, tipo = configs[view]
-            df = cargar_excel(archivo, tipo=tipo)
-            if df is not None:
-                if 'ÚLTIMOS 5' in df.columns: df['ÚLTIMOS 5'] = df['ÚLTIMOS 5'].apply(formatear_last_5)
-                cols_to_drop = ['xG_val', 'Poss_num']
-                df_view = df.drop(columns=[c for c in cols_to_drop if c in df.columns])
-                
-                # FILTRO DUAL MEJORADO (SIN TOCAR ESTÉTICA)
-                lista_equipos = sorted(df['EQUIPO'].unique().tolist()) if 'EQUIPO' in df.columns else []
-                f1, f2 = st.columns([1, 1])
-                with f1:
-                    busqueda = st.text_input("🔍 Escribir equipo...", "").strip().lower()
-                with f2:
-                    seleccion_lista = st.selectbox("📋 O selecciona de la lista:", [""] + lista_equipos)
-                
-                equipo_final = seleccion_lista if seleccion_lista else busqueda
-                
-                if equipo_final and 'EQUIPO' in df_view.columns: 
-                    df_view = df_view[df_view['EQUIPO'].str.lower().str.contains(equipo_final.lower())]
-                
-                styler = df_view.style.hide(axis="index")
-                if 'PTS' in df_view.columns: styler = styler.set_properties(subset=['PTS'], **{'background-color': '#1ed7de22', 'font-weight': 'bold', 'color': '#1ed7de'})
-                st.markdown(f'<div class="table-container">{styler.to_html(escape=False)}</div>', unsafe_allow_html=True)
-
-                # INTEGRACIÓN DEL EXCEL DE JUGADORES (SCRAPEO)
-                if equipo_final:
-                    st.markdown(f"#### 🏟️ Plantilla y Stats Individuales")
-                    df_jug = cargar_excel("jugadoreswhoscored.xlsx") # Scrapeo desde github
-                    if df_jug is not None:
-                        # Limpieza de nombre: Quita números al final
-                        df_jug['Jugador'] = df_jug['Jugador'].str.replace(r'\d+$', '', regex=True)
-                        
-                        # Filtrar por equipo y liga
-                        df_res = df_jug[
-                            (df_jug['Equipo'].str.lower().str.contains(equipo_final.lower())) & 
-                            (df_jug['Liga'] == liga)
-                        ]
-                        
-                        if not df_res.empty:
-                            # Diccionario de usuario/apostador para las columnas del scrapeo
-                            mapeo_scrapeo = {
-                                'Jugador': 'JUGADOR', 'Mins': '⏱️ MIN', 'Rating': '⭐ RATING',
-                                'Amarillas': '🟨', 'Rojas': '🟥', 'Entradas_Std': 'ENTRADAS',
-                                'Regates_p90': 'REGATES', 'Goles': 'GOLES', 'Asistencias': 'ASIST',
-                                'Pases Clave': 'PASES CLAVE', 'Tiros_Arco_p90': 'TIROS AL ARCO', 'Faltas recibidas': 'FALTAS RECIBIDAS'
-                            }
-                            cols_mostrar = [c for c in mapeo_scrapeo.keys() if c in df_res.columns]
-                            df_final_jug = df_res[cols_mostrar].rename(columns=mapeo_scrapeo)
-                            
-                            # Mostramos con tu tabla característica
-                            st.markdown(f'<div class="table-container">{df_final_jug.style.hide(axis="index").to_html(escape=False)}</div>', unsafe_allow_html=True)
+        with medicion.tramo(f"vista:{view}"):
+            if view in VISTAS: VISTAS[view](liga)
+            else: vista_equipos(liga, view)
+
+# PANEL DE RENDIMIENTO (?perf=1): cascada de este rerun y p50/p95 acumulados por etapa
+traza.meta.update(liga=st.session_state.liga_sel, vista=st.session_state.vista_activa)
+medicion.cerrar_traza(traza)
+if st.query_params.get("perf") == "1":
+    st.markdown("#### ⏱️ Rendimiento")
+    st.markdown(html_cascada(traza), unsafe_allow_html=True)
+    df_perf = pd.DataFrame.from_dict(medicion.percentiles(), orient="index").rename_axis("ETAPA").reset_index()
+    st.markdown(f'<div class="table-container">{df_perf.style.hide(axis="index").format(precision=1).to_html(escape=False)}</div>', unsafe_allow_html=True)
+    if REFRESCADOR is not None:
+        ultima = f"hace {time.time() - REFRESCADOR.ultima_pasada:.0f} s" if REFRESCADOR.ultima_pasada else "pendiente"
+        st.markdown(f"##### 🔄 Refresco en segundo plano · {REFRESCADOR.pasadas} pasadas · última {ultima}")
+        df_ref = pd.DataFrame(REFRESCADOR.resumen())
+        if not df_ref.empty:
+            st.markdown(f'<div class="table-container">{df_ref.style.hide(axis="index").format(precision=1, na_rep="---").to_html(escape=False)}</div>', unsafe_allow_html=True)
+    df_mem = pd.DataFrame.from_dict(_memoria_tablas(), orient="index").rename_axis("ARCHIVO").reset_index()
+    if not df_mem.empty:
+        df_mem["AHORRO"] = render_porcentaje(1 - df_mem["KB"] / df_mem["KB_SIN_COMPACTAR"])
+        st.markdown(f"##### 🧠 Memoria compartida · {df_mem['KB'].sum():.0f} KB ({df_mem['KB_SIN_COMPACTAR'].sum():.0f} KB sin compactar)")
+        st.markdown(f'<div class="table-container">{df_mem.style.hide(axis="index").format(precision=1).to_html(escape=False)}</div>', unsafe_allow_html=True)
 
 st.write("---")
 st.caption("InsideBet Official | scrapeo")
@@ -0,0 +1,100 @@
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from equipos import plegar
+
+# ────────────────────────────────────────────────
+# ÍNDICE DE BÚSQUEDA POR TRIGRAMAS (SIN TILDES)
+# ────────────────────────────────────────────────
+# Puntuación mínima (Dice sobre trigramas) para que una coincidencia aproximada salga en el ranking
+PUNTUACION_MINIMA = 0.3
+
+
+def trigramas(txt, bordes=True):
+    # Con bordes los inicios y finales de palabra pesan ("  mb", "pe ") y el ranking premia los prefijos
+    if bordes: txt = f" {txt} "
+    return {txt[i:i + 3] for i in range(len(txt) - 2)}
+
+
+class IndiceTexto:
+    def __init__(self, textos):
+        self.textos = [plegar(t) for t in textos]
+        listas = defaultdict(list)
+        for i, t in enumerate(self.textos):
+            for g in trigramas(t):
+                listas[g].append(i)
+        self._listas = {g: np.array(v, dtype=np.int32) for g, v in listas.items()}
+        self._n_gramas = np.array([len(trigramas(t)) for t in self.textos], dtype=np.int32)
+
+    def __len__(self):
+        return len(self.textos)
+
+    def _conteo(self, gramas):
+        listas = [self._listas[g] for g in gramas if g in self._listas]
+        if not listas: return None
+        return np.bincount(np.concatenate(listas), minlength=len(self.textos))
+
+    def contiene(self, consulta):
+        # Equivale a str.contains sin tildes: los trigramas solo descartan, la subcadena confirma
+        q = plegar(consulta)
+        if not q: return np.arange(len(self.textos))
+        gramas = trigramas(q, bordes=False)
+        if gramas:
+            if any(g not in self._listas for g in gramas): return np.array([], dtype=np.int64)
+            candidatos = np.flatnonzero(self._conteo(gramas) == len(gramas))
+        else:
+            candidatos = range(len(self.textos))
+        return np.array([i for i in candidatos if q in self.textos[i]], dtype=np.int64)
+
+    def buscar(self, consulta, limite=10, minimo=PUNTUACION_MINIMA):
+        # Ranking aproximado: Dice de trigramas + bonus si la consulta aparece entera o como inicio de palabra
+        q = plegar(consulta)
+        gramas = trigramas(q)
+        conteo = self._conteo(gramas) if q else None
+        if conteo is None: return np.array([], dtype=np.int64), np.array([])
+        candidatos = np.flatnonzero(conteo)
+        puntos = 2 * conteo[candidatos] / (len(gramas) + self._n_gramas[candidatos])
+        if len(candidatos) > limite * 5:
+            mejores = np.argpartition(-puntos, limite * 5)[:limite * 5]
+            candidatos, puntos = candidatos[mejores], puntos[mejores]
+        bonus = np.array([
+            (0.5 if q in self.textos[i] else 0) + (0.25 if self.textos[i].startswith(q) or f" {q}" in self.textos[i] else 0)
+            for i in candidatos])
+        puntos = puntos + bonus
+        orden = np.argsort(-puntos, kind='stable')[:limite]
+        candidatos, puntos = candidatos[orden], puntos[orden]
+        ok = puntos >= minimo
+        return candidatos[ok], puntos[ok]
+
+
+# ────────────────────────────────────────────────
+# JUGADORES DE TODAS LAS LIGAS (FBREF + WHOSCORED)
+# ────────────────────────────────────────────────
+
+def documentos_fbref(df, liga):
+    return pd.DataFrame({
+        "JUGADOR": df['Player'].astype(str).to_numpy(), "EQUIPO": df['Squad'].astype(str).to_numpy(),
+        "LIGA": liga, "FUENTE": "fbref", "FILA": np.arange(len(df)),
+    })
+
+
+def documentos_whoscored(df):
+    return pd.DataFrame({
+        "JUGADOR": df['Jugador'].astype(str).to_numpy(),
+        "EQUIPO": df['Equipo'].astype(str).to_numpy(), "LIGA": df['Liga'].astype(str).to_numpy(),
+        "FUENTE": "whoscored", "FILA": np.arange(len(df)),
+    })
+
+
+class IndiceJugadores:
+    def __init__(self, documentos):
+        partes = [d for d in documentos if d is not None and not d.empty]
+        self.docs = pd.concat(partes, ignore_index=True) if partes else pd.DataFrame(columns=["JUGADOR", "EQUIPO", "LIGA", "FUENTE", "FILA"])
+        self.jugadores = IndiceTexto(self.docs['JUGADOR'])
+        self._columnas = {c: self.docs[c].to_numpy(dtype=object) for c in self.docs.columns}
+
+    def buscar(self, consulta, limite=10):
+        pos, puntos = self.jugadores.buscar(consulta, limite)
+        return pd.DataFrame({**{c: v[pos] for c, v in self._columnas.items()}, "PUNTOS": puntos})
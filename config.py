@@ -0,0 +1,79 @@
+# ────────────────────────────────────────────────
+# LIGAS, ARCHIVOS Y TRADUCCIONES
+# ────────────────────────────────────────────────
+LIGAS_LISTA = ["Champions League", "Premier League", "La Liga", "Serie A", "Bundesliga", "Ligue 1", "Primeira Liga", "Eredivisie"]
+
+MAPEO_ARCHIVOS = {
+    "Premier League": "Premier_League", "La Liga": "La_Liga", "Serie A": "Serie_A",
+    "Bundesliga": "Bundesliga", "Ligue 1": "Ligue_1", "Primeira Liga": "Primeira_Liga",
+    "Eredivisie": "Eredivisie", "Champions League": "Champions_League"
+}
+
+MAPEO_ODDS_API = {
+    "Premier League": "soccer_epl", "La Liga": "soccer_spain_la_liga", "Serie A": "soccer_italy_serie_a",
+    "Bundesliga": "soccer_germany_bundesliga", "Ligue 1": "soccer_france_ligue_1",
+    "Primeira Liga": "soccer_portugal_primeira_liga", "Eredivisie": "soccer_netherlands_eredivisie",
+    "Champions League": "soccer_uefa_champions_league"
+}
+
+LOGO_URL = "https://i.postimg.cc/SKPzCcyV/33.png"
+ICONO_TIRO_URL = "https://i.postimg.cc/8cpyfzqN/3131.png"
+
+BANDERAS = {
+    "Champions League": "https://i.postimg.cc/XYHkj56d/7.png", "Premier League": "https://i.postimg.cc/v1L6Fk5T/1.png",
+    "La Liga": "https://i.postimg.cc/sByvcmbd/8.png", "Serie A": "https://i.postimg.cc/vDmxkPTQ/4.png",
+    "Bundesliga": "https://i.postimg.cc/vg0gDnqQ/3.png", "Ligue 1": "https://i.postimg.cc/7GHJx9NR/2.png",
+    "Primeira Liga": "https://i.postimg.cc/QH99xHcb/5.png", "Eredivisie": "https://i.postimg.cc/dLb77wB8/6.png"
+}
+
+TRADUCCIONES = {
+    'Rk': 'POS', 'Squad': 'EQUIPO', 'MP': 'PJ', 'W': 'G', 'D': 'E', 'L': 'P',
+    'GF': 'GF', 'GA': 'GC', 'GD': 'DG', 'Pts': 'PTS', 'PTS': 'PTS',
+    'Last 5': 'ÚLTIMOS 5', 'Wk': 'JORNADA', 'Date': 'FECHA', 'Time': 'HORA',
+    'Home': 'LOCAL', 'Away': 'VISITANTE', 'Venue': 'ESTADIO',
+    'Poss': 'POSESIÓN', 'Gls': 'GOLES', 'Ast': 'ASISTENCIAS', 
+    'CrdY': '🟨', 'CrdR': '🟥', 'xG': 'xG',
+    'Player': 'JUGADOR', 'Pos': 'POS', 'Min': 'MIN', 'Sh': 'REMATES', 'SoT': 'REMATES A PUERTA', 'Fls': 'FALTAS COMETIDAS', 'Fld': 'FALTAS RECIBIDAS'
+}
+
+MAPEO_POSICIONES = {
+    'FW': 'DEL', 'MF': 'MED', 'DF': 'DEF', 'GK': 'POR',
+    'FW,MF': 'DEL/MED', 'MF,FW': 'MED/DEL', 'DF,MF': 'DEF/MED', 'MF,DF': 'MED/DEF'
+}
+
+# Grafías de otras fuentes (The Odds API, WhoScored) -> nombre fbref; el resto lo resuelve la normalización
+ALIAS_EQUIPOS = {
+    # Premier League
+    "Manchester United": "Manchester Utd", "Man United": "Manchester Utd", "Man City": "Manchester City",
+    "Newcastle": "Newcastle United", "Tottenham": "Tottenham Hotspur", "West Ham": "West Ham United",
+    "Leeds": "Leeds United", "Brighton and Hove Albion": "Brighton", "Brighton & Hove Albion": "Brighton",
+    "Wolverhampton Wanderers": "Wolves", "Nottingham": "Nottingham Forest", "Nott'ham Forest": "Nottingham Forest",
+    # La Liga
+    "Athletic Bilbao": "Athletic Club", "Deportivo Alaves": "Alavés", "Real Oviedo": "Oviedo",
+    "CA Osasuna": "Osasuna", "Celta de Vigo": "Celta Vigo", "RCD Mallorca": "Mallorca",
+    # Serie A
+    "Inter Milan": "Inter", "Internazionale": "Inter", "AC Milan": "Milan", "AS Roma": "Roma",
+    "Verona": "Hellas Verona", "Parma Calcio 1913": "Parma", "SSC Napoli": "Napoli",
+    # Bundesliga
+    "Bayer Leverkusen": "Leverkusen", "Borussia Dortmund": "Dortmund", "Borussia Monchengladbach": "Gladbach",
+    "Borussia M.Gladbach": "Gladbach", "FC Koln": "Köln", "1. FC Köln": "Köln", "FC St. Pauli": "St Pauli",
+    "St. Pauli": "St Pauli", "FSV Mainz 05": "Mainz 05", "Mainz": "Mainz 05", "VfB Stuttgart": "Stuttgart", "TSG Hoffenheim": "Hoffenheim",
+    "1. FC Heidenheim": "Heidenheim", "FC Heidenheim": "Heidenheim", "VfL Wolfsburg": "Wolfsburg",
+    "1. FC Union Berlin": "Union Berlin", "SV Werder Bremen": "Werder Bremen",
+    # Ligue 1
+    "Paris Saint Germain": "Paris Saint-Germain", "PSG": "Paris Saint-Germain", "Paris S-G": "Paris Saint-Germain",
+    "AS Monaco": "Monaco", "RC Lens": "Lens", "Stade Rennais": "Rennes", "Olympique Lyonnais": "Lyon",
+    "Olympique Marseille": "Marseille", "Stade Brestois 29": "Brest", "RC Strasbourg": "Strasbourg",
+    # Primeira Liga
+    "Sporting Lisbon": "Sporting CP", "FC Porto": "Porto", "SC Braga": "Braga", "Famalicao": "Famalicão",
+    "Vitoria de Guimaraes": "Vitória Guimarães", "Vitoria Guimaraes": "Vitória Guimarães", "Gil Vicente": "Gil Vicente FC",
+    "Estrela da Amadora": "Estrela", "CF Estrela": "Estrela", "AVS Futebol SAD": "AVS Futebol", "Casa Pia AC": "Casa Pia",
+    "CD Nacional": "Nacional",
+    # Eredivisie
+    "PSV Eindhoven": "PSV", "Heracles": "Heracles Almelo", "PEC Zwolle": "Zwolle", "FC Twente": "Twente",
+    "FC Twente Enschede": "Twente", "AZ": "AZ Alkmaar", "SBV Excelsior": "Excelsior",
+    # Champions League
+    "FK Bodo/Glimt": "Bodø/Glimt", "Bodo/Glimt": "Bodø/Glimt",
+    "Union Saint-Gilloise": "Union SG", "Olympiakos": "Olympiacos", "Olympiacos Piraeus": "Olympiacos",
+    "Qarabag FK": "Qarabağ", "Kairat Almaty": "FC Kairat", "Slavia Praha": "Slavia Prague",
+}
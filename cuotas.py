@@ -0,0 +1,273 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+import equipos
+import historial
+
+# ────────────────────────────────────────────────
+# CLIENTE THE ODDS API (COMPARTIDO POR TODAS LAS SESIONES)
+# ────────────────────────────────────────────────
+ODDS_URL = os.environ.get("INSIDEBET_ODDS_URL") or "https://api.the-odds-api.com/v4"
+PARAMS_BASE = {'regions': 'eu', 'markets': 'h2h', 'oddsFormat': 'decimal'}
+
+TTL_CUOTAS = int(os.environ.get("INSIDEBET_TTL_CUOTAS", 300))
+TIMEOUT = 10
+# Con refresco en segundo plano se sirve la última respuesta mientras no pase de MAX_OBSOLETA;
+# una sport_key se sigue refrescando mientras alguien la haya pedido en los últimos ACTIVA segundos
+MAX_OBSOLETA = 3 * TTL_CUOTAS
+ACTIVA = 900
+# Con tan pocos créditos se deja de llamar y se sirve la última respuesta guardada
+CUOTA_MINIMA = 5
+
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+_cache = {}           # sport_key -> (instante, datos)
+_locks = {}
+_lock_global = threading.Lock()
+_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="cuotas")
+_accesos = {}         # sport_key -> (instante, api_key) de la última petición de un usuario
+segundo_plano = False
+
+cuota_api = {"restantes": None, "usados": None, "ultimo_coste": None, "actualizado": None}
+contadores = {"peticiones": 0, "aciertos_cache": 0, "errores": 0, "errores_historial": 0}
+
+
+def _lock_de(sport_key):
+    with _lock_global:
+        if sport_key not in _locks:
+            _locks[sport_key] = threading.Lock()
+        return _locks[sport_key]
+
+
+def _leer_cuota(headers):
+    def _num(nombre):
+        try: return int(float(headers[nombre]))
+        except (KeyError, TypeError, ValueError): return None
+    restantes = _num("x-requests-remaining")
+    if restantes is None: return
+    cuota_api.update({
+        "restantes": restantes, "usados": _num("x-requests-used"),
+        "ultimo_coste": _num("x-requests-last"), "actualizado": time.time(),
+    })
+
+
+def cuota_agotada():
+    return cuota_api["restantes"] is not None and cuota_api["restantes"] <= CUOTA_MINIMA
+
+
+def _vigente(sport_key, ttl):
+    guardado = _cache.get(sport_key)
+    if guardado and time.time() - guardado[0] < ttl:
+        return guardado[1]
+    return None
+
+
+def _pedir(sport_key, api_key):
+    url = f"{ODDS_URL}/sports/{sport_key}/odds/"
+    resp = _session.get(url, params={'apiKey': api_key, **PARAMS_BASE}, timeout=TIMEOUT)
+    with _lock_global:
+        contadores["peticiones"] += 1
+    _leer_cuota(resp.headers)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def obtener(sport_key, api_key, ttl=TTL_CUOTAS):
+    if not sport_key or not api_key: return None
+    _accesos[sport_key] = (time.time(), api_key)
+
+    datos = _vigente(sport_key, MAX_OBSOLETA if segundo_plano else ttl)
+    if datos is not None:
+        contadores["aciertos_cache"] += 1
+        return datos
+
+    # Una sola petición por sport_key: el resto de sesiones espera y reutiliza la respuesta
+    with _lock_de(sport_key):
+        datos = _vigente(sport_key, ttl)
+        if datos is not None:
+            contadores["aciertos_cache"] += 1
+            return datos
+
+        anterior = _cache.get(sport_key)
+        if cuota_agotada() and anterior:
+            return anterior[1]
+        try:
+            datos = _pedir(sport_key, api_key)
+        except (requests.RequestException, ValueError):
+            contadores["errores"] += 1
+            return anterior[1] if anterior else None
+        _cache[sport_key] = (time.time(), datos)
+        _al_historial(sport_key, datos)
+        return datos
+
+
+def _al_historial(sport_key, datos):
+    # Cada respuesta nueva queda en el historial local; un fallo aquí nunca tumba la petición
+    if not datos or not isinstance(datos, list): return
+    try:
+        historial.guardar(sport_key, *aplanar(datos))
+    except Exception:
+        contadores["errores_historial"] += 1
+
+
+def activas(ventana=ACTIVA):
+    ahora = time.time()
+    return [(k, api_key) for k, (t, api_key) in list(_accesos.items()) if ahora - t < ventana]
+
+
+def refrescar(sport_key, api_key, ttl=TTL_CUOTAS, margen=0.8):
+    # Vuelve a pedir la sport_key si su copia tiene más de margen·ttl; los errores llegan al llamador
+    with _lock_de(sport_key):
+        guardado = _cache.get(sport_key)
+        if guardado and time.time() - guardado[0] < ttl * margen: return False
+        if cuota_agotada() and guardado: return False
+        datos = _pedir(sport_key, api_key)
+        _cache[sport_key] = (time.time(), datos)
+        _al_historial(sport_key, datos)
+        return True
+
+
+def obtener_varias(sport_keys, api_key, ttl=TTL_CUOTAS):
+    # Todas las sport_key a la vez: un escaneo completo tarda lo que la petición más lenta, no la suma
+    claves = list(dict.fromkeys(k for k in sport_keys if k))
+    return dict(zip(claves, _pool.map(lambda k: obtener(k, api_key, ttl), claves)))
+
+
+def limpiar_cache():
+    _cache.clear()
+
+
+# ────────────────────────────────────────────────
+# INGESTA VECTORIZADA (PARTIDO × CASA × RESULTADO)
+# ────────────────────────────────────────────────
+RESULTADOS = ["1", "X", "2"]
+# Ventaja mínima de la mejor cuota sobre la probabilidad justa del mercado para marcar valor
+UMBRAL_VALOR = 0.05
+
+
+def aplanar(data):
+    # Una fila por partido × casa × resultado; la clasificación 1/X/2 se hace luego en bloque
+    partidos = pd.DataFrame({
+        "ID": [m.get('id') for m in data],
+        "INICIO": [m.get('commence_time') for m in data],
+        "LOCAL": [m.get('home_team') for m in data],
+        "VISITANTE": [m.get('away_team') for m in data],
+    })
+    mercados = [
+        (i, bk['key'], mk['outcomes'])
+        for i, m in enumerate(data)
+        for bk in (m.get('bookmakers') or ())
+        for mk in bk['markets'][:1]
+    ]
+    n_res = np.fromiter((len(x[2]) for x in mercados), np.int64, len(mercados))
+    resultados = list(chain.from_iterable(x[2] for x in mercados))
+    idx = np.repeat(np.fromiter((x[0] for x in mercados), np.int64, len(mercados)), n_res)
+    nombre = np.array([o['name'] for o in resultados], dtype=object)
+    local = np.array(partidos["LOCAL"].tolist(), dtype=object)[idx]
+    visitante = np.array(partidos["VISITANTE"].tolist(), dtype=object)[idx]
+    largo = pd.DataFrame({
+        "PARTIDO": idx,
+        "CASA": pd.Categorical(np.repeat(np.array([x[1] for x in mercados], dtype=object), n_res)),
+        "RESULTADO": np.where(nombre == local, 0, np.where(nombre == visitante, 2, 1)),
+        "PRECIO": np.array([o.get('price') for o in resultados], dtype=float),
+    })
+    return partidos, largo
+
+
+def resumen_mercado(n_partidos, largo):
+    idx = largo["PARTIDO"].to_numpy()
+    res = largo["RESULTADO"].to_numpy()
+    precio = largo["PRECIO"].to_numpy(dtype=float)
+    ok = np.isfinite(precio) & (precio > 1)
+    idx, res, precio = idx[ok], res[ok], precio[ok]
+
+    mejor = np.zeros((n_partidos, 3))
+    np.maximum.at(mejor, (idx, res), precio)
+    suma = np.zeros((n_partidos, 3))
+    np.add.at(suma, (idx, res), precio)
+    n = np.zeros((n_partidos, 3))
+    np.add.at(n, (idx, res), 1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        media = np.where(n > 0, suma / n, 0.0)
+        implicita = np.where(media > 0, 1 / media, np.nan)
+        # Se quita el margen de la casa normalizando las tres probabilidades a 1
+        justa = implicita / implicita.sum(axis=1, keepdims=True)
+        ventaja = mejor * justa - 1
+    casas = n.max(axis=1).astype(int)
+    return mejor, media, justa, ventaja, casas
+
+
+def procesar_cuotas(data, df_clas):
+    if not data or not isinstance(data, list): return None
+    partidos, largo = aplanar(data)
+    mejor, media, justa, ventaja, casas = resumen_mercado(len(partidos), largo)
+
+    df = partidos.copy()
+    df["FECHA"] = pd.to_datetime(df["INICIO"], errors='coerce', utc=True).dt.strftime('%d/%m %H:%M')
+    for j, r in enumerate(RESULTADOS):
+        df[r] = mejor[:, j]
+        df[f"PROM_{r}"] = media[:, j]
+        df[f"PROB_{r}"] = justa[:, j]
+        df[f"EDGE_{r}"] = ventaja[:, j]
+        df[f"VAL_{r}"] = np.nan_to_num(ventaja[:, j], nan=-1) > UMBRAL_VALOR
+    df["CASAS"] = casas
+
+    indice = equipos.indice()
+    df["ID_LOCAL"] = indice.ids(df["LOCAL"])
+    df["ID_VISITANTE"] = indice.ids(df["VISITANTE"])
+
+    # Modelo por puntos de la clasificación (local y visitante), cruzado por id canónico
+    if df_clas is not None:
+        puntos = indice.serie_por_id(df_clas, "EQUIPO", "PTS")
+        pts_h = df["ID_LOCAL"].map(puntos).astype(float).to_numpy()
+        pts_a = df["ID_VISITANTE"].map(puntos).astype(float).to_numpy()
+        prob_h = (pts_h + 5) / (pts_h + pts_a + 10)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            df["VAL_1"] |= df["1"].to_numpy() > (1 / prob_h) * 1.15
+            df["VAL_2"] |= df["2"].to_numpy() > (1 / (1 - prob_h)) * 1.15
+    return df
+
+
+# ────────────────────────────────────────────────
+# ESCÁNER DE VALOR (TODAS LAS LIGAS)
+# ────────────────────────────────────────────────
+
+def _bloque(df, prefijo, dtype=float):
+    # Columnas PREFIJO_1 / _X / _2 como matriz partidos × 3
+    return np.column_stack([df[f"{prefijo}{r}"].to_numpy(dtype=dtype) for r in RESULTADOS])
+
+
+def tabla_valor(por_liga):
+    # por_liga: [(liga, salida de procesar_cuotas, probabilidades del modelo o None)]
+    # Una fila por partido con su resultado de mayor ventaja; todas las ligas juntas, de más a menos ventaja
+    columnas = {}
+    for liga, df, prob in por_liga:
+        if df is None or df.empty: continue
+        filas = np.arange(len(df))
+        edge = _bloque(df, "EDGE_")
+        j = np.argmax(np.nan_to_num(edge, nan=-np.inf), axis=1)
+        cuota = _bloque(df, "")[filas, j]
+        modelo = _bloque(prob, "")[filas, j] if prob is not None else np.full(len(df), np.nan)
+        for nombre, valores in [
+            ("LIGA", np.full(len(df), liga, dtype=object)), ("FECHA", df["FECHA"].to_numpy(dtype=object)),
+            ("LOCAL", df["LOCAL"].to_numpy(dtype=object)), ("VISITANTE", df["VISITANTE"].to_numpy(dtype=object)),
+            ("PICK", np.array(RESULTADOS, dtype=object)[j]), ("CUOTA", cuota),
+            ("PROB", _bloque(df, "PROB_")[filas, j]), ("EDGE", edge[filas, j]),
+            ("MODELO", modelo), ("EDGE_MODELO", cuota * modelo - 1),
+            ("VALOR", _bloque(df, "VAL_", bool)[filas, j]), ("CASAS", df["CASAS"].to_numpy()),
+        ]:
+            columnas.setdefault(nombre, []).append(valores)
+    if not columnas: return None
+    df = pd.DataFrame({c: np.concatenate(v) for c, v in columnas.items()})
+    return df.sort_values("EDGE", ascending=False, kind="stable", na_position="last").reset_index(drop=True)
@@ -0,0 +1,276 @@
+import functools
+import re
+from datetime import date, datetime
+
+import numpy as np
+import openpyxl
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+import instantanea
+from config import TRADUCCIONES, MAPEO_POSICIONES
+from equipos import plegar
+
+# ────────────────────────────────────────────────
+# CAPA DE DATOS (SOLO VALORES, SIN HTML)
+# ────────────────────────────────────────────────
+
+# Quita el código de país en minúsculas que fbref añade en competiciones europeas ("eng Arsenal", "Inter it").
+# Sin IGNORECASE: con él se comía siglas reales ("Manchester Utd", "RB Leipzig", "West Ham").
+@functools.lru_cache(maxsize=4096)
+def limpiar_nombre_equipo(nombre):
+    if pd.isna(nombre) or str(nombre).lower() == 'nan': return ""
+    txt = str(nombre).strip()
+    txt = re.sub(r'^[a-z]{2,3}\s+', '', txt)
+    txt = re.sub(r'\s+[a-z]{2,3}$', '', txt)
+    return txt.strip()
+
+
+def a_numerico(df, columnas, relleno=None):
+    # Convierte a número; si la columna queda entera sin huecos se guarda como int64
+    for c in columnas:
+        if c not in df.columns: continue
+        serie = pd.to_numeric(df[c], errors='coerce')
+        if relleno is not None: serie = serie.fillna(relleno)
+        if serie.notna().all() and np.array_equal(serie, np.floor(serie)):
+            serie = serie.astype('int64')
+        df[c] = serie
+    return df
+
+
+def _quitar_cabeceras_repetidas(df, col_equipo):
+    # fbref repite la cabecera a mitad de tabla (Champions): filas sin equipo o con el propio rótulo
+    return df[(df[col_equipo] != "") & (df[col_equipo] != 'Squad')]
+
+
+# ────────────────────────────────────────────────
+# LECTURA PROYECTADA (SOLO LAS COLUMNAS QUE USA CADA TIPO)
+# ────────────────────────────────────────────────
+# Cada tipo declara qué columnas de la hoja conserva; las demás no llegan a convertirse ni a inferir tipo.
+# Motor: calamine si está instalado (python-calamine), si no openpyxl en modo solo lectura.
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
+DESCARTE_CLASIFICACION = ['Notes', 'Goalkeeper', 'Top Team Scorer', 'Attendance', 'Pts/MP', 'Pts/PJ']
+COLUMNAS_STATS = ['Squad', 'MP', 'Poss', 'Gls', 'Ast', 'CrdY', 'CrdR', 'xG']
+POS_XG_STATS = 16       # fbref no rotula el xG del resumen: es la columna 17 de la hoja
+DESCARTE_FIXTURE = ['Round', 'Day', 'Score', 'Referee', 'Match Report', 'Notes', 'Attendance', 'Wk']
+COLUMNAS_JUGADORES = ['Player', 'Pos', 'Squad', 'Gls', 'Ast', 'CrdY', 'CrdR', 'Sh', 'SoT', 'Fls', 'Fld']
+
+# tipo -> función(nombres de la cabecera) -> {posición en la hoja: nombre de la columna}
+PROYECCIONES = {
+    "clasificacion": lambda nombres: {i: c for i, c in enumerate(nombres) if c not in DESCARTE_CLASIFICACION},
+    "stats": lambda nombres: {
+        i: 'xG' if i == POS_XG_STATS else c for i, c in enumerate(nombres) if c in COLUMNAS_STATS or i == POS_XG_STATS
+    },
+    "fixture": lambda nombres: {i: c for i, c in enumerate(nombres) if c not in DESCARTE_FIXTURE},
+    "jugadores": lambda nombres: {i: c for i, c in enumerate(nombres) if c in COLUMNAS_JUGADORES},
+}
+
+
+def _celda(v):
+    # Misma conversión que read_excel: vacío -> "", 3.0 -> 3, date -> datetime
+    if v is None: return ""
+    if isinstance(v, float) and v.is_integer(): return int(v)
+    if type(v) is date: return datetime(v.year, v.month, v.day)
+    return v
+
+
+def _filas_excel(ruta_local):
+    if CalamineWorkbook is not None:
+        yield from CalamineWorkbook.from_path(str(ruta_local)).get_sheet_by_index(0).to_python(skip_empty_area=False)
+        return
+    # Las filas se proyectan según se leen: nunca se guarda la hoja entera
+    wb = openpyxl.load_workbook(ruta_local, read_only=True, data_only=True, keep_links=False)
+    try:
+        yield from wb.worksheets[0].iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+def leer_excel(ruta_local, tipo="general"):
+    filas = _filas_excel(ruta_local)
+    cabecera = next(filas, None)
+    if cabecera is None: return pd.DataFrame()
+    # Nombres como los pondría read_excel ("Gls", "Gls.1" para repetidas)
+    nombres = list(TextParser([[_celda(v) for v in cabecera]], header=0).read().columns)
+    proyeccion = PROYECCIONES.get(tipo, lambda n: dict(enumerate(n)))(nombres)
+    idx = list(proyeccion)
+    cuerpo = [[_celda(f[i]) if i < len(f) else "" for i in idx] for f in filas]
+    while cuerpo and all(v == "" for v in cuerpo[-1]): cuerpo.pop()
+    return TextParser(cuerpo, header=None, names=list(proyeccion.values())).read()
+
+
+def leer_tabla(ruta_local, tipo="general"):
+    # Se añade soporte para el CSV de scrapeo
+    if str(ruta_local).endswith('.csv'):
+        return pd.read_csv(ruta_local)
+    return leer_excel(ruta_local, tipo)
+
+
+def limpiar_clasificacion(df):
+    if 'Squad' in df.columns:
+        df['Squad'] = df['Squad'].apply(limpiar_nombre_equipo)
+    df = df.drop(columns=[c for c in DESCARTE_CLASIFICACION if c in df.columns])
+    df = df.rename(columns=TRADUCCIONES)
+    if 'EQUIPO' in df.columns:
+        df = _quitar_cabeceras_repetidas(df, 'EQUIPO').copy()
+    if 'DG' in df.columns:
+        # fbref publica la DG de la Champions como texto con signo ("+19") y la de las ligas como número:
+        # se guarda numérica y se recuerda qué filas traían el "+" para pintarlas igual que el origen
+        df['DG_SIGNO'] = df['DG'].astype(str).str.startswith('+')
+    df = a_numerico(df, ['POS', 'PJ', 'G', 'E', 'P', 'GF', 'GC', 'DG', 'PTS'])
+    cols = list(df.columns)
+    if 'EQUIPO' in cols and 'PTS' in cols:
+        cols.remove('PTS')
+        idx = cols.index('EQUIPO')
+        cols.insert(idx + 1, 'PTS')
+        df = df[cols]
+    return df
+
+
+def limpiar_stats(df):
+    if 'Squad' in df.columns:
+        df['Squad'] = df['Squad'].apply(limpiar_nombre_equipo)
+    if 'xG' not in df.columns and len(df.columns) > POS_XG_STATS:
+        df = df.rename(columns={df.columns[POS_XG_STATS]: 'xG'})
+    df = df[[c for c in COLUMNAS_STATS if c in df.columns]]
+    df = df.rename(columns=TRADUCCIONES)
+    if 'EQUIPO' in df.columns:
+        df = _quitar_cabeceras_repetidas(df, 'EQUIPO').copy()
+    df = a_numerico(df, ['PJ', 'GOLES', 'ASISTENCIAS', '🟨', '🟥'])
+    # POSESIÓN (0-100) y xG quedan como float; el HTML se genera al pintar
+    return a_numerico(df, ['POSESIÓN', 'xG'], relleno=0)
+
+
+def limpiar_fixture(df):
+    df = df.drop(columns=[c for c in DESCARTE_FIXTURE if c in df.columns])
+    df = df.rename(columns=TRADUCCIONES)
+    if 'LOCAL' in df.columns:
+        df['LOCAL'] = df['LOCAL'].apply(limpiar_nombre_equipo)
+    if 'VISITANTE' in df.columns:
+        df['VISITANTE'] = df['VISITANTE'].apply(limpiar_nombre_equipo)
+    df = df[df['LOCAL'] != ""]
+    if 'FECHA' in df.columns:
+        df['FECHA'] = df['FECHA'].apply(lambda x: str(x).split(' ')[0] if pd.notna(x) else "TBD")
+    if 'HORA' in df.columns:
+        df['HORA'] = df['HORA'].fillna("Por definir")
+    return df
+
+
+def limpiar_jugadores(df):
+    if 'Pos' in df.columns:
+        df['Pos'] = df['Pos'].replace(MAPEO_POSICIONES)
+    if 'Squad' in df.columns:
+        df['Squad'] = df['Squad'].apply(limpiar_nombre_equipo)
+    return df
+
+
+def limpiar_picks(df):
+    df = df.dropna(subset=['Jugador', 'Equipo'])
+    df = df[(df['Jugador'].astype(str).str.lower() != 'nan') & (df['Equipo'].astype(str).str.lower() != 'nan')]
+    # Mejor pick de cada jugador dentro de su liga, ya ordenado por Score_Pick
+    df = df.sort_values(by='Score_Pick', ascending=False, kind='stable')
+    return df.drop_duplicates(subset=['Liga', 'Jugador'], keep='first')
+
+
+def limpiar_whoscored(df):
+    # WhoScored pega la edad al nombre ("Declan Rice27")
+    if 'Jugador' in df.columns:
+        df['Jugador'] = df['Jugador'].astype(str).str.replace(r'\d+$', '', regex=True)
+    return df
+
+
+# ────────────────────────────────────────────────
+# TIPOS COMPACTOS (LAS TABLAS SE COMPARTEN ENTRE SESIONES SIN COPIAR)
+# ────────────────────────────────────────────────
+# Equipos, posiciones y ligas se repiten en cientos de filas: como category cada texto se guarda una vez
+CATEGORICAS = ['Squad', 'EQUIPO', 'Pos', 'Liga', 'Equipo', 'LOCAL', 'VISITANTE']
+
+
+def compactar(df):
+    for c in df.columns:
+        serie = df[c]
+        if c in CATEGORICAS and (serie.dtype == object or pd.api.types.is_string_dtype(serie.dtype)):
+            df[c] = serie.astype('category')
+        elif serie.dtype == np.int64 and len(serie) and np.iinfo(np.int32).min <= serie.min() and serie.max() <= np.iinfo(np.int32).max:
+            # int32 y no menos: las columnas se suman y multiplican sin riesgo de desbordar
+            df[c] = serie.astype(np.int32)
+        elif serie.dtype == np.float64:
+            # float32 solo si no cambia ningún valor (goles, minutos); xG y porcentajes siguen en float64
+            reducida = serie.astype(np.float32)
+            if np.array_equal(reducida.to_numpy(dtype=np.float64), serie.to_numpy(), equal_nan=True):
+                df[c] = reducida
+    return df
+
+
+def memoria(df):
+    # (bytes actuales, bytes con los tipos sin compactar: textos sin category, números de 64 bits)
+    actual = int(df.memory_usage(deep=True, index=False).sum())
+    sin_compactar = 0
+    for c in df.columns:
+        serie = df[c]
+        if isinstance(serie.dtype, pd.CategoricalDtype): serie = serie.astype(serie.cat.categories.dtype)
+        elif pd.api.types.is_numeric_dtype(serie.dtype): serie = serie.astype(np.float64 if serie.dtype.kind == 'f' else np.int64)
+        sin_compactar += int(serie.memory_usage(deep=True, index=False))
+    return actual, sin_compactar
+
+
+LIMPIEZAS = {
+    "clasificacion": limpiar_clasificacion,
+    "stats": limpiar_stats,
+    "fixture": limpiar_fixture,
+    "jugadores": limpiar_jugadores,
+    "picks": limpiar_picks,
+    "whoscored": limpiar_whoscored,
+}
+
+
+def leer(ruta_local, tipo="general"):
+    try:
+        # Tabla de la instantánea compilada: ya viene limpia
+        if instantanea.es_tabla(ruta_local):
+            return instantanea.leer(ruta_local)
+        df = leer_tabla(ruta_local, tipo)
+        if 'Home' in df.columns and 'Away' in df.columns:
+            df = df.dropna(subset=['Home', 'Away'], how='all')
+        if tipo in LIMPIEZAS:
+            df = LIMPIEZAS[tipo](df)
+        return compactar(df.dropna(how='all').reset_index(drop=True))
+    except Exception:
+        return None
+
+
+# ────────────────────────────────────────────────
+# PARTICIONES POR LIGA / EQUIPO (SE CALCULAN UNA VEZ POR VERSIÓN)
+# ────────────────────────────────────────────────
+TOP_PICKS = 6
+
+
+def particionar_picks(df, k=TOP_PICKS):
+    # liga (sufijo de archivo) -> sus k mejores picks; df ya viene limpio y ordenado
+    return {liga: g.head(k).reset_index(drop=True) for liga, g in df.groupby('Liga', sort=False)}
+
+
+class Plantillas:
+    # jugadoreswhoscored partido por (liga, id de equipo) para que el panel de plantilla sea una consulta directa
+    def __init__(self, df, indice):
+        self.columnas = df.columns
+        ids = indice.ids(df['Equipo'])
+        self._por_equipo = {clave: g.reset_index(drop=True) for clave, g in df.groupby([df['Liga'], ids], sort=False)}
+        self.equipos = {}      # liga -> {id: (nombre, nombre plegado)}
+        for (liga, id_eq), g in self._por_equipo.items():
+            nombre = g['Equipo'].iloc[0]
+            self.equipos.setdefault(liga, {})[id_eq] = (nombre, plegar(nombre))
+
+    def de_equipo(self, liga, id_eq):
+        return self._por_equipo.get((liga, id_eq), pd.DataFrame(columns=self.columnas))
+
+    def buscar(self, liga, texto):
+        # Equipos de la liga cuyo nombre contiene el texto (sin tildes): son ~20, no hace falta índice
+        q = plegar(texto)
+        ids = [id_eq for id_eq, (_, n) in self.equipos.get(liga, {}).items() if q in n]
+        if not ids: return pd.DataFrame(columns=self.columnas)
+        return pd.concat([self._por_equipo[(liga, i)] for i in ids], ignore_index=True)
@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+
+# ────────────────────────────────────────────────
+# ORIGEN DE LOS DATOS
+# ────────────────────────────────────────────────
+USER = "InsideBet"
+REPO = "picks-top-web"
+BASE_URL = os.environ.get("INSIDEBET_BASE_URL") or f"https://raw.githubusercontent.com/{USER}/{REPO}/main/datos_fbref"
+
+DIR_REPO = os.path.dirname(os.path.abspath(__file__))
+
+# Modo local: INSIDEBET_DATOS_DIR=datos_fbref lee directamente del checkout (offline / pruebas).
+# Como BASE_URL y CACHE_DIR, se lee al importar: definirla después no cambia nada
+DATOS_DIR = os.environ.get("INSIDEBET_DATOS_DIR") or None
+if DATOS_DIR and not os.path.isabs(DATOS_DIR):
+    DATOS_DIR = os.path.join(DIR_REPO, DATOS_DIR)
+
+CACHE_DIR = os.environ.get("INSIDEBET_CACHE_DIR") or os.path.join(DIR_REPO, ".cache_datos")
+
+# Cada cuánto se vuelve a preguntar a GitHub si el archivo cambió (petición condicional)
+TTL_REVALIDACION = 300
+TIMEOUT = 20
+
+_session = requests.Session()
+_estado = {}          # ruta -> {"version", "ruta_local", "comprobado"}
+_locks = {}
+_lock_global = threading.Lock()
+_previa = threading.local()
+
+# Lo activa refresco.Refrescador: revalidar sirve la versión publicada aunque haya caducado
+# y es el hilo de refresco quien comprueba el origen y publica las versiones nuevas
+segundo_plano = False
+
+
+def ruta_relativa(ruta_archivo):
+    if "SUPER_STATS" in ruta_archivo:
+        return f"Estadisticas_Jugadores/{ruta_archivo}"
+    return ruta_archivo
+
+
+def url_archivo(ruta_archivo):
+    return f"{BASE_URL}/{ruta_relativa(ruta_archivo)}"
+
+
+def _lock_de(ruta_archivo):
+    with _lock_global:
+        if ruta_archivo not in _locks:
+            _locks[ruta_archivo] = threading.Lock()
+        return _locks[ruta_archivo]
+
+
+# ────────────────────────────────────────────────
+# CACHÉ EN DISCO (CONTENIDO + ETAG / LAST-MODIFIED)
+# ────────────────────────────────────────────────
+
+def _rutas_cache(ruta_archivo):
+    clave = hashlib.sha1(url_archivo(ruta_archivo).encode()).hexdigest()[:16]
+    base = os.path.join(CACHE_DIR, f"{clave}_{os.path.basename(ruta_archivo)}")
+    return base, base + ".meta.json"
+
+
+def _leer_meta(ruta_meta):
+    try:
+        with open(ruta_meta, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _escribir_atomico(ruta, contenido):
+    tmp = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(contenido)
+    os.replace(tmp, ruta)
+
+
+def _descargar_condicional(ruta_archivo):
+    ruta_datos, ruta_meta = _rutas_cache(ruta_archivo)
+    meta = _leer_meta(ruta_meta) if os.path.exists(ruta_datos) else None
+
+    headers = {}
+    if meta:
+        if meta.get("etag"): headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"): headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        resp = _session.get(url_archivo(ruta_archivo), headers=headers, timeout=TIMEOUT)
+    except requests.RequestException:
+        # Sin red: se sirve la última copia buena si existe
+        if meta: return meta["version"], ruta_datos
+        raise
+
+    if resp.status_code == 304 and meta:
+        return meta["version"], ruta_datos
+    resp.raise_for_status()
+
+    contenido = resp.content
+    version = hashlib.sha256(contenido).hexdigest()[:16]
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    if not meta or meta.get("version") != version:
+        _escribir_atomico(ruta_datos, contenido)
+    nueva_meta = {
+        "url": url_archivo(ruta_archivo), "version": version,
+        "etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified"),
+        "descargado": time.time(),
+    }
+    _escribir_atomico(ruta_meta, json.dumps(nueva_meta).encode("utf-8"))
+    return version, ruta_datos
+
+
+def _version_local(ruta_archivo):
+    ruta = os.path.join(DATOS_DIR, ruta_relativa(ruta_archivo))
+    st_ = os.stat(ruta)
+    return f"{st_.st_mtime_ns:x}-{st_.st_size:x}", ruta
+
+
+# Devuelve (version, ruta_local); solo pregunta al origen como mucho cada TTL_REVALIDACION
+def revalidar(ruta_archivo, forzar=False):
+    previa = getattr(_previa, "versiones", None)
+    if previa and ruta_archivo in previa:
+        return previa[ruta_archivo]
+    est = _estado.get(ruta_archivo)
+    if segundo_plano and est and not forzar:
+        if est["version"] is None: raise FileNotFoundError(ruta_archivo)
+        return est["version"], est["ruta_local"]
+
+    if DATOS_DIR:
+        version, ruta_local = _version_local(ruta_archivo)
+        if segundo_plano: publicar({ruta_archivo: (version, ruta_local)})
+        return version, ruta_local
+
+    with _lock_de(ruta_archivo):
+        est = _estado.get(ruta_archivo)
+        if est and not forzar and time.time() - est["comprobado"] < TTL_REVALIDACION:
+            if est["version"] is None: raise FileNotFoundError(ruta_archivo)
+            return est["version"], est["ruta_local"]
+        try:
+            version, ruta_local = _descargar_condicional(ruta_archivo)
+        except requests.HTTPError:
+            # Archivo que no existe en el origen (p. ej. SUPER_STATS de Champions): no se vuelve a pedir hasta el TTL
+            _estado[ruta_archivo] = {"version": None, "ruta_local": None, "comprobado": time.time()}
+            raise
+        _estado[ruta_archivo] = {"version": version, "ruta_local": ruta_local, "comprobado": time.time()}
+        return version, ruta_local
+
+
+# ────────────────────────────────────────────────
+# COMPROBAR / PUBLICAR (REFRESCO EN SEGUNDO PLANO)
+# ────────────────────────────────────────────────
+
+def por_revisar(margen=0.8):
+    # Archivos ya pedidos alguna vez cuya comprobación tiene más de margen·TTL (en local, todos)
+    limite = 0 if DATOS_DIR else TTL_REVALIDACION * margen
+    ahora = time.time()
+    return [r for r, est in list(_estado.items()) if ahora - est["comprobado"] >= limite]
+
+
+def publicada(ruta_archivo):
+    est = _estado.get(ruta_archivo)
+    return est["version"] if est else None
+
+
+def comprobar(ruta_archivo):
+    # (version, ruta_local) actual del origen, sin publicarla todavía
+    if DATOS_DIR:
+        return _version_local(ruta_archivo)
+    with _lock_de(ruta_archivo):
+        return _descargar_condicional(ruta_archivo)
+
+
+def publicar(versiones):
+    # ruta -> (version, ruta_local); version None marca el archivo como ausente en el origen
+    ahora = time.time()
+    with _lock_global:
+        _estado.update({r: {"version": v, "ruta_local": rl, "comprobado": ahora} for r, (v, rl) in versiones.items()})
+
+
+@contextmanager
+def vista_previa(versiones):
+    # Dentro del bloque (y solo en este hilo) revalidar devuelve estas versiones aún sin publicar
+    _previa.versiones = versiones
+    try:
+        yield
+    finally:
+        _previa.versiones = None
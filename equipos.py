@@ -0,0 +1,94 @@
+import functools
+import os
+import re
+import unicodedata
+
+import pandas as pd
+
+from config import ALIAS_EQUIPOS
+
+# ────────────────────────────────────────────────
+# ÍNDICE CANÓNICO DE EQUIPOS (fbref / Odds API / WhoScored)
+# ────────────────────────────────────────────────
+RUTA_ESCUDOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mapeo_escudos.xlsx")
+
+# Siglas de club que cada fuente pone o quita a su antojo
+RUIDO = {"fc", "cf", "afc", "sc", "ac", "as", "cd", "ud", "sd", "rc", "fk", "sk", "ssc", "ss", "sv", "vfl", "vfb", "tsg", "bv", "cp", "sad", "1"}
+
+
+# Letras que NFKD no descompone en base + diacrítico
+LETRAS_SUELTAS = str.maketrans({"ø": "o", "Ø": "O", "ł": "l", "Ł": "L", "đ": "d", "Đ": "D", "ß": "ss", "æ": "ae", "Æ": "AE", "œ": "oe", "ı": "i"})
+
+
+# Minúsculas sin tildes ni diacríticos ("Mbappé" -> "mbappe", "Bodø" -> "bodo")
+def plegar(texto):
+    if texto is None or (isinstance(texto, float) and pd.isna(texto)): return ""
+    txt = unicodedata.normalize("NFKD", str(texto).translate(LETRAS_SUELTAS))
+    return "".join(c for c in txt if not unicodedata.combining(c)).lower().strip()
+
+
+@functools.lru_cache(maxsize=8192)
+def normalizar(nombre):
+    txt = plegar(nombre)
+    txt = re.sub(r'^vs\s+', '', txt)
+    txt = re.sub(r'\s*\([mf]\)$', '', txt)
+    tokens = re.sub(r"[^a-z0-9]+", " ", txt).split()
+    limpios = [t for t in tokens if t not in RUIDO]
+    return " ".join(limpios or tokens)
+
+
+def _id_logo(url):
+    m = re.search(r'logos/([0-9a-f]{8})', str(url))
+    return m.group(1) if m else None
+
+
+class IndiceEquipos:
+    def __init__(self, escudos=None, alias=None):
+        self._ids = {}        # nombre normalizado -> id
+        self.nombres = {}     # id -> nombre fbref
+        self.logos = {}       # id -> url del escudo
+        if escudos is not None:
+            # Las filas "vs X" salen de la tabla de rivales de cada liga y son las más fiables: van primero
+            rivales = escudos['EQUIPO'].astype(str).str.startswith('vs ')
+            escudos = pd.concat([escudos[rivales], escudos[~rivales]])
+            for equipo, url in zip(escudos['EQUIPO'], escudos['LOGO_URL']):
+                id_eq = _id_logo(url)
+                if not id_eq or pd.isna(equipo): continue
+                self._ids.setdefault(normalizar(equipo), id_eq)
+                nombre = str(equipo)
+                if not re.match(r'^vs\s+', nombre) and not re.search(r'\([MF]\)$', nombre):
+                    self.nombres.setdefault(id_eq, nombre)
+                self.logos.setdefault(id_eq, url)
+        for otro, fbref in (alias or {}).items():
+            self._ids.setdefault(normalizar(otro), self.id_de(fbref))
+
+    def id_de(self, nombre):
+        clave = normalizar(nombre)
+        if not clave: return None
+        # Sin entrada en el mapeo el propio nombre normalizado hace de id: dos grafías iguales siguen casando
+        return self._ids.get(clave, clave)
+
+    def registrar(self, nombres):
+        for n in nombres:
+            id_eq = self.id_de(n)
+            if id_eq: self.nombres.setdefault(id_eq, str(n))
+
+    def ids(self, serie):
+        return serie.map({n: self.id_de(n) for n in pd.unique(serie)})
+
+    def serie_por_id(self, df, col_equipo, col_valor):
+        s = pd.Series(df[col_valor].to_numpy(), index=self.ids(df[col_equipo]).to_numpy())
+        return s[~s.index.duplicated()]
+
+    def indexar(self, df, col_equipo):
+        df = df.set_index(self.ids(df[col_equipo]).to_numpy())
+        return df[~df.index.duplicated()]
+
+
+@functools.lru_cache(maxsize=1)
+def indice():
+    try:
+        escudos = pd.read_excel(RUTA_ESCUDOS)
+    except Exception:
+        escudos = None
+    return IndiceEquipos(escudos, ALIAS_EQUIPOS)
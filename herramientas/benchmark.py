@@ -0,0 +1,250 @@
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+# Los archivos se leen del checkout: ni GitHub ni Streamlit
+os.environ.setdefault("INSIDEBET_DATOS_DIR", "datos_fbref")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+import cuotas
+import datos
+import descargas
+import equipos
+import historial
+import instantanea
+import paginas
+import render
+from buscador import IndiceJugadores, documentos_fbref, documentos_whoscored
+from config import LIGAS_LISTA, MAPEO_ARCHIVOS
+from cuotas import procesar_cuotas
+from herramientas.servidor_odds_falso import generar_partidos
+from jugadores import TablaJugadores, Paginador
+from modelo import ModeloGoles
+from rasgos import RasgosEquipos
+
+# ────────────────────────────────────────────────
+# BENCHMARKS SIN STREAMLIT (CARGA, CUOTAS, RENDER)
+# ────────────────────────────────────────────────
+# Uso:
+#   python -m herramientas.benchmark --guardar base.json
+#   python -m herramientas.benchmark --comparar base.json --tolerancia 0.25
+
+LIGA = "La Liga"
+TAMANOS_CUOTAS = [10, 100, 1000, 10000]
+
+
+def medir(fn, repeticiones=20, calentamiento=2, tiempo_max=10.0):
+    for _ in range(calentamiento): fn()
+    tiempos = []
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        tiempos.append(time.perf_counter() - t0)
+        if time.perf_counter() - inicio > tiempo_max: break
+    # Memoria pico en una pasada aparte: tracemalloc distorsiona los tiempos
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    t = np.array(tiempos) * 1000
+    return {
+        "n": len(t), "min_ms": float(t.min()), "p50_ms": float(np.percentile(t, 50)),
+        "p95_ms": float(np.percentile(t, 95)), "max_ms": float(t.max()), "media_ms": float(t.mean()),
+        "desv_ms": float(statistics.pstdev(t)), "pico_kb": pico / 1024,
+    }
+
+
+def _ruta(archivo):
+    return descargas.revalidar(archivo)[1]
+
+
+def casos():
+    sufijo = MAPEO_ARCHIVOS[LIGA]
+    archivos = {
+        "clasificacion": f"CLASIFICACION_LIGA_{sufijo}.xlsx", "stats": f"RESUMEN_STATS_{sufijo}.xlsx",
+        "fixture": f"CARTELERA_PROXIMOS_{sufijo}.xlsx", "jugadores": f"SUPER_STATS_{sufijo}.xlsx",
+        "picks": "picks_finales_fiables.xlsx", "whoscored": "jugadoreswhoscored.xlsx",
+    }
+    # cargar_excel en frío (lo que paga cada versión nueva de un archivo)
+    for tipo, archivo in archivos.items():
+        yield f"cargar_excel/{tipo}", lambda r=_ruta(archivo), t=tipo: datos.leer(r, t)
+
+    # Las mismas tablas desde la instantánea Arrow (solo con pyarrow instalado)
+    if instantanea.pa is not None:
+        from herramientas.compilar_datos import compilar_tabla
+        carpeta = tempfile.mkdtemp(prefix="instantanea_")
+        for tipo, archivo in archivos.items():
+            ruta = os.path.join(carpeta, f"{tipo}.arrow")
+            with open(ruta, "wb") as f:
+                f.write(compilar_tabla(_ruta(archivo), tipo)[1])
+            yield f"instantanea/{tipo}", lambda r=ruta, t=tipo: datos.leer(r, t)
+
+    df_clas = datos.leer(_ruta(archivos["clasificacion"]), "clasificacion")
+    df_stats = datos.leer(_ruta(archivos["stats"]), "stats")
+    df_fix = datos.leer(_ruta(archivos["fixture"]), "fixture")
+    df_jug = datos.leer(_ruta(archivos["jugadores"]), "jugadores")
+
+    nombres_equipos = df_clas['EQUIPO'].tolist()
+    for n in TAMANOS_CUOTAS:
+        data = generar_partidos(n, nombres_equipos)
+        yield f"procesar_cuotas/{n}", lambda d=data: procesar_cuotas(d, df_clas)
+
+    modelo = ModeloGoles(df_clas, df_stats)
+    yield "modelo/poisson_liga", lambda: ModeloGoles(df_clas, df_stats)
+    yield "modelo/fixture", lambda: modelo.partidos(df_fix['LOCAL'], df_fix['VISITANTE'])
+
+    # Escáner: 8 ligas × 10 partidos cruzados con su modelo y unidos en una tabla ordenada por ventaja
+    por_liga = []
+    for i in range(8):
+        df = procesar_cuotas(generar_partidos(10, nombres_equipos, semilla=i), df_clas)
+        por_liga.append((f"Liga {i}", df, modelo.partidos_por_id(df['ID_LOCAL'], df['ID_VISITANTE'])))
+    yield "escaner/tabla_valor", lambda: cuotas.tabla_valor(por_liga)
+    df_valor = cuotas.tabla_valor(por_liga)
+    yield "to_html/escaner", lambda: render.html_escaner(df_valor)
+
+    # Historial de cuotas en una base temporal: 200 capturas de 12 partidos con un 10 % de precios movidos
+    historial.RUTA = os.path.join(tempfile.mkdtemp(prefix="historial_"), "historial.sqlite")
+    capturas = [generar_partidos(12, nombres_equipos)]
+    rng = np.random.default_rng(0)
+    for _ in range(199):
+        siguiente = json.loads(json.dumps(capturas[-1]))
+        for m in siguiente:
+            for casa in m["bookmakers"]:
+                for o in casa["markets"][0]["outcomes"]:
+                    if rng.random() < 0.1: o["price"] = round(o["price"] * rng.uniform(0.95, 1.05), 2)
+        capturas.append(siguiente)
+    for i, c in enumerate(capturas):
+        historial.guardar("benchmark", *cuotas.aplanar(c), instante=1_000 + i * 300)
+    ids = [m["id"] for m in capturas[-1]]
+    alternas = itertools.cycle([cuotas.aplanar(c) for c in capturas[-2:]])
+    yield "historial/guardar", lambda: historial.guardar("benchmark", *next(alternas))
+    yield "historial/movimiento", lambda: historial.movimiento("benchmark", ids)
+    yield "historial/movimiento_frio", lambda: (historial._series_version.cache_clear(), historial.movimiento("benchmark", ids))
+    yield "historial/cierre", lambda: historial.cierre("benchmark")
+    df_mov = procesar_cuotas(capturas[-1], df_clas)
+    mov = historial.movimiento("benchmark", ids)
+    yield "to_html/movimiento", lambda: render.html_movimiento(df_mov, mov)
+
+    rasgos = RasgosEquipos(df_clas, df_stats)
+    local, visitante = nombres_equipos[0], nombres_equipos[1]
+    yield "rasgos/construir", lambda: RasgosEquipos(df_clas, df_stats)
+    yield "rasgos/h2h", lambda: (rasgos.fila(local), rasgos.fila(visitante), rasgos.radar(local), rasgos.radar(visitante))
+    yield "rasgos/ranking", lambda: rasgos.ranking()
+
+    # Renderers de columna sobre la tabla real y sobre 50 copias apiladas
+    grande_clas = pd.concat([df_clas] * 50, ignore_index=True)
+    grande_stats = pd.concat([df_stats] * 50, ignore_index=True)
+    yield "render/last_5", lambda: render.render_last_5(df_clas['ÚLTIMOS 5'])
+    yield "render/last_5_x50", lambda: render.render_last_5(grande_clas['ÚLTIMOS 5'])
+    yield "render/forma_x50", lambda: render.render_forma(grande_clas['ÚLTIMOS 5'])
+    yield "render/posesion_x50", lambda: render.render_posesion(grande_stats['POSESIÓN'])
+    yield "render/xg_x50", lambda: render.render_xg(grande_stats['xG'])
+    radar = ([60, 55.3, 70, 40, 45], [50, 48.1, 60, 35, 30], ["PTS", "POSS", "GF", "xG", "VICT"])
+    yield "render/radar_svg", lambda: render.generar_radar_svg(*radar)
+    yield "render/radar_svg_cache", lambda: render.radar_svg(*radar)
+
+    # HTML final de cada vista
+    df_odds = procesar_cuotas(generar_partidos(12, nombres_equipos), df_clas)
+    df_odds['TENDENCIA'] = "---"
+    yield "to_html/clas", lambda: render.html_tabla(df_clas)
+    yield "to_html/stats", lambda: render.html_tabla(df_stats)
+    yield "to_html/fix", lambda: render.html_tabla(df_fix)
+    yield "to_html/odds", lambda: render.html_cuotas(df_odds)
+
+    # Páginas prerenderizadas: generar el HTML de una vista frente a servirlo ya guardado
+    cargar = lambda archivo, tipo: datos.leer(_ruta(archivo), tipo)
+    carpeta_paginas = tempfile.mkdtemp(prefix="paginas_")
+    for vista in ("clas", "fix", "players"):
+        yield f"paginas/construir_{vista}", lambda v=vista: paginas.construir(LIGA, v, cargar)
+        clave = paginas.clave(LIGA, vista, paginas.versiones(LIGA, vista))
+        paginas.guardar(clave, paginas.construir(LIGA, vista, cargar), carpeta_paginas)
+        yield f"paginas/servir_{vista}", lambda v=vista: paginas.obtener(LIGA, v, cargar, carpeta_paginas)
+
+    tabla = TablaJugadores(df_jug)
+    mask = tabla.filtrar(tabla.posiciones)
+    yield "jugadores/tabla", lambda: TablaJugadores(df_jug)
+    yield "jugadores/pagina", lambda: Paginador(tabla, "ataque", mask, None).html()
+    yield "jugadores/filtro_busqueda", lambda: tabla.filtrar(tabla.posiciones, "Todos", "ga")
+
+    df_ws = datos.leer(_ruta("jugadoreswhoscored.xlsx"), "whoscored")
+    docs = [documentos_whoscored(df_ws)]
+    for liga in LIGAS_LISTA:
+        try:
+            docs.append(documentos_fbref(datos.leer(_ruta(f"SUPER_STATS_{MAPEO_ARCHIVOS[liga]}.xlsx"), "jugadores"), liga))
+        except OSError:
+            continue
+    indice = IndiceJugadores(docs)
+    yield "busqueda/indice", lambda: IndiceJugadores(docs)
+    yield "busqueda/buscar", lambda: indice.jugadores.buscar("mbape")
+
+    df_picks = datos.leer(_ruta(archivos["picks"]), "picks")
+    yield "particiones/picks", lambda: datos.particionar_picks(df_picks)
+    yield "particiones/plantillas", lambda: datos.Plantillas(df_ws, equipos.indice())
+    plantillas = datos.Plantillas(df_ws, equipos.indice())
+    yield "particiones/buscar_equipo", lambda: plantillas.buscar(LIGA, "real")
+
+
+def ejecutar(filtro=None, repeticiones=20):
+    resultados = {}
+    for nombre, fn in casos():
+        if filtro and filtro not in nombre: continue
+        resultados[nombre] = r = medir(fn, repeticiones)
+        print(f"{nombre:<32} p50 {r['p50_ms']:>10.3f} ms   p95 {r['p95_ms']:>10.3f} ms   pico {r['pico_kb']:>10.1f} KB   n={r['n']}")
+    return resultados
+
+
+def meta():
+    return {
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"), "python": platform.python_version(),
+        "pandas": pd.__version__, "numpy": np.__version__, "maquina": platform.machine(), "sistema": platform.system(),
+    }
+
+
+def comparar(resultados, base, tolerancia):
+    regresiones = []
+    print(f"\n{'caso':<32} {'base p50':>12} {'ahora p50':>12} {'ratio':>7}")
+    for nombre, r in resultados.items():
+        b = base.get(nombre)
+        if not b: continue
+        ratio = r["p50_ms"] / b["p50_ms"] if b["p50_ms"] else float("inf")
+        marca = ""
+        if ratio > 1 + tolerancia:
+            marca = "  REGRESIÓN"
+            regresiones.append(nombre)
+        print(f"{nombre:<32} {b['p50_ms']:>12.3f} {r['p50_ms']:>12.3f} {ratio:>7.2f}{marca}")
+    return regresiones
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks de carga, cuotas y render (sin Streamlit)")
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--filtro", help="Solo los casos cuyo nombre contiene este texto")
+    parser.add_argument("--guardar", help="Guarda los resultados como línea base JSON")
+    parser.add_argument("--comparar", help="Compara contra una línea base JSON")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="Subida relativa del p50 que cuenta como regresión")
+    args = parser.parse_args()
+
+    resultados = ejecutar(args.filtro, args.repeticiones)
+    if args.guardar:
+        with open(args.guardar, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta(), "casos": resultados}, f, indent=2, ensure_ascii=False)
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            base = json.load(f)["casos"]
+        if comparar(resultados, base, args.tolerancia):
+            sys.exit(1)
@@ -0,0 +1,284 @@
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from herramientas.servidor_datos_falso import DIR_REPO, ServidorDatosFalso
+from herramientas.servidor_odds_falso import ServidorOddsFalso, generar_partidos
+
+# ────────────────────────────────────────────────
+# PRUEBA DE CARGA (N SESIONES CONCURRENTES CON AppTest)
+# ────────────────────────────────────────────────
+# Cada sesión es un AppTest en su propio hilo que entra a una liga y recorre vistas, filtros y el H2H
+# al azar. Las sesiones de un proceso lo comparten, como las de un servidor de Streamlit: cachés,
+# refresco e historial son los de producción. GitHub y The Odds API se sustituyen por los servidores
+# falsos de herramientas/, así que se cuentan las peticiones que llegarían al origen.
+# AppTest cambia estado global de Streamlit (Runtime, secrets) en cada rerun, así que dentro de un
+# proceso los reruns van de uno en uno: la latencia incluye la espera por ese turno y SERVICIO es solo
+# el rerun. Con --procesos P las sesiones se reparten entre P procesos y hay como mucho P reruns a la vez
+# (cada proceso con sus cachés en memoria; disco, historial y orígenes compartidos). Las cifras miden
+# esa configuración, no cuántas sesiones concurrentes aguanta un servidor de Streamlit.
+# Uso:
+#   python -m herramientas.carga --sesiones 20 --interacciones 15
+#   python -m herramientas.carga --sesiones 40 --procesos 4
+#   python -m herramientas.carga --sesiones 50 --retraso-datos 0.2 --grabado odds.json --json carga.json
+
+APP = os.path.join(DIR_REPO, "app.py")
+VISTAS = {"Clasificación": "clas", "Stats Equipos": "stats", "Análisis Jugadores": "players",
+          "Ver Fixture": "fix", "Picks & Cuotas": "odds"}
+FILTRO_EQUIPO = "🔍 Escribir equipo..."
+LISTA_EQUIPOS = "📋 O selecciona de la lista:"
+BOTON_H2H = "⚔️ COMPARADOR H2H"
+
+_turno = threading.Lock()
+
+
+def rss_mb():
+    # RSS actual de /proc; fuera de Linux, el pico de getrusage
+    try:
+        with open("/proc/self/status") as f:
+            for linea in f:
+                if linea.startswith("VmRSS:"): return int(linea.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def payloads_sinteticos(carpeta, n_partidos):
+    # Cuotas falsas con los equipos reales de cada liga, para que crucen con la clasificación
+    import datos
+    from config import MAPEO_ARCHIVOS, MAPEO_ODDS_API
+    out = {}
+    for i, (liga, sport_key) in enumerate(MAPEO_ODDS_API.items()):
+        try:
+            equipos = datos.leer(os.path.join(carpeta, f"CLASIFICACION_LIGA_{MAPEO_ARCHIVOS[liga]}.xlsx"), "clasificacion")['EQUIPO'].tolist()
+        except Exception:
+            equipos = None
+        out[sport_key] = generar_partidos(n_partidos, equipos, semilla=i + 1)
+    return out
+
+
+def _boton(at, etiqueta):
+    return next((b for b in at.button if b.label == etiqueta), None)
+
+
+def _por_etiqueta(elementos, etiqueta):
+    return next((e for e in elementos if e.label == etiqueta), None)
+
+
+class Sesion:
+    def __init__(self, n, ligas, interacciones, pausa, semilla, timeout):
+        from streamlit.testing.v1 import AppTest
+        self.n = n
+        self.rnd = random.Random(semilla * 1000 + n)
+        self.ligas = ligas
+        self.interacciones = interacciones
+        self.pausa = pausa
+        self.at = AppTest.from_file(APP, default_timeout=timeout)
+        self.at.secrets["odds_api_key"] = "carga"
+        self.liga = None
+        self.vista = "clas"
+        self.registros = []          # (tipo, segundos, segundos de servicio, ok)
+
+    def _paso(self, tipo, accion):
+        t0 = time.perf_counter()
+        with _turno:
+            t1 = time.perf_counter()
+            try:
+                accion()
+                ok = not self.at.exception
+            except Exception:
+                ok = False
+        t2 = time.perf_counter()
+        self.registros.append((tipo, t2 - t0, t2 - t1, ok))
+
+    def _elegir_liga(self):
+        self.liga = self.rnd.choice(self.ligas)
+        self._paso("menu", lambda: _boton(self.at, "COMPETENCIAS").click().run())
+        self._paso("liga", lambda: _por_etiqueta(self.at.selectbox, "Ligas").select(self.liga).run())
+        self.vista = "clas"
+
+    def _acciones(self):
+        # Sobre todo cambios de vista; filtro y H2H solo donde existen; a veces otra liga
+        acciones = ["vista"] * 4 + ["liga"]
+        if self.vista in ("clas", "stats", "fix") and _por_etiqueta(self.at.text_input, FILTRO_EQUIPO):
+            acciones.append("filtro")
+        if self.vista == "odds" and _boton(self.at, BOTON_H2H):
+            acciones.append("h2h")
+        return acciones
+
+    def ejecutar(self):
+        self._paso("inicio", self.at.run)
+        self._elegir_liga()
+        for _ in range(self.interacciones):
+            if self.pausa: time.sleep(self.rnd.uniform(0, self.pausa))
+            accion = self.rnd.choice(self._acciones())
+            if accion == "liga":
+                self._elegir_liga()
+            elif accion == "filtro":
+                lista = _por_etiqueta(self.at.selectbox, LISTA_EQUIPOS)
+                equipos = [o for o in lista.options if o] if lista is not None else []
+                equipo = self.rnd.choice(equipos) if equipos else ""
+                self._paso("filtro", lambda: _por_etiqueta(self.at.text_input, FILTRO_EQUIPO).input(equipo).run())
+            elif accion == "h2h":
+                self._paso("h2h", lambda: _boton(self.at, BOTON_H2H).click().run())
+            else:
+                etiqueta = self.rnd.choice([e for e, v in VISTAS.items() if v != self.vista])
+                self.vista = VISTAS[etiqueta]
+                self._paso(f"vista:{self.vista}", lambda: _boton(self.at, etiqueta).click().run())
+        return self.registros
+
+
+def _hilos(sesiones):
+    hilos = [threading.Thread(target=s.ejecutar, name=f"sesion-{s.n}") for s in sesiones]
+    for h in hilos: h.start()
+    for h in hilos: h.join()
+
+
+def _proceso(indices, ligas, args, cola, salida):
+    # Hereda el entorno del padre (orígenes falsos y carpetas): prepara sus sesiones, avisa y espera la salida
+    from streamlit import logger
+    logger.set_log_level("error")
+    sesiones = [Sesion(i, ligas, args.interacciones, args.pausa, args.semilla, args.timeout) for i in indices]
+    rss_inicio = rss_mb()
+    cola.put(None)
+    salida.wait()
+    _hilos(sesiones)
+    cola.put((rss_inicio, rss_mb(), [r for s in sesiones for r in s.registros]))
+
+
+def en_procesos(ligas, args):
+    # Sesiones repartidas entre args.procesos procesos; devuelve (registros, duración, (rss inicio, rss final))
+    ctx = multiprocessing.get_context("spawn")
+    cola, salida = ctx.Queue(), ctx.Event()
+    procesos = [ctx.Process(target=_proceso, args=(list(range(p, args.sesiones, args.procesos)), ligas, args, cola, salida),
+                            name=f"carga-{p}") for p in range(args.procesos)]
+    for p in procesos: p.start()
+    for _ in procesos: cola.get()
+    t0 = time.perf_counter()
+    salida.set()
+    resultados = [cola.get() for _ in procesos]
+    duracion = time.perf_counter() - t0
+    for p in procesos: p.join()
+    # Memoria sumada de todos los procesos
+    rss = (sum(r[0] for r in resultados), sum(r[1] for r in resultados))
+    return [x for r in resultados for x in r[2]], duracion, rss
+
+
+def informe(registros, duracion, n_sesiones, srv_datos, srv_odds, rss, procesos=1):
+    por_tipo = defaultdict(list)
+    for tipo, segundos, servicio, _ in registros:
+        por_tipo[tipo].append((segundos * 1000, servicio * 1000))
+    por_tipo["TOTAL"] = [(s * 1000, sv * 1000) for _, s, sv, _ in registros]
+    latencias = {}
+    for tipo, v in sorted(por_tipo.items()):
+        total, servicio = np.array(v).T
+        latencias[tipo] = {"n": len(v), "p50_ms": float(np.percentile(total, 50)), "p95_ms": float(np.percentile(total, 95)),
+                           "p99_ms": float(np.percentile(total, 99)), "max_ms": float(np.max(total)),
+                           "servicio_p50_ms": float(np.percentile(servicio, 50))}
+    odds = Counter(p.split("?")[0].split("/")[3] for p in srv_odds.peticiones if p.count("/") >= 4)
+    return {
+        "sesiones": n_sesiones, "procesos": procesos, "reruns_simultaneos_max": procesos,
+        "interacciones": len(registros),
+        "errores": sum(1 for *_, ok in registros if not ok),
+        "duracion_s": duracion, "throughput": len(registros) / duracion if duracion else 0.0,
+        "latencias": latencias,
+        "origen_datos": {str(k): v for k, v in sorted(srv_datos.resumen().items())},
+        "archivos_distintos": len({r for r, c in srv_datos.peticiones if c == 200}),
+        "no_encontrados": sorted({r for r, c in srv_datos.peticiones if c == 404}),
+        "odds_api": dict(sorted(odds.items())),
+        "memoria_mb": {"inicio": rss[0], "final": rss[1], "por_sesion": (rss[1] - rss[0]) / n_sesiones},
+    }
+
+
+def imprimir(r):
+    print(f"{r['sesiones']} sesiones · {r['interacciones']} interacciones · {r['errores']} errores · "
+          f"{r['duracion_s']:.1f} s · {r['throughput']:.1f} interacciones/s")
+    print(f"{r['procesos']} proceso(s): reruns de uno en uno dentro de cada proceso, como mucho "
+          f"{r['reruns_simultaneos_max']} a la vez. No es el techo de sesiones concurrentes de un servidor.")
+    print(f"{'INTERACCIÓN':<16}{'N':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'SERVICIO p50':>14}")
+    for tipo, l in r["latencias"].items():
+        print(f"{tipo:<16}{l['n']:>6}{l['p50_ms']:>10.1f}{l['p95_ms']:>10.1f}{l['p99_ms']:>10.1f}{l['max_ms']:>10.1f}"
+              f"{l['servicio_p50_ms']:>14.1f}")
+    print(f"Origen datos: {r['origen_datos']} · {r['archivos_distintos']} archivos descargados · 404: {r['no_encontrados']}")
+    print(f"Odds API: {sum(r['odds_api'].values())} peticiones {r['odds_api']}")
+    m = r["memoria_mb"]
+    print(f"Memoria: {m['inicio']:.0f} MB → {m['final']:.0f} MB · {m['por_sesion']:.1f} MB por sesión")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga con sesiones AppTest y orígenes locales")
+    parser.add_argument("--sesiones", type=int, default=10)
+    parser.add_argument("--procesos", type=int, default=1, help="Procesos entre los que se reparten las sesiones (reruns simultáneos)")
+    parser.add_argument("--interacciones", type=int, default=10, help="Interacciones por sesión tras entrar a la primera liga")
+    parser.add_argument("--ligas", nargs="*", help="Por defecto todas")
+    parser.add_argument("--pausa", type=float, default=0.0, help="Pausa máxima (s) entre interacciones de una sesión")
+    parser.add_argument("--retraso-datos", type=float, default=0.0, help="Latencia añadida (s) del GitHub falso")
+    parser.add_argument("--retraso-odds", type=float, default=0.0, help="Latencia añadida (s) de la Odds API falsa")
+    parser.add_argument("--grabado", help="JSON {sport_key: payload} con respuestas grabadas de The Odds API")
+    parser.add_argument("--partidos", type=int, default=10, help="Partidos por liga de las cuotas sintéticas")
+    parser.add_argument("--sin-refresco", action="store_true", help="Revalidación dentro de la petición (INSIDEBET_REFRESCO=0)")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=120.0, help="Timeout (s) de cada rerun")
+    parser.add_argument("--json", help="Guardar el informe en este archivo")
+    args = parser.parse_args()
+    args.procesos = max(1, min(args.procesos, args.sesiones))
+
+    carpeta = os.path.join(DIR_REPO, "datos_fbref")
+    srv_datos = ServidorDatosFalso(carpeta, retraso=args.retraso_datos).iniciar()
+    srv_odds = ServidorOddsFalso(creditos=10 ** 9, retraso=args.retraso_odds).iniciar()
+    tmp = tempfile.mkdtemp(prefix="insidebet_carga_")
+
+    # Antes de importar nada de la app: los módulos leen el origen y las carpetas al importarse
+    os.environ.pop("INSIDEBET_DATOS_DIR", None)
+    os.environ.update({
+        "INSIDEBET_BASE_URL": srv_datos.url, "INSIDEBET_ODDS_URL": srv_odds.url,
+        "INSIDEBET_CACHE_DIR": tmp, "INSIDEBET_HISTORIAL": os.path.join(tmp, "historial.sqlite"),
+        "INSIDEBET_PAGINAS": os.path.join(tmp, "paginas"),
+    })
+    if args.sin_refresco: os.environ["INSIDEBET_REFRESCO"] = "0"
+
+    from config import LIGAS_LISTA
+    from streamlit import logger
+    logger.set_log_level("error")       # sin el aviso de "missing ScriptRunContext" de cada hilo
+    if args.grabado:
+        with open(args.grabado, encoding="utf-8") as f:
+            srv_odds.payloads = json.load(f)
+    else:
+        srv_odds.payloads = payloads_sinteticos(carpeta, args.partidos)
+
+    ligas = args.ligas or LIGAS_LISTA
+    if args.procesos > 1:
+        registros, duracion, rss = en_procesos(ligas, args)
+    else:
+        sesiones = [Sesion(i, ligas, args.interacciones, args.pausa, args.semilla, args.timeout) for i in range(args.sesiones)]
+        rss_inicio = rss_mb()
+        t0 = time.perf_counter()
+        _hilos(sesiones)
+        duracion = time.perf_counter() - t0
+        # Las sesiones siguen vivas (con su session_state) al medir la memoria final
+        rss = (rss_inicio, rss_mb())
+        registros = [r for s in sesiones for r in s.registros]
+
+    r = informe(registros, duracion, args.sesiones, srv_datos, srv_odds, rss, args.procesos)
+    imprimir(r)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(r, f, indent=2, ensure_ascii=False)
+    srv_datos.detener()
+    srv_odds.detener()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pyarrow as pa
+import pyarrow.feather as feather
+
+import datos
+import instantanea
+from descargas import DIR_REPO, _escribir_atomico
+
+# ────────────────────────────────────────────────
+# COMPILACIÓN DE datos_fbref A UNA INSTANTÁNEA ARROW
+# ────────────────────────────────────────────────
+# Uso (después de actualizar los Excel y antes de publicarlos):
+#   python -m herramientas.compilar_datos
+#   python -m herramientas.compilar_datos --origen datos_fbref --destino datos_fbref/instantanea
+
+
+def compilar_tabla(ruta, tipo):
+    # Feather sin comprimir: se puede leer con memory map sin descomprimir
+    df = datos.leer(ruta, tipo)
+    if df is None: return None, None
+    tabla = pa.Table.from_pandas(df, preserve_index=False)
+    salida = pa.BufferOutputStream()
+    feather.write_feather(tabla, salida, compression="uncompressed")
+    return df, salida.getvalue().to_pybytes()
+
+
+def compilar(origen, destino):
+    os.makedirs(destino, exist_ok=True)
+    tablas = {}
+    for raiz, dirs, archivos in os.walk(origen):
+        dirs[:] = [d for d in dirs if os.path.join(raiz, d) != os.path.normpath(destino)]
+        for nombre in sorted(archivos):
+            if not nombre.endswith((".xlsx", ".csv")): continue
+            ruta, tipo = os.path.join(raiz, nombre), instantanea.tipo_de(nombre)
+            try:
+                df, contenido = compilar_tabla(ruta, tipo)
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                print(f"  {nombre:<45} omitido ({e})")
+                continue
+            if contenido is None:
+                print(f"  {nombre:<45} omitido (no se pudo leer)")
+                continue
+            clave = hashlib.sha256(contenido).hexdigest()[:16]
+            ruta_tabla = os.path.join(destino, f"{clave}.arrow")
+            if not os.path.exists(ruta_tabla):
+                _escribir_atomico(ruta_tabla, contenido)
+            tablas[nombre] = {
+                "tabla": f"{clave}.arrow", "tipo": tipo, "origen": instantanea.huella(ruta),
+                "filas": len(df), "columnas": list(map(str, df.columns)),
+            }
+            print(f"  {nombre:<45} {tipo:<14} {len(df):>6} filas  {len(contenido) / 1024:>8.1f} KB")
+
+    # El manifiesto se escribe al final: nunca apunta a una tabla que aún no existe
+    manifiesto = {
+        "esquema": instantanea.ESQUEMA,
+        "version": hashlib.sha256(json.dumps(tablas, sort_keys=True).encode()).hexdigest()[:16],
+        "creado": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "tablas": tablas,
+    }
+    _escribir_atomico(os.path.join(destino, "manifiesto.json"), json.dumps(manifiesto, indent=2, ensure_ascii=False).encode("utf-8"))
+
+    vigentes = {t["tabla"] for t in tablas.values()}
+    for nombre in os.listdir(destino):
+        if nombre.endswith(".arrow") and nombre not in vigentes:
+            os.remove(os.path.join(destino, nombre))
+    return manifiesto
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compila los Excel de datos_fbref en una instantánea Arrow")
+    parser.add_argument("--origen", default=os.path.join(DIR_REPO, "datos_fbref"))
+    parser.add_argument("--destino", help="Por defecto <origen>/instantanea")
+    args = parser.parse_args()
+
+    destino = args.destino or os.path.join(args.origen, instantanea.CARPETA)
+    m = compilar(args.origen, destino)
+    print(f"versión {m['version']}: {len(m['tablas'])} tablas en {destino}")
@@ -0,0 +1,107 @@
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from PIL import Image
+
+import recursos
+from descargas import _escribir_atomico
+
+# ────────────────────────────────────────────────
+# COMPILACIÓN DE IMÁGENES A recursos/
+# ────────────────────────────────────────────────
+# Logo, icono de tiro, banderas (config.py) y escudos (mapeo_escudos.xlsx): cada imagen se descarga una
+# sola vez; las que ya están en el manifiesto con la misma URL y tamaño no se vuelven a pedir.
+# Uso (después de cambiar una URL o el mapeo de escudos):
+#   python -m herramientas.compilar_recursos
+#   python -m herramientas.compilar_recursos --forzar --hilos 16
+
+TIMEOUT = 20
+
+
+def reducir(contenido, lado):
+    # PNG con transparencia y el lado mayor como mucho `lado`; nunca se amplía
+    img = Image.open(io.BytesIO(contenido)).convert("RGBA")
+    img.thumbnail((lado, lado), Image.LANCZOS)
+    salida = io.BytesIO()
+    img.save(salida, "PNG", optimize=True)
+    return salida.getvalue(), img.size
+
+
+def _anterior(destino):
+    try:
+        with open(os.path.join(destino, recursos.MANIFIESTO), encoding="utf-8") as f:
+            m = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return m["recursos"] if m.get("esquema") == recursos.ESQUEMA else {}
+
+
+def compilar(destino, hilos=8, forzar=False):
+    os.makedirs(destino, exist_ok=True)
+    anterior = _anterior(destino)
+    sesion = requests.Session()
+
+    def una(item):
+        nombre, (tipo, url) = item
+        previa = anterior.get(nombre)
+        lado = recursos.LADOS[tipo]
+        if previa and not os.path.exists(os.path.join(destino, previa["archivo"])): previa = None
+        if previa and not forzar and previa["origen"] == url and previa["lado"] == lado:
+            return nombre, previa, "sin cambios"
+        try:
+            resp = sesion.get(url, timeout=TIMEOUT)
+            resp.raise_for_status()
+            contenido, (ancho, alto) = reducir(resp.content, lado)
+        except Exception as e:
+            # Sin conexión o con la URL caída se conserva la imagen anterior
+            return nombre, previa, f"error {type(e).__name__}"
+        archivo = f"{hashlib.sha256(contenido).hexdigest()[:16]}.png"
+        if not os.path.exists(os.path.join(destino, archivo)):
+            _escribir_atomico(os.path.join(destino, archivo), contenido)
+        return nombre, {"archivo": archivo, "tipo": tipo, "origen": url, "lado": lado,
+                        "ancho": ancho, "alto": alto, "bytes": len(contenido), "bytes_origen": len(resp.content)}, "descargada"
+
+    with ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="recursos") as pool:
+        resultados = list(pool.map(una, sorted(recursos.fuentes().items())))
+
+    for nombre, _, estado in resultados:
+        if estado.startswith("error"): print(f"  {nombre:<30} {estado}")
+    tabla = {nombre: entrada for nombre, entrada, _ in resultados if entrada}
+
+    # El manifiesto se escribe al final: nunca apunta a una imagen que aún no existe
+    manifiesto = {
+        "esquema": recursos.ESQUEMA,
+        "version": hashlib.sha256(json.dumps(tabla, sort_keys=True).encode()).hexdigest()[:16],
+        "creado": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "recursos": tabla,
+    }
+    _escribir_atomico(os.path.join(destino, recursos.MANIFIESTO), json.dumps(manifiesto, indent=2, ensure_ascii=False).encode("utf-8"))
+
+    vigentes = {e["archivo"] for e in tabla.values()}
+    for nombre in os.listdir(destino):
+        if nombre.endswith(".png") and nombre not in vigentes:
+            os.remove(os.path.join(destino, nombre))
+    return manifiesto, Counter("error" if estado.startswith("error") else estado for _, _, estado in resultados)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Descarga y reduce logo, banderas, iconos y escudos a recursos/")
+    parser.add_argument("--destino", default=recursos.CARPETA)
+    parser.add_argument("--hilos", type=int, default=8)
+    parser.add_argument("--forzar", action="store_true", help="Volver a descargar aunque la URL no haya cambiado")
+    args = parser.parse_args()
+
+    m, estados = compilar(args.destino, args.hilos, args.forzar)
+    kb = sum(e["bytes"] for e in m["recursos"].values()) / 1024
+    kb_origen = sum(e["bytes_origen"] for e in m["recursos"].values()) / 1024
+    print(f"versión {m['version']}: {len(m['recursos'])} imágenes ({kb:.0f} KB, {kb_origen:.0f} KB en origen) en {args.destino} · {dict(estados)}")
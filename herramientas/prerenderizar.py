@@ -0,0 +1,55 @@
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import datos
+import instantanea
+import paginas
+from config import LIGAS_LISTA
+
+# ────────────────────────────────────────────────
+# PRERENDERIZADO DE LAS PÁGINAS LIGA × VISTA (SIN STREAMLIT)
+# ────────────────────────────────────────────────
+# Uso (después de actualizar datos_fbref; la app reutiliza las páginas de la misma versión):
+#   python -m herramientas.prerenderizar
+#   python -m herramientas.prerenderizar --ligas "La Liga" "Serie A" --vistas clas fix --destino salida/
+
+
+def cargador():
+    # Cada archivo se lee una sola vez aunque lo usen varias vistas (la clasificación: clas y fix)
+    tablas, locks, lock = {}, {}, threading.Lock()
+
+    def cargar(archivo, tipo):
+        with lock:
+            l = locks.setdefault((archivo, tipo), threading.Lock())
+        with l:
+            if (archivo, tipo) not in tablas:
+                try:
+                    version, ruta_local = instantanea.revalidar(archivo, tipo)
+                except Exception:
+                    tablas[(archivo, tipo)] = None
+                else:
+                    tablas[(archivo, tipo)] = datos.leer(ruta_local, tipo)
+            df = tablas[(archivo, tipo)]
+            return df.copy(deep=False) if df is not None else None
+    return cargar
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera el HTML de cada liga × vista para la versión actual de los datos")
+    parser.add_argument("--ligas", nargs="+", default=LIGAS_LISTA)
+    parser.add_argument("--vistas", nargs="+", default=paginas.VISTAS, choices=paginas.VISTAS)
+    parser.add_argument("--destino", help=f"Por defecto {paginas.CARPETA} (INSIDEBET_PAGINAS)")
+    parser.add_argument("--hilos", type=int, default=8)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    claves = paginas.prerenderizar(cargador(), args.ligas, args.vistas, args.destino, args.hilos)
+    for (liga, vista), clave in claves.items():
+        print(f"  {liga:<20} {vista:<8} {clave or 'sin datos'}")
+    hechas = sum(c is not None for c in claves.values())
+    print(f"{hechas}/{len(claves)} páginas en {args.destino or paginas.CARPETA} ({time.perf_counter() - t0:.1f} s)")
@@ -0,0 +1,98 @@
+import argparse
+import hashlib
+import os
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+DIR_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ────────────────────────────────────────────────
+# raw.githubusercontent.com FALSO (PRUEBAS Y CARGA)
+# ────────────────────────────────────────────────
+# Sirve un checkout de datos_fbref con ETag y 304 igual que GitHub y cuenta cada petición.
+# No importa descargas: el servidor arranca antes y su url se pasa por entorno.
+# Uso:
+#   with ServidorDatosFalso() as srv:
+#       os.environ["INSIDEBET_BASE_URL"] = srv.url   (antes de importar descargas)
+#
+#   python -m herramientas.servidor_datos_falso --puerto 8798
+
+
+class ServidorDatosFalso:
+    def __init__(self, carpeta=None, retraso=0.0, puerto=0):
+        self.carpeta = carpeta or os.path.join(DIR_REPO, "datos_fbref")
+        self.retraso = retraso
+        self.peticiones = []           # (ruta, código)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", puerto), self._handler())
+        self._hilo = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}/datos_fbref"
+
+    def resumen(self):
+        # Peticiones por código de respuesta: 200 (descarga), 304 (sin cambios), 404
+        with self._lock:
+            return dict(Counter(codigo for _, codigo in self.peticiones))
+
+    def _handler(self):
+        srv = self
+        prefijo = "/datos_fbref/"
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                ruta = unquote(self.path.split("?")[0])
+                local = os.path.normpath(os.path.join(srv.carpeta, ruta[len(prefijo):])) if ruta.startswith(prefijo) else None
+                if srv.retraso: time.sleep(srv.retraso)
+                if not local or not local.startswith(os.path.normpath(srv.carpeta) + os.sep) or not os.path.isfile(local):
+                    return self._responder(ruta, 404)
+                with open(local, "rb") as f:
+                    contenido = f.read()
+                etag = f'"{hashlib.sha256(contenido).hexdigest()[:16]}"'
+                if self.headers.get("If-None-Match") == etag:
+                    return self._responder(ruta, 304, etag=etag)
+                self._responder(ruta, 200, contenido, etag)
+
+            def _responder(self, ruta, codigo, cuerpo=b"", etag=None):
+                with srv._lock:
+                    srv.peticiones.append((ruta, codigo))
+                self.send_response(codigo)
+                if etag: self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def iniciar(self):
+        self._hilo = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._hilo.start()
+        return self
+
+    def detener(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.detener()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="raw.githubusercontent.com falso sobre un checkout de datos_fbref")
+    parser.add_argument("--puerto", type=int, default=8798)
+    parser.add_argument("--carpeta", help="Por defecto datos_fbref del repo")
+    parser.add_argument("--retraso", type=float, default=0.0)
+    args = parser.parse_args()
+    srv = ServidorDatosFalso(args.carpeta, retraso=args.retraso, puerto=args.puerto)
+    print(f"INSIDEBET_BASE_URL={srv.url}")
+    srv._httpd.serve_forever()
@@ -0,0 +1,144 @@
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# ────────────────────────────────────────────────
+# THE ODDS API FALSA (PRUEBAS, BENCHMARKS Y CARGA)
+# ────────────────────────────────────────────────
+# Uso:
+#   with ServidorOddsFalso() as srv:
+#       os.environ["INSIDEBET_ODDS_URL"] = srv.url   (o cuotas.ODDS_URL = srv.url)
+#
+#   python -m herramientas.servidor_odds_falso --puerto 8799
+
+CASAS = ["bet365", "pinnacle", "unibet_eu", "williamhill", "betfair_ex_eu", "marathonbet", "onexbet",
+         "sport888", "betsson", "nordicbet", "coolbet", "tipico_de", "betclic", "matchbook",
+         "everygame", "gtbets", "suprabets", "mybookieag", "livescorebet_eu", "betonlineag"]
+
+RUTA_ODDS = re.compile(r"^/v4/sports/([^/]+)/odds/?$")
+
+
+def generar_partidos(n_partidos, equipos=None, n_casas=20, semilla=0):
+    rnd = random.Random(semilla)
+    equipos = list(equipos) if equipos else [f"Equipo {i}" for i in range(20)]
+    inicio = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    partidos = []
+    for i in range(n_partidos):
+        home, away = rnd.sample(equipos, 2)
+        p_h = rnd.uniform(0.2, 0.65)
+        p_d = rnd.uniform(0.18, 0.32)
+        p_a = max(1 - p_h - p_d, 0.05)
+        casas = []
+        for key in CASAS[:n_casas]:
+            margen = rnd.uniform(1.02, 1.09)
+            ruido = lambda p: round(max(1.01, 1 / (p * margen) * rnd.uniform(0.96, 1.04)), 2)
+            casas.append({
+                "key": key, "title": key, "last_update": inicio.isoformat().replace("+00:00", "Z"),
+                "markets": [{"key": "h2h", "outcomes": [
+                    {"name": home, "price": ruido(p_h)}, {"name": away, "price": ruido(p_a)},
+                    {"name": "Draw", "price": ruido(p_d)},
+                ]}],
+            })
+        partidos.append({
+            "id": f"{semilla:x}{i:08x}", "sport_key": "soccer_falso",
+            "commence_time": (inicio + timedelta(hours=3 * i)).isoformat().replace("+00:00", "Z"),
+            "home_team": home, "away_team": away, "bookmakers": casas,
+        })
+    return partidos
+
+
+class ServidorOddsFalso:
+    def __init__(self, payloads=None, creditos=500, retraso=0.0, puerto=0, n_partidos=10, clave=None):
+        # payloads: sport_key -> lista JSON grabada; si falta se genera una sintética
+        # clave: si se indica, cualquier otra apiKey recibe 401 como en la API real
+        self.clave = clave
+        self.payloads = dict(payloads or {})
+        self.creditos = creditos
+        self.retraso = retraso
+        self.n_partidos = n_partidos
+        self.peticiones = []
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", puerto), self._handler())
+        # Un cliente que corta por timeout no es un error del servidor
+        self._httpd.handle_error = lambda *args: None
+        self._hilo = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}/v4"
+
+    def _payload(self, sport_key):
+        if sport_key not in self.payloads:
+            self.payloads[sport_key] = generar_partidos(self.n_partidos, semilla=len(self.payloads) + 1)
+        return self.payloads[sport_key]
+
+    def _handler(self):
+        srv = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                partes = urlsplit(self.path)
+                m = RUTA_ODDS.match(partes.path)
+                autorizada = srv.clave is None or parse_qs(partes.query).get("apiKey") == [srv.clave]
+                with srv._lock:
+                    srv.peticiones.append(self.path)
+                    agotada = srv.creditos <= 0
+                    if m and autorizada and not agotada: srv.creditos -= 1
+                    restantes = srv.creditos
+                if srv.retraso: time.sleep(srv.retraso)
+                if not m:
+                    return self._responder(404, {"message": "not found"}, restantes)
+                if not autorizada:
+                    return self._responder(401, {"message": "API key is not valid"}, restantes)
+                if agotada:
+                    return self._responder(429, {"message": "quota exhausted"}, restantes)
+                self._responder(200, srv._payload(m.group(1)), restantes)
+
+            def _responder(self, codigo, cuerpo, restantes):
+                datos = json.dumps(cuerpo).encode()
+                self.send_response(codigo)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(datos)))
+                self.send_header("x-requests-remaining", str(restantes))
+                self.send_header("x-requests-used", str(len(srv.peticiones)))
+                self.send_header("x-requests-last", "1")
+                self.end_headers()
+                self.wfile.write(datos)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def iniciar(self):
+        self._hilo = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._hilo.start()
+        return self
+
+    def detener(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.detener()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="The Odds API falsa para desarrollo local")
+    parser.add_argument("--puerto", type=int, default=8799)
+    parser.add_argument("--grabado", help="JSON {sport_key: payload} con respuestas grabadas")
+    parser.add_argument("--retraso", type=float, default=0.0)
+    args = parser.parse_args()
+    payloads = json.load(open(args.grabado, encoding="utf-8")) if args.grabado else None
+    srv = ServidorOddsFalso(payloads, retraso=args.retraso, puerto=args.puerto)
+    print(f"INSIDEBET_ODDS_URL={srv.url}")
+    srv._httpd.serve_forever()
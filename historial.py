@@ -0,0 +1,171 @@
+import functools
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from descargas import CACHE_DIR
+
+# ────────────────────────────────────────────────
+# HISTORIAL LOCAL DE CUOTAS (SQLITE, SOLO AÑADIR)
+# ────────────────────────────────────────────────
+# Cada respuesta de The Odds API deja una captura; de cada partido × casa × resultado solo se guarda
+# una fila nueva cuando el precio cambia, así que el precio en cualquier instante es el último anterior.
+# Apertura, cuota actual, series para sparklines y cierre / CLV salen de aquí, sin gastar créditos.
+
+RUTA = os.environ.get("INSIDEBET_HISTORIAL") or os.path.join(CACHE_DIR, "historial_cuotas.sqlite")
+RESULTADOS = ["1", "X", "2"]
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS capturas (sport_key TEXT NOT NULL, ts REAL NOT NULL, partidos INTEGER, cambios INTEGER);
+CREATE TABLE IF NOT EXISTS partidos (id TEXT PRIMARY KEY, sport_key TEXT NOT NULL, local TEXT, visitante TEXT, inicio TEXT);
+CREATE TABLE IF NOT EXISTS precios (
+    sport_key TEXT NOT NULL, partido TEXT NOT NULL, casa TEXT NOT NULL,
+    resultado INTEGER NOT NULL, ts REAL NOT NULL, precio REAL NOT NULL,
+    PRIMARY KEY (sport_key, partido, casa, resultado, ts)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS capturas_clave ON capturas (sport_key, ts);
+CREATE INDEX IF NOT EXISTS partidos_liga ON partidos (sport_key, inicio);
+"""
+
+_local = threading.local()
+_lock_escritura = threading.Lock()
+_ultimo = {}          # (ruta, sport_key) -> {(partido, casa, resultado): último precio guardado}
+
+
+def conexion():
+    # Una conexión por hilo; WAL deja leer mientras otro hilo escribe
+    con = getattr(_local, "con", None)
+    if con is None or getattr(_local, "ruta", None) != RUTA:
+        os.makedirs(os.path.dirname(RUTA) or ".", exist_ok=True)
+        con = sqlite3.connect(RUTA, timeout=10)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=NORMAL")
+        con.executescript(ESQUEMA)
+        _local.con, _local.ruta = con, RUTA
+    return con
+
+
+def _ultimos_precios(con, sport_key):
+    clave = (RUTA, sport_key)
+    if clave not in _ultimo:
+        filas = con.execute("""
+            SELECT partido, casa, resultado, precio FROM (
+                SELECT partido, casa, resultado, precio,
+                       ROW_NUMBER() OVER (PARTITION BY partido, casa, resultado ORDER BY ts DESC) AS n
+                FROM precios WHERE sport_key = ?) WHERE n = 1""", (sport_key,))
+        _ultimo[clave] = {(p, c, r): v for p, c, r, v in filas}
+    return _ultimo[clave]
+
+
+def guardar(sport_key, partidos, largo, instante=None):
+    # partidos / largo: salida de cuotas.aplanar; devuelve cuántos precios cambiaron
+    ts = time.time() if instante is None else instante
+    ids = partidos["ID"].astype(str).to_numpy()
+    ok = np.isfinite(largo["PRECIO"].to_numpy(dtype=float))
+    filas = zip(ids[largo["PARTIDO"].to_numpy()[ok]], largo["CASA"].astype(str).to_numpy()[ok],
+                largo["RESULTADO"].to_numpy()[ok].tolist(), largo["PRECIO"].to_numpy(dtype=float)[ok].tolist())
+    with _lock_escritura:
+        con = conexion()
+        ultimo = _ultimos_precios(con, sport_key)
+        nuevos = []
+        for partido, casa, resultado, precio in filas:
+            if ultimo.get((partido, casa, resultado)) != precio:
+                nuevos.append((sport_key, partido, casa, resultado, ts, precio))
+        with con:
+            con.executemany(
+                "INSERT OR REPLACE INTO partidos (id, sport_key, local, visitante, inicio) VALUES (?, ?, ?, ?, ?)",
+                zip(ids, [sport_key] * len(ids), partidos["LOCAL"], partidos["VISITANTE"], partidos["INICIO"]))
+            con.executemany("INSERT INTO precios VALUES (?, ?, ?, ?, ?, ?)", nuevos)
+            con.execute("INSERT INTO capturas VALUES (?, ?, ?, ?)", (sport_key, ts, len(ids), len(nuevos)))
+        ultimo.update({(p, c, r): v for _, p, c, r, _, v in nuevos})
+    return len(nuevos)
+
+
+def _precios(sport_key, ids=None):
+    sql = "SELECT partido, casa, resultado, ts, precio FROM precios WHERE sport_key = ?"
+    params = [sport_key]
+    if ids is not None:
+        ids = [str(i) for i in ids]
+        sql += f" AND partido IN ({','.join('?' * len(ids))})"
+        params += ids
+    # Sin ORDER BY: las filas salen en el orden de la clave primaria y _series ya ordena por tiempo
+    filas = conexion().execute(sql, params).fetchall()
+    return pd.DataFrame(filas, columns=["partido", "casa", "resultado", "ts", "precio"])
+
+
+def _series(df):
+    # (partido, resultado) -> precio medio del mercado tras cada cambio. Cada casa conserva su último
+    # precio hasta que cambia: se acumula solo la diferencia de cada cambio y el número de casas vistas
+    if df.empty: return {}
+    df = df.sort_values(["partido", "resultado", "ts"], kind="stable")
+    anterior = df.groupby(["partido", "casa", "resultado"], sort=False)["precio"].shift()
+    grupo = [df["partido"], df["resultado"]]
+    suma = (df["precio"] - anterior.fillna(0)).groupby(grupo, sort=False).cumsum()
+    casas = anterior.isna().astype(int).groupby(grupo, sort=False).cumsum()
+    # Con varias casas en la misma captura vale la media tras el último cambio de esa captura
+    ultima = ~df.duplicated(["partido", "resultado", "ts"], keep="last").to_numpy()
+    media = (suma / casas).to_numpy()[ultima]
+    claves = list(zip(df["partido"].to_numpy()[ultima], df["resultado"].to_numpy()[ultima]))
+    cortes = [i for i in range(1, len(claves)) if claves[i] != claves[i - 1]]
+    inicios = [0] + cortes
+    return {claves[i]: trozo for i, trozo in zip(inicios, np.split(media, cortes))}
+
+
+def ultima_captura(sport_key):
+    # Versión del historial de una liga: cambia con cada captura guardada (también desde otro proceso)
+    return conexion().execute("SELECT MAX(ts) FROM capturas WHERE sport_key = ?", (sport_key,)).fetchone()[0]
+
+
+@functools.lru_cache(maxsize=64)
+def _series_version(ruta, sport_key, ids, inicios, ultima):
+    # inicios: timestamp de inicio de cada partido (solo cuentan los precios anteriores) o None
+    df = _precios(sport_key, ids)
+    if inicios is not None:
+        df = df[df["ts"] <= df["partido"].map(dict(zip(ids, inicios)))]
+    return _series(df)
+
+
+def movimiento(sport_key, ids):
+    # Por partido: apertura y cuota actual (media de las casas) y la serie completa de cada resultado
+    ids = tuple(str(i) for i in ids)
+    series = _series_version(RUTA, sport_key, ids, None, ultima_captura(sport_key))
+    out = pd.DataFrame({"ID": list(ids)})
+    for j, r in enumerate(RESULTADOS):
+        out[f"SERIE_{r}"] = [series.get((p, j), np.array([])) for p in out["ID"]]
+        out[f"APERTURA_{r}"] = [s[0] if len(s) else np.nan for s in out[f"SERIE_{r}"]]
+        out[f"ACTUAL_{r}"] = [s[-1] if len(s) else np.nan for s in out[f"SERIE_{r}"]]
+    return out
+
+
+def cierre(sport_key, ahora=None, limite=20):
+    # Partidos ya empezados: apertura, cierre (última media antes del inicio) y CLV de haber entrado en la apertura
+    ahora = pd.Timestamp.now(tz="UTC") if ahora is None else ahora
+    partidos = pd.read_sql_query(
+        "SELECT id, local, visitante, inicio FROM partidos WHERE sport_key = ? ORDER BY inicio DESC", conexion(), params=[sport_key])
+    partidos["inicio"] = pd.to_datetime(partidos["inicio"], errors="coerce", utc=True)
+    partidos = partidos[partidos["inicio"] <= ahora].head(limite)
+    if partidos.empty: return None
+    ids, inicios = tuple(partidos["id"]), tuple(t.timestamp() for t in partidos["inicio"])
+    series = _series_version(RUTA, sport_key, ids, inicios, ultima_captura(sport_key))
+    out = pd.DataFrame({"ID": partidos["id"].to_numpy(), "INICIO": partidos["inicio"].to_numpy(),
+                        "LOCAL": partidos["local"].to_numpy(), "VISITANTE": partidos["visitante"].to_numpy()})
+    for j, r in enumerate(RESULTADOS):
+        s = [series.get((p, j)) for p in out["ID"]]
+        out[f"APERTURA_{r}"] = [x[0] if x is not None else np.nan for x in s]
+        out[f"CIERRE_{r}"] = [x[-1] if x is not None else np.nan for x in s]
+        out[f"CLV_{r}"] = out[f"APERTURA_{r}"] / out[f"CIERRE_{r}"] - 1
+    # Sin ninguna captura antes del inicio no hay cierre que enseñar
+    out = out.dropna(subset=[f"CIERRE_{r}" for r in RESULTADOS], how="all").reset_index(drop=True)
+    return out if not out.empty else None
+
+
+def capturas(sport_key=None):
+    sql, params = "SELECT sport_key, ts, partidos, cambios FROM capturas", []
+    if sport_key:
+        sql, params = sql + " WHERE sport_key = ?", [sport_key]
+    filas = conexion().execute(sql + " ORDER BY ts", params).fetchall()
+    return pd.DataFrame(filas, columns=["sport_key", "ts", "partidos", "cambios"])
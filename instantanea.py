@@ -0,0 +1,100 @@
+import functools
+import hashlib
+import json
+import os
+
+import descargas
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = feather = None
+
+# ────────────────────────────────────────────────
+# INSTANTÁNEA COLUMNAR DE datos_fbref
+# ────────────────────────────────────────────────
+# herramientas/compilar_datos.py deja en datos_fbref/instantanea/ una tabla Arrow (Feather sin comprimir)
+# por archivo, ya limpia y tipada, cuyo nombre es el hash de su contenido, y un manifiesto que las enumera.
+# La app las lee con memory map; sin pyarrow, sin manifiesto o sin la tabla se vuelve al xlsx.
+
+ESQUEMA = 4            # subir cuando cambien las limpiezas de datos.py: invalida las instantáneas anteriores
+CARPETA = "instantanea"
+MANIFIESTO = f"{CARPETA}/manifiesto.json"
+DESACTIVADA = os.environ.get("INSIDEBET_SIN_INSTANTANEA") == "1"
+
+PREFIJOS_TIPO = [
+    ("CLASIFICACION_LIGA_", "clasificacion"), ("RESUMEN_STATS_", "stats"), ("CARTELERA_PROXIMOS_", "fixture"),
+    ("SUPER_STATS_", "jugadores"), ("picks_finales_fiables", "picks"), ("jugadoreswhoscored", "whoscored"),
+]
+
+
+def tipo_de(archivo):
+    for prefijo, tipo in PREFIJOS_TIPO:
+        if archivo.startswith(prefijo): return tipo
+    return "general"
+
+
+def huella(ruta):
+    # Mismo formato que la versión de descargas: sha256 del contenido, 16 caracteres
+    with open(ruta, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=256)
+def _huella_version(ruta, version):
+    return huella(ruta)
+
+
+@functools.lru_cache(maxsize=4)
+def _leer_manifiesto(ruta_local, version):
+    try:
+        with open(ruta_local, encoding="utf-8") as f:
+            m = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return m if m.get("esquema") == ESQUEMA else None
+
+
+def manifiesto():
+    if pa is None or DESACTIVADA: return None
+    try:
+        version, ruta_local = descargas.revalidar(MANIFIESTO)
+    except Exception:
+        return None
+    return _leer_manifiesto(ruta_local, version)
+
+
+def _entrada(ruta_archivo, tipo):
+    m = manifiesto()
+    entrada = m["tablas"].get(ruta_archivo) if m else None
+    if not entrada or (tipo is not None and entrada["tipo"] != tipo): return None
+    # La tabla solo vale si salió de este mismo xlsx: un Excel actualizado sin volver a compilar la
+    # instantánea se lee del xlsx. Contra GitHub la versión ya es el hash del contenido y comprobarla es
+    # una petición condicional; con el checkout local la versión es mtime/tamaño y se calcula el hash
+    try:
+        version, ruta = descargas.revalidar(ruta_archivo)
+    except Exception:
+        return None
+    huella_xlsx = _huella_version(ruta, version) if descargas.DATOS_DIR else version
+    if huella_xlsx != entrada["origen"]: return None
+    return entrada
+
+
+# Devuelve (version, ruta_local) de la tabla compilada si está al día; si no, la del xlsx
+def revalidar(ruta_archivo, tipo=None):
+    entrada = _entrada(ruta_archivo, tipo)
+    if entrada:
+        try:
+            return descargas.revalidar(f"{CARPETA}/{entrada['tabla']}")
+        except Exception:
+            pass
+    return descargas.revalidar(ruta_archivo)
+
+
+def es_tabla(ruta_local):
+    return str(ruta_local).endswith(".arrow")
+
+
+def leer(ruta_local):
+    return feather.read_table(ruta_local, memory_map=True).to_pandas()
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+from buscador import IndiceTexto
+from config import TRADUCCIONES
+
+# ────────────────────────────────────────────────
+# TABLAS DE JUGADORES PREORDENADAS Y PAGINADAS
+# ────────────────────────────────────────────────
+TAM_PAGINA = 10
+
+# pestaña -> (columnas visibles, columna de orden)
+PESTANAS = {
+    "ataque": (['Player', 'Squad', 'Gls', 'Ast', 'Sh', 'SoT'], 'Gls'),
+    "disciplina": (['Player', 'Squad', 'Fls', 'Fld', 'CrdY', 'CrdR'], 'Fls'),
+}
+
+
+def _celda(valor):
+    # Mismo texto que el formateador por defecto del Styler
+    if isinstance(valor, (float, np.floating)): return f"{valor:.6f}"
+    return str(valor)
+
+
+class TablaJugadores:
+    # Se construye una vez por versión del SUPER_STATS: el orden de cada columna no se vuelve a calcular
+    def __init__(self, df):
+        self.df = df.reset_index(drop=True)
+        self.equipos = sorted(self.df['Squad'].unique().tolist())
+        self.posiciones = self.df['Pos'].unique().tolist()
+        self._pos = self.df['Pos'].to_numpy(dtype=object)
+        self._squad = self.df['Squad'].to_numpy(dtype=object)
+        self.buscador = IndiceTexto(self.df['Player'])
+        # Orden descendente estable (empates en el orden del archivo); NaN al final
+        self.ordenes = {
+            col: np.argsort(-self.df[col].to_numpy(dtype=float), kind='stable')
+            for _, col in PESTANAS.values() if col in self.df.columns
+        }
+        visibles = dict.fromkeys(c for cols, _ in PESTANAS.values() for c in cols if c in self.df.columns)
+        self._texto = {c: [_celda(v) for v in self.df[c].tolist()] for c in visibles}
+
+    def filtrar(self, posiciones, equipo="Todos", busqueda=""):
+        mask = np.isin(self._pos, list(posiciones))
+        if equipo != "Todos": mask &= self._squad == equipo
+        if busqueda:
+            coincide = np.zeros(len(self.df), dtype=bool)
+            coincide[self.buscador.contiene(busqueda)] = True
+            mask &= coincide
+        return mask
+
+    def orden_filtrado(self, col_orden, mask):
+        # Filtrar un orden ya calculado es O(n): no hay que volver a ordenar
+        orden = self.ordenes[col_orden]
+        return orden[mask[orden]]
+
+    def cabecera_html(self, columnas):
+        celdas = "".join(
+            f'      <th class="col_heading level0 col{j}" >{TRADUCCIONES.get(c, c)}</th>\n'
+            for j, c in enumerate(columnas))
+        return f'<table>\n  <thead>\n    <tr>\n{celdas}    </tr>\n  </thead>\n  <tbody>\n'
+
+    def filas_html(self, columnas, filas, inicio=0):
+        html = []
+        for i, f in enumerate(filas, start=inicio):
+            celdas = "".join(
+                f'      <td class="data row{i} col{j}" >{self._texto[c][f]}</td>\n'
+                for j, c in enumerate(columnas))
+            html.append(f'    <tr>\n{celdas}    </tr>\n')
+        return "".join(html)
+
+    def tabla_html(self, columnas, paginas):
+        return self.cabecera_html(columnas) + "".join(paginas) + '  </tbody>\n</table>\n'
+
+
+class Paginador:
+    # Estado de una pestaña en session_state: orden filtrado y HTML de las páginas ya pintadas
+    def __init__(self, tabla, pestana, mask, clave):
+        self.tabla = tabla
+        self.columnas, col_orden = PESTANAS[pestana]
+        self.clave = clave
+        self.filas = tabla.orden_filtrado(col_orden, mask)
+        self.paginas = []
+        self.siguiente()
+
+    @property
+    def mostrados(self):
+        return min(len(self.paginas) * TAM_PAGINA, len(self.filas))
+
+    def hay_mas(self):
+        return len(self.filas) > self.mostrados
+
+    def siguiente(self):
+        # Solo se genera el HTML de la página nueva; las anteriores se reutilizan tal cual
+        inicio = len(self.paginas) * TAM_PAGINA
+        if inicio and inicio >= len(self.filas): return
+        self.paginas.append(self.tabla.filas_html(self.columnas, self.filas[inicio:inicio + TAM_PAGINA], inicio))
+
+    def html(self):
+        return self.tabla.tabla_html(self.columnas, self.paginas)
@@ -0,0 +1,132 @@
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+# ────────────────────────────────────────────────
+# TRAMOS DE TIEMPO POR EJECUCIÓN DEL SCRIPT
+# ────────────────────────────────────────────────
+# Cada rerun abre una traza (el script entero o, si solo se ejecuta un fragmento, el fragmento con medido());
+# tramo() anota nombre, inicio, duración y anidamiento.
+# Fuera de una traza (hilos de precarga, benchmarks) solo se alimentan las estadísticas acumuladas.
+
+VENTANA = 500          # duraciones guardadas por etapa para p50/p95
+log = logging.getLogger("insidebet.tiempos")
+if os.environ.get("INSIDEBET_LOG_TIEMPOS"):
+    _h = logging.FileHandler(os.environ["INSIDEBET_LOG_TIEMPOS"], encoding="utf-8")
+    _h.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(_h)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
+_traza = contextvars.ContextVar("traza", default=None)
+_abiertos = contextvars.ContextVar("abiertos", default=())
+_historico = defaultdict(lambda: deque(maxlen=VENTANA))
+_lock = threading.Lock()
+
+
+class Traza:
+    def __init__(self, **meta):
+        self.meta = meta
+        self.inicio = time.perf_counter()
+        self.total = None
+        self.tramos = []
+
+    def cerrar(self):
+        self.total = time.perf_counter() - self.inicio
+        return self
+
+    def como_dict(self):
+        return {
+            "ts": time.time(), **self.meta,
+            "total_ms": round((self.total or 0) * 1000, 3),
+            "tramos": [{**t, "inicio_ms": round(t["inicio_ms"], 3), "ms": round(t["ms"], 3)} for t in self.tramos],
+        }
+
+
+def iniciar_traza(**meta):
+    traza = Traza(**meta)
+    _traza.set(traza)
+    _abiertos.set(())
+    return traza
+
+
+def cerrar_traza(traza):
+    traza.cerrar()
+    _registrar("rerun", traza.total)
+    if log.isEnabledFor(logging.INFO):
+        log.info(json.dumps(traza.como_dict(), ensure_ascii=False, default=str))
+    _traza.set(None)
+    return traza
+
+
+def _registrar(nombre, segundos):
+    with _lock:
+        _historico[nombre].append(segundos * 1000)
+
+
+@contextmanager
+def tramo(nombre, **meta):
+    traza = _traza.get()
+    abiertos = _abiertos.get()
+    registro = {"nombre": nombre, "nivel": len(abiertos), **meta}
+    token = _abiertos.set(abiertos + (registro,))
+    t0 = time.perf_counter()
+    try:
+        yield registro
+    finally:
+        dur = time.perf_counter() - t0
+        _abiertos.reset(token)
+        _registrar(nombre, dur)
+        if traza is not None:
+            registro["inicio_ms"] = (t0 - traza.inicio) * 1000
+            registro["ms"] = dur * 1000
+            traza.tramos.append(registro)
+
+
+def anotar(**meta):
+    # Añade datos al tramo abierto más interno (p. ej. cache="miss" desde dentro de la función cacheada)
+    abiertos = _abiertos.get()
+    if abiertos: abiertos[-1].update(meta)
+
+
+def medido(nombre, al_cerrar=None):
+    # Para fragmentos: en un rerun solo del fragmento el script no abre traza, así que la abre y cierra
+    # el propio fragmento (línea en el log JSON) y se la pasa a al_cerrar (p. ej. para pintar la cascada)
+    def deco(fn):
+        @functools.wraps(fn)
+        def envoltura(*args, **kwargs):
+            if _traza.get() is not None:
+                with tramo(nombre):
+                    return fn(*args, **kwargs)
+            traza = iniciar_traza(fragmento=nombre)
+            try:
+                with tramo(nombre):
+                    out = fn(*args, **kwargs)
+            finally:
+                cerrar_traza(traza)
+            if al_cerrar is not None: al_cerrar(traza)
+            return out
+        return envoltura
+    return deco
+
+
+def percentiles():
+    with _lock:
+        copia = {k: np.array(v) for k, v in _historico.items() if v}
+    return {
+        k: {"n": len(v), "p50_ms": float(np.percentile(v, 50)), "p95_ms": float(np.percentile(v, 95))}
+        for k, v in sorted(copia.items())
+    }
+
+
+def reiniciar():
+    with _lock:
+        _historico.clear()
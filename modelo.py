@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+import equipos
+
+# ────────────────────────────────────────────────
+# MODELO DE GOLES (POISSON) PARA TODA LA LIGA
+# ────────────────────────────────────────────────
+# Fuerza de ataque = goles a favor por partido (mezclados con el xG por partido de RESUMEN_STATS)
+# relativa a la media de la liga; fuerza de defensa = goles en contra por partido relativa a la media.
+# Goles esperados local = media × ataque_local × defensa_visitante × ventaja de campo (y al revés).
+
+MAX_GOLES = 10          # marcadores 0..10 por equipo (la cola a partir de 11 es despreciable)
+PESO_XG = 0.5           # peso del xG frente a los goles reales en el ataque
+VENTAJA_LOCAL = 1.10
+DESVENTAJA_VISITANTE = 0.92
+LINEAS_GOLES = (1.5, 2.5, 3.5)
+
+_goles = np.arange(MAX_GOLES + 1)
+_factorial = np.array([float(np.prod(np.arange(1, k + 1))) for k in _goles])
+_total = _goles[:, None] + _goles[None, :]
+# Máscaras sobre la rejilla de marcadores (goles local × goles visitante)
+_MASCARAS = {
+    "1": _goles[:, None] > _goles[None, :],
+    "X": _goles[:, None] == _goles[None, :],
+    "2": _goles[:, None] < _goles[None, :],
+    **{f"O{l}": _total > l for l in LINEAS_GOLES},
+}
+
+
+def poisson(lam):
+    # P(k goles) para k = 0..MAX_GOLES; lam de cualquier forma, la última dimensión es k
+    lam = np.asarray(lam, dtype=float)[..., None]
+    return np.exp(-lam) * lam ** _goles / _factorial
+
+
+class ModeloGoles:
+    def __init__(self, df_clas, df_stats=None, indice=None):
+        self.indice = indice or equipos.indice()
+        clas = self.indice.indexar(df_clas, 'EQUIPO')
+        clas = clas[clas['PJ'] > 0]
+        self.ids = clas.index.to_numpy()
+        self.nombres = clas['EQUIPO'].to_numpy()
+        self._pos = {id_eq: i for i, id_eq in enumerate(self.ids)}
+
+        pj = clas['PJ'].to_numpy(dtype=float)
+        gf, gc = clas['GF'].to_numpy(dtype=float) / pj, clas['GC'].to_numpy(dtype=float) / pj
+        if df_stats is not None and 'xG' in df_stats.columns:
+            xg = pd.Series(self.ids).map(self.indice.serie_por_id(df_stats, 'EQUIPO', 'xG')).to_numpy(dtype=float)
+            gf = np.where(np.isfinite(xg) & (xg > 0), (1 - PESO_XG) * gf + PESO_XG * xg, gf)
+        self.media = max(float(np.mean(gc)), 1e-6)
+        self.ataque = gf / max(float(np.mean(gf)), 1e-6)
+        self.defensa = gc / self.media
+
+        # λ de cada cruce local (fila) × visitante (columna), en una sola pasada
+        self.lambda_local = self.media * self.ataque[:, None] * self.defensa[None, :] * VENTAJA_LOCAL
+        self.lambda_visitante = self.media * self.ataque[None, :] * self.defensa[:, None] * DESVENTAJA_VISITANTE
+        p_l, p_v = poisson(self.lambda_local), poisson(self.lambda_visitante)
+        # Matriz de marcadores N × N × (G+1) × (G+1)
+        self.marcadores = p_l[:, :, :, None] * p_v[:, :, None, :]
+        self.marcadores /= self.marcadores.sum(axis=(2, 3), keepdims=True)
+        self.probabilidades = {k: np.einsum('ijab,ab->ij', self.marcadores, m) for k, m in _MASCARAS.items()}
+        self.probabilidades["BTTS"] = (1 - p_l[:, :, 0]) * (1 - p_v[:, :, 0])
+
+    def posiciones(self, ids):
+        return pd.Series(ids, dtype=object).map(self._pos).to_numpy(dtype=float)
+
+    def partidos(self, locales, visitantes):
+        ids = self.indice.ids
+        return self.partidos_por_id(ids(pd.Series(locales, dtype=object)), ids(pd.Series(visitantes, dtype=object)))
+
+    def partidos_por_id(self, ids_local, ids_visitante):
+        # Probabilidades para una lista de cruces; NaN si algún equipo no está en la clasificación
+        i, j = self.posiciones(ids_local), self.posiciones(ids_visitante)
+        ok = np.isfinite(i) & np.isfinite(j) & (i != j)
+        ii, jj = np.where(ok, i, 0).astype(int), np.where(ok, j, 0).astype(int)
+        res = {"XG_LOCAL": self.lambda_local[ii, jj], "XG_VISITANTE": self.lambda_visitante[ii, jj]}
+        res.update({k: v[ii, jj] for k, v in self.probabilidades.items()})
+        return pd.DataFrame({k: np.where(ok, v, np.nan) for k, v in res.items()})
+
+    def partido(self, local, visitante):
+        fila = self.partidos([local], [visitante]).iloc[0]
+        return None if fila.isna().all() else fila
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import datos
+import instantanea
+import medicion
+import recursos
+from config import LIGAS_LISTA, MAPEO_ARCHIVOS
+from descargas import CACHE_DIR
+from jugadores import TablaJugadores, Paginador
+from modelo import ModeloGoles
+from render import html_tabla, insertar_probabilidades, tarjeta_pick
+
+# ────────────────────────────────────────────────
+# PÁGINAS PRERENDERIZADAS (LIGA × VISTA × VERSIÓN DE LOS DATOS)
+# ────────────────────────────────────────────────
+# Clasificación, stats, fixture y jugadores (top picks y primera página de cada pestaña) sin filtros solo
+# cambian con datos_fbref: su HTML se genera una vez por versión de los archivos que usa cada vista y se
+# guarda como {liga}_{vista}_{hash de esas versiones}.json; al guardar una versión nueva se borran las
+# anteriores de la misma liga y vista. La app y herramientas/prerenderizar.py usan las mismas
+# funciones de render.py, así que el HTML es el mismo que pintaría la vista.
+
+ESQUEMA = 4            # subir cuando cambie el HTML de render.py / jugadores.py: invalida las páginas anteriores
+CARPETA = os.environ.get("INSIDEBET_PAGINAS") or os.path.join(CACHE_DIR, "paginas")
+VISTAS = ["clas", "stats", "fix", "players"]
+MAX_MEMORIA = 256
+
+_memoria = OrderedDict()    # clave -> fragmentos (LRU: las usadas hace menos; el resto se relee del disco)
+_locks = {}
+_lock_global = threading.Lock()
+
+
+def _lock_de(clave):
+    with _lock_global:
+        if clave not in _locks:
+            _locks[clave] = threading.Lock()
+        return _locks[clave]
+
+
+def archivos(liga, vista):
+    # (archivo, tipo) de los que depende el HTML de cada vista
+    sufijo = MAPEO_ARCHIVOS[liga]
+    clas, stats = (f"CLASIFICACION_LIGA_{sufijo}.xlsx", "clasificacion"), (f"RESUMEN_STATS_{sufijo}.xlsx", "stats")
+    return {
+        "clas": [clas], "stats": [stats],
+        "fix": [(f"CARTELERA_PROXIMOS_{sufijo}.xlsx", "fixture"), clas, stats],
+        "players": [(f"SUPER_STATS_{sufijo}.xlsx", "jugadores"), ("picks_finales_fiables.xlsx", "picks")],
+    }[vista]
+
+
+def versiones(liga, vista):
+    # Las stats del fixture son opcionales (sin ellas no hay modelo): su versión queda en None
+    out = []
+    for archivo, tipo in archivos(liga, vista):
+        try:
+            out.append(instantanea.revalidar(archivo, tipo)[0])
+        except Exception:
+            if tipo != "stats": raise
+            out.append(None)
+    return out
+
+
+def clave(liga, vista, vers):
+    h = hashlib.sha256(json.dumps([ESQUEMA, recursos.version(), liga, vista, vers]).encode()).hexdigest()[:16]
+    return f"{MAPEO_ARCHIVOS[liga]}_{vista}_{h}"
+
+
+# cargar(archivo, tipo) -> DataFrame o None: cargar_excel en la app, datos.leer en la herramienta
+def construir(liga, vista, cargar):
+    if vista in ("clas", "stats", "fix"):
+        archivo, tipo = archivos(liga, vista)[0]
+        df = cargar(archivo, tipo)
+        if df is None: return None
+        if vista == "fix" and 'VISITANTE' in df.columns:
+            _, clas, stats = archivos(liga, vista)
+            df_clas = cargar(*clas)
+            try:
+                modelo = ModeloGoles(df_clas, cargar(*stats)) if df_clas is not None else None
+            except Exception:
+                modelo = None
+            if modelo is not None:
+                df = insertar_probabilidades(df, modelo)
+        return {"tabla": html_tabla(df)}
+
+    df_picks = cargar("picks_finales_fiables.xlsx", "picks")
+    top = datos.particionar_picks(df_picks).get(MAPEO_ARCHIVOS[liga], pd.DataFrame()) if df_picks is not None else pd.DataFrame()
+    fragmentos = {"picks": [tarjeta_pick(row) for _, row in top.iterrows()], "ataque": None, "disciplina": None}
+    df_jug = cargar(*archivos(liga, vista)[0])
+    if df_jug is not None:
+        tabla = TablaJugadores(df_jug)
+        mask = tabla.filtrar(tabla.posiciones)
+        for pestana in ("ataque", "disciplina"):
+            fragmentos[pestana] = Paginador(tabla, pestana, mask, None).html()
+    return fragmentos
+
+
+def _ruta(clave, carpeta=None):
+    return os.path.join(carpeta or CARPETA, f"{clave}.json")
+
+
+def leer(clave, carpeta=None):
+    with _lock_global:
+        if clave in _memoria:
+            _memoria.move_to_end(clave)
+            return _memoria[clave]
+    try:
+        with open(_ruta(clave, carpeta), encoding="utf-8") as f:
+            fragmentos = json.load(f)
+    except (OSError, ValueError):
+        return None
+    _recordar(clave, fragmentos)
+    return fragmentos
+
+
+def guardar(clave, fragmentos, carpeta=None):
+    ruta = _ruta(clave, carpeta)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    tmp = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(fragmentos, f, ensure_ascii=False)
+    os.replace(tmp, ruta)
+    _recordar(clave, fragmentos)
+    _podar(clave, os.path.dirname(ruta))
+
+
+def _recordar(clave, fragmentos):
+    with _lock_global:
+        _memoria[clave] = fragmentos
+        _memoria.move_to_end(clave)
+        while len(_memoria) > MAX_MEMORIA:
+            _memoria.popitem(last=False)
+
+
+def _podar(clave, carpeta):
+    # Páginas de la misma liga y vista con otra versión: ya no las va a pedir nadie
+    prefijo = clave.rsplit("_", 1)[0] + "_"
+    anteriores = re.compile(re.escape(prefijo) + r"[0-9a-f]{16}\.json")
+    for nombre in os.listdir(carpeta):
+        if anteriores.fullmatch(nombre) and nombre != f"{clave}.json":
+            try:
+                os.remove(os.path.join(carpeta, nombre))
+            except OSError:
+                pass
+    with _lock_global:
+        for c in [c for c in _memoria if c != clave and c.startswith(prefijo)]:
+            del _memoria[c]
+
+
+def obtener(liga, vista, cargar, carpeta=None):
+    # Fragmentos de la vista para la versión actual de sus datos; el primero que los pide los genera
+    with medicion.tramo(f"pagina:{vista}", liga=liga, cache="hit"):
+        try:
+            c = clave(liga, vista, versiones(liga, vista))
+        except Exception:
+            return None
+        fragmentos = leer(c, carpeta)
+        if fragmentos is not None: return fragmentos
+        with _lock_de(c):
+            fragmentos = leer(c, carpeta)
+            if fragmentos is None:
+                medicion.anotar(cache="miss")
+                fragmentos = construir(liga, vista, cargar)
+                if fragmentos is None: return None
+                guardar(c, fragmentos, carpeta)
+        return fragmentos
+
+
+def prerenderizar(cargar, ligas=None, vistas=None, carpeta=None, hilos=8):
+    # Todas las liga × vista en paralelo; devuelve {(liga, vista): clave o None}
+    pares = [(l, v) for l in (ligas or LIGAS_LISTA) for v in (vistas or VISTAS)]
+
+    def una(par):
+        liga, vista = par
+        try:
+            c = clave(liga, vista, versiones(liga, vista))
+        except Exception:
+            return None
+        return c if obtener(liga, vista, cargar, carpeta) is not None else None
+
+    with ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="prerender") as pool:
+        return dict(zip(pares, pool.map(una, pares)))
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+import equipos
+
+# ────────────────────────────────────────────────
+# ALMACÉN DE RASGOS POR EQUIPO (H2H, RADAR, CONFIANZA)
+# ────────────────────────────────────────────────
+# Una fila por equipo de la clasificación; se construye una vez por versión de CLASIFICACION + RESUMEN_STATS
+# y cualquier cruce o ranking sale de consultas a la matriz.
+
+COLUMNAS = ["PTS", "PJ", "G", "GF", "POSESIÓN", "xG", "VICT_FORMA", "PTS_PJ", "CONFIANZA", "PORC",
+            "R_PTS", "R_POSS", "R_GF", "R_XG", "R_VICT"]
+C = {c: i for i, c in enumerate(COLUMNAS)}
+RADAR = ["R_PTS", "R_POSS", "R_GF", "R_XG", "R_VICT"]
+ETIQUETAS_RADAR = ["PTS", "POSS", "GF", "xG", "VICT"]
+
+
+class RasgosEquipos:
+    def __init__(self, df_clas, df_stats=None, indice=None):
+        self.indice = indice or equipos.indice()
+        clas = self.indice.indexar(df_clas, 'EQUIPO')
+        self.ids = clas.index.to_numpy()
+        self.nombres = clas['EQUIPO'].to_numpy(dtype=object)
+        self.forma = clas['ÚLTIMOS 5'].to_numpy(dtype=object) if 'ÚLTIMOS 5' in clas.columns else np.full(len(clas), np.nan, dtype=object)
+        self._pos = {id_eq: i for i, id_eq in enumerate(self.ids)}
+
+        def col(df, nombre):
+            return df[nombre].to_numpy(dtype=float) if nombre in df.columns else np.full(len(df), np.nan)
+
+        m = np.full((len(clas), len(COLUMNAS)), np.nan)
+        for c in ["PTS", "PJ", "G", "GF"]:
+            m[:, C[c]] = col(clas, c)
+        if df_stats is not None:
+            stats = self.indice.indexar(df_stats, 'EQUIPO').reindex(self.ids)
+            m[:, C["POSESIÓN"]] = col(stats, 'POSESIÓN')
+            m[:, C["xG"]] = col(stats, 'xG')
+        m[:, C["VICT_FORMA"]] = [str(f).count('W') for f in self.forma]
+        pts, pj = m[:, C["PTS"]], m[:, C["PJ"]]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            m[:, C["PTS_PJ"]] = pts / pj
+            # Misma fórmula que el índice de confianza original: xG·0.4 + pts/PJ·15 + victorias recientes·5
+            m[:, C["CONFIANZA"]] = m[:, C["xG"]] * 0.4 + pts / np.where(pj == 0, 1, pj) * 15 + m[:, C["VICT_FORMA"]] * 5
+            conf2 = m[:, C["CONFIANZA"]] * 2
+            m[:, C["PORC"]] = np.where(np.isfinite(conf2), np.minimum(np.trunc(conf2), 100), np.nan)
+        m[:, C["R_PTS"]] = np.minimum(pts * 1.5, 100)
+        m[:, C["R_POSS"]] = m[:, C["POSESIÓN"]]
+        m[:, C["R_GF"]] = np.minimum(m[:, C["GF"]] * 1.2, 100)
+        m[:, C["R_XG"]] = np.minimum(m[:, C["xG"]] * 20, 100)
+        m[:, C["R_VICT"]] = np.minimum(m[:, C["G"]] * 5, 100)
+        self.matriz = m
+        self._radar = [C[c] for c in RADAR]
+
+    def posicion(self, nombre):
+        pos = self._pos.get(self.indice.id_de(nombre))
+        if pos is None: raise KeyError(nombre)
+        return pos
+
+    def valor(self, nombre, columna):
+        return self.matriz[self.posicion(nombre), C[columna]]
+
+    def fila(self, nombre):
+        i = self.posicion(nombre)
+        return {**dict(zip(COLUMNAS, self.matriz[i].tolist())), "EQUIPO": self.nombres[i], "ÚLTIMOS 5": self.forma[i]}
+
+    def radar(self, nombre):
+        return self.matriz[self.posicion(nombre), self._radar].tolist()
+
+    def completo(self, nombre):
+        # El H2H necesita clasificación y stats del equipo
+        return bool(np.isfinite(self.matriz[self.posicion(nombre), self._radar]).all())
+
+    def ranking(self):
+        conf = self.matriz[:, C["PORC"]]
+        orden = np.argsort(-np.nan_to_num(conf, nan=-1), kind='stable')
+        return pd.DataFrame({
+            "EQUIPO": self.nombres[orden], "CONFIANZA": conf[orden],
+            "xG": self.matriz[orden, C["xG"]], "PTS/PJ": self.matriz[orden, C["PTS_PJ"]],
+            "ÚLTIMOS 5": self.forma[orden],
+        })
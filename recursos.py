@@ -0,0 +1,84 @@
+import base64
+import functools
+import json
+import os
+
+import equipos
+from config import BANDERAS, ICONO_TIRO_URL, LOGO_URL
+
+# ────────────────────────────────────────────────
+# IMÁGENES LOCALES (LOGO, BANDERAS, ICONOS Y ESCUDOS)
+# ────────────────────────────────────────────────
+# herramientas/compilar_recursos.py descarga cada imagen una vez, la reduce a su tamaño en pantalla y la
+# guarda en recursos/ con el hash de su contenido como nombre, junto a un manifiesto que las enumera.
+# La app las incrusta como data URI y el navegador no pide nada a postimg ni a fbref. Sin manifiesto o sin
+# la imagen se usa la URL de siempre, salvo los escudos: sin imagen local no se pintan.
+
+ESQUEMA = 1            # subir cuando cambien los nombres o LADOS: invalida el manifiesto anterior
+CARPETA = os.environ.get("INSIDEBET_RECURSOS") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "recursos")
+MANIFIESTO = "manifiesto.json"
+
+# Lado mayor en px: el doble de lo que ocupa en pantalla (pantallas de alta densidad); el logo, que ya
+# ocupa hasta 500 px, se queda a su tamaño
+LADOS = {"logo": 500, "tiro": 90, "bandera": 80, "escudo": 40}
+
+
+def fuentes():
+    # nombre -> (tipo, url de origen)
+    out = {"logo": ("logo", LOGO_URL), "tiro": ("tiro", ICONO_TIRO_URL)}
+    out.update({f"bandera:{liga}": ("bandera", url) for liga, url in BANDERAS.items()})
+    out.update({f"escudo:{id_eq}": ("escudo", url) for id_eq, url in equipos.indice().logos.items()})
+    return out
+
+
+@functools.lru_cache(maxsize=1)
+def manifiesto():
+    try:
+        with open(os.path.join(CARPETA, MANIFIESTO), encoding="utf-8") as f:
+            m = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return m if m.get("esquema") == ESQUEMA else None
+
+
+def version():
+    # Entra en la clave de las páginas prerenderizadas: compilar recursos nuevos las regenera
+    m = manifiesto()
+    return m["version"] if m else None
+
+
+@functools.lru_cache(maxsize=1024)
+def data_uri(nombre):
+    m = manifiesto()
+    entrada = m["recursos"].get(nombre) if m else None
+    if not entrada: return None
+    try:
+        with open(os.path.join(CARPETA, entrada["archivo"]), "rb") as f:
+            contenido = f.read()
+    except OSError:
+        return None
+    return f"data:image/png;base64,{base64.b64encode(contenido).decode()}"
+
+
+def src(nombre, url):
+    return data_uri(nombre) or url
+
+
+def logo():
+    return src("logo", LOGO_URL)
+
+
+def bandera(liga):
+    return src(f"bandera:{liga}", BANDERAS.get(liga, ""))
+
+
+def css():
+    # El icono de tiro se repite en cada tarjeta: va una sola vez en la hoja de estilos
+    return f'.icono-tiro {{ background-image: url("{src("tiro", ICONO_TIRO_URL)}"); }}'
+
+
+@functools.lru_cache(maxsize=4096)
+def escudo(equipo):
+    if manifiesto() is None: return None
+    id_eq = equipos.indice().id_de(equipo)
+    return data_uri(f"escudo:{id_eq}") if id_eq else None
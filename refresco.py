@@ -0,0 +1,115 @@
+import os
+import threading
+import time
+
+import requests
+
+import cuotas
+import descargas
+import medicion
+
+# ────────────────────────────────────────────────
+# REFRESCO EN SEGUNDO PLANO (STALE-WHILE-REVALIDATE)
+# ────────────────────────────────────────────────
+# Un hilo por proceso vuelve a comprobar los archivos ya pedidos y las cuotas que alguien está mirando.
+# Mientras tanto los usuarios reciben la versión publicada; una versión nueva de un archivo se parsea
+# primero en este hilo (calentar) y solo después se publica, así que ninguna petición espera al origen.
+
+INTERVALO = int(os.environ.get("INSIDEBET_REFRESCO_INTERVALO", 60))    # segundos entre pasadas
+
+
+class Refrescador:
+    def __init__(self, calentar=None, intervalo=INTERVALO):
+        # calentar(usados): carga con las versiones nuevas (aún sin publicar) los (archivo, tipo) ya usados
+        self.calentar = calentar
+        self.intervalo = intervalo
+        self.usados = set()
+        self._lock_usados = threading.Lock()
+        self.estado = {}       # "archivo:..." / "cuotas:..." -> última comprobación, fallos, versión
+        self.pasadas = 0
+        self.ultima_pasada = None
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._hilo = threading.Thread(target=self._bucle, daemon=True, name="refresco")
+
+    def iniciar(self):
+        descargas.segundo_plano = True
+        cuotas.segundo_plano = True
+        self._hilo.start()
+        return self
+
+    def detener(self):
+        self._parar.set()
+        descargas.segundo_plano = False
+        cuotas.segundo_plano = False
+
+    def usar(self, archivo, tipo):
+        if (archivo, tipo) in self.usados: return
+        with self._lock_usados:
+            self.usados.add((archivo, tipo))
+
+    def _bucle(self):
+        while not self._parar.wait(self.intervalo):
+            self.pasada()
+
+    def pasada(self):
+        with self._lock:
+            with medicion.tramo("refresco:archivos"):
+                self._refrescar_archivos()
+            with medicion.tramo("refresco:cuotas"):
+                self._refrescar_cuotas()
+            self.pasadas += 1
+            self.ultima_pasada = time.time()
+
+    def _anotar(self, clave, ok, **datos):
+        e = self.estado.setdefault(clave, {"ultimo_ok": None, "ultimo_fallo": None, "fallos": 0, "fallos_seguidos": 0})
+        ahora = time.time()
+        if ok:
+            e.update(ultimo_ok=ahora, fallos_seguidos=0, **datos)
+        else:
+            e.update(ultimo_fallo=ahora, fallos=e["fallos"] + 1, fallos_seguidos=e["fallos_seguidos"] + 1, **datos)
+
+    def _refrescar_archivos(self):
+        nuevas, comprobadas = {}, {}
+        for ruta in descargas.por_revisar():
+            try:
+                version = descargas.comprobar(ruta)
+            except requests.HTTPError:
+                version = (None, None)          # ya no está en el origen
+            except Exception as e:
+                self._anotar(f"archivo:{ruta}", False, error=type(e).__name__)
+                continue
+            self._anotar(f"archivo:{ruta}", True, version=version[0])
+            comprobadas[ruta] = version
+            if version[0] != descargas.publicada(ruta): nuevas[ruta] = version
+        if nuevas and self.calentar:
+            # Las versiones nuevas se parsean aquí antes de que ningún usuario pueda pedirlas
+            with descargas.vista_previa(nuevas), medicion.tramo("refresco:calentar"):
+                try:
+                    with self._lock_usados:
+                        usados = list(self.usados)
+                    self.calentar(usados)
+                except Exception as e:
+                    self._anotar("calentar", False, error=type(e).__name__)
+                else:
+                    self._anotar("calentar", True, archivos=len(nuevas))
+        descargas.publicar(comprobadas)
+
+    def _refrescar_cuotas(self):
+        for sport_key, api_key in cuotas.activas():
+            try:
+                if cuotas.refrescar(sport_key, api_key):
+                    self._anotar(f"cuotas:{sport_key}", True)
+            except Exception as e:
+                cuotas.contadores["errores"] += 1
+                self._anotar(f"cuotas:{sport_key}", False, error=type(e).__name__)
+
+    def resumen(self):
+        # Una fila por archivo / sport_key para el panel de rendimiento
+        ahora = time.time()
+        hace = lambda t: round(ahora - t, 1) if t else None
+        return [
+            {"RECURSO": clave, "HACE_OK_S": hace(e["ultimo_ok"]), "HACE_FALLO_S": hace(e["ultimo_fallo"]),
+             "FALLOS": e["fallos"], "SEGUIDOS": e["fallos_seguidos"], "VERSIÓN": e.get("version")}
+            for clave, e in sorted(self.estado.items())
+        ]
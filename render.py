@@ -0,0 +1,405 @@
+import functools
+import itertools
+import re
+
+import numpy as np
+import pandas as pd
+
+import recursos
+
+# ────────────────────────────────────────────────
+# FUNCIONES DE FORMATO (ORIGINALES SIN TOCAR)
+# ────────────────────────────────────────────────
+
+def formatear_xg_badge(val):
+    try:
+        num = float(val)
+        color = "#137031" if num > 1.50 else "#821f1f"
+        return f'<div style="display: flex; justify-content: center;"><span style="background-color: {color}; color: white; padding: 4px 10px; border-radius: 6px; font-weight: bold; font-size: 12px; min-width: 45px; text-align: center;">+{num:.1f}</span></div>'
+    except: return val
+
+def html_barra_posesion(valor):
+    try:
+        num_str = str(valor).replace('%', '').strip()
+        num_clean = re.findall(r"[-+]?\d*\.\d+|\d+", num_str)[0]
+        num = float(num_clean)
+        percent = min(max(int(num), 0), 100)
+        return f'''
+        <div style="position: relative; width: 100%; background-color: #2d3139; border-radius: 4px; height: 20px; overflow: hidden; border: 1px solid #4b5563;">
+            <div style="width: {percent}%; background-color: #1ed7de; height: 100%;"></div>
+            <div style="position: absolute; top: 0; left: 0; width: 100%; height: 100%; display: flex; align-items: center; justify-content: center; color: white; font-size: 11px; font-weight: bold; text-shadow: 1px 1px 2px black;">
+                {percent}%
+            </div>
+        </div>
+        '''
+    except: return valor
+
+def grafico_picos_forma(valor, alineacion="left"):
+    if pd.isna(valor) or valor == "": return ""
+    letras = list(str(valor).upper().replace(" ", ""))[:5]
+    if not letras: return ""
+    mapeo_y = {'W': 4, 'D': 11, 'L': 18}
+    colores_puntos = {'W': '#137031', 'D': '#b59410', 'L': '#821f1f'}
+    puntos_coords = []
+    puntos_svg = []
+    for i, l in enumerate(letras):
+        x = 10 + (i * 25) 
+        y = mapeo_y.get(l, 11)
+        puntos_coords.append(f"{x},{y}")
+        puntos_svg.append(f'<circle cx="{x}" cy="{y}" r="3" fill="{colores_puntos.get(l, "#4b5563")}" stroke="#0e1117" stroke-width="0.5" />')
+    path_d = "M " + " L ".join(puntos_coords)
+    svg = f'''
+    <div style="width: 100%; height: 30px; display: flex; align-items: center; justify-content: {'flex-start' if alineacion=='left' else 'flex-end'};">
+        <svg width="130" height="22" viewBox="0 0 130 22" preserveAspectRatio="xMidYMid meet">
+            <path d="{path_d}" fill="none" stroke="#1ed7de" stroke-width="1.2" stroke-linecap="round" stroke-linejoin="round" opacity="0.4" />
+            {''.join(puntos_svg)}
+        </svg>
+    </div>
+    '''
+    return svg
+
+def generar_radar_svg(val_l, val_v, labels):
+    size = 200
+    center = size / 2
+    radius = 70
+    def get_coords(value, angle, max_val=100):
+        v = float(value) if pd.notna(value) else 0
+        r = (min(v, max_val) / max_val) * radius
+        x = center + r * np.cos(angle - np.pi/2)
+        y = center + r * np.sin(angle - np.pi/2)
+        return f"{x},{y}"
+    angles = np.linspace(0, 2*np.pi, len(labels), endpoint=False)
+    grid = ""
+    for r_f in [0.25, 0.5, 0.75, 1.0]:
+        pts = [f"{center + (radius*r_f)*np.cos(a-np.pi/2)},{center + (radius*r_f)*np.sin(a-np.pi/2)}" for a in angles]
+        grid += f'<polygon points="{" ".join(pts)}" fill="none" stroke="#4b5563" stroke-width="0.5" stroke-dasharray="2,2" />'
+    pts_l = [get_coords(v, a) for v, a in zip(val_l, angles)]
+    pts_v = [get_coords(v, a) for v, a in zip(val_v, angles)]
+    radar = f'''
+    <svg width="100%" height="{size}" viewBox="0 0 {size} {size}">
+        {grid}
+        <polygon points="{" ".join(pts_l)}" fill="#1ed7de22" stroke="#1ed7de" stroke-width="2" />
+        <polygon points="{" ".join(pts_v)}" fill="#b5941022" stroke="#b59410" stroke-width="2" />
+        {''.join([f'<text x="{center + (radius+20)*np.cos(a-np.pi/2)}" y="{center + (radius+20)*np.sin(a-np.pi/2)}" fill="#9ca3af" font-size="9" text-anchor="middle">{l}</text>' for l, a in zip(labels, angles)])}
+    </svg>
+    '''
+    return radar
+
+def formatear_last_5(valor):
+    if pd.isna(valor) or valor == "": return ""
+    trad = {'W': 'G', 'L': 'P', 'D': 'E'}
+    letras = list(str(valor).upper().replace(" ", ""))[:5]
+    html_str = '<div style="display: flex; gap: 4px; justify-content: center;">'
+    for l in letras:
+        clase_color = "#137031" if l == 'W' else "#821f1f" if l == 'L' else "#82711f" if l == 'D' else "#2d3139"
+        html_str += f'<span style="background-color: {clase_color}; color: white; padding: 2px 6px; border-radius: 4px; font-size: 11px; font-weight: bold; min-width: 20px; text-align: center;">{trad.get(l, l)}</span>'
+    return html_str + '</div>'
+
+def badge_cuota(val, es_minimo=False, tiene_valor=False):
+    color_bg = "#b59410" if tiene_valor else ("#137031" if es_minimo else "#2d3139")
+    color_text = "white" if tiene_valor else ("#00ff88" if es_minimo else "#ced4da")
+    label = " ⭐" if tiene_valor else ""
+    return f'<div style="display: flex; justify-content: center;"><span style="background-color: {color_bg}; color: {color_text}; padding: 5px 12px; border-radius: 6px; font-weight: bold; font-size: 13px; min-width: 60px; text-align: center; border: 1px solid #4b5563;">{val:.2f}{label}</span></div>'
+
+
+# ────────────────────────────────────────────────
+# TABLAS PRECALCULADAS Y RENDER POR COLUMNA
+# ────────────────────────────────────────────────
+# Mismo HTML byte a byte que las funciones de arriba, pero cada celda es una consulta a un diccionario
+
+def _claves_forma():
+    for n in range(6):
+        for combo in itertools.product("WDL", repeat=n):
+            yield "".join(combo)
+
+# La clave "" es un valor con solo espacios (el vacío de verdad se resuelve antes)
+TABLA_LAST_5 = {k: formatear_last_5(k or " ") for k in _claves_forma()}
+TABLA_FORMA = {(k, a): grafico_picos_forma(k or " ", a) for k in _claves_forma() for a in ("left", "right")}
+TABLA_POSESION = [html_barra_posesion(p) for p in range(101)]
+
+formatear_xg_badge_cache = functools.lru_cache(maxsize=4096)(formatear_xg_badge)
+badge_cuota_cache = functools.lru_cache(maxsize=8192)(badge_cuota)
+
+
+def _clave_forma(serie):
+    return serie.astype(str).str.upper().str.replace(" ", "", regex=False).str[:5]
+
+
+# Rejilla, ejes y rótulos del radar solo dependen de las etiquetas: se calculan una vez
+@functools.lru_cache(maxsize=16)
+def _geometria_radar(labels):
+    size = 200
+    center = size / 2
+    radius = 70
+    angles = np.linspace(0, 2*np.pi, len(labels), endpoint=False)
+    grid = ""
+    for r_f in [0.25, 0.5, 0.75, 1.0]:
+        pts = [f"{center + (radius*r_f)*np.cos(a-np.pi/2)},{center + (radius*r_f)*np.sin(a-np.pi/2)}" for a in angles]
+        grid += f'<polygon points="{" ".join(pts)}" fill="none" stroke="#4b5563" stroke-width="0.5" stroke-dasharray="2,2" />'
+    ejes = [(np.cos(a - np.pi/2), np.sin(a - np.pi/2)) for a in angles]
+    textos = ''.join([f'<text x="{center + (radius+20)*np.cos(a-np.pi/2)}" y="{center + (radius+20)*np.sin(a-np.pi/2)}" fill="#9ca3af" font-size="9" text-anchor="middle">{l}</text>' for l, a in zip(labels, angles)])
+    return ejes, grid, textos
+
+
+def radar_svg(val_l, val_v, labels):
+    # Mismo SVG que generar_radar_svg sin recalcular la trigonometría de la rejilla
+    size, center, radius = 200, 100.0, 70
+    ejes, grid, textos = _geometria_radar(tuple(labels))
+    def get_coords(value, eje, max_val=100):
+        v = float(value) if pd.notna(value) else 0
+        r = (min(v, max_val) / max_val) * radius
+        return f"{center + r * eje[0]},{center + r * eje[1]}"
+    pts_l = [get_coords(v, e) for v, e in zip(val_l, ejes)]
+    pts_v = [get_coords(v, e) for v, e in zip(val_v, ejes)]
+    return f'''
+    <svg width="100%" height="{size}" viewBox="0 0 {size} {size}">
+        {grid}
+        <polygon points="{" ".join(pts_l)}" fill="#1ed7de22" stroke="#1ed7de" stroke-width="2" />
+        <polygon points="{" ".join(pts_v)}" fill="#b5941022" stroke="#b59410" stroke-width="2" />
+        {textos}
+    </svg>
+    '''
+
+
+def render_last_5(serie):
+    vacio = serie.isna() | (serie.astype(str) == "")
+    claves = _clave_forma(serie)
+    html = claves.map(TABLA_LAST_5)
+    # Letras fuera de W/D/L: se delega en la función original
+    raros = html.isna() & ~vacio
+    if raros.any():
+        html[raros] = serie[raros].map(formatear_last_5)
+    html[vacio] = ""
+    return html.astype(object)
+
+
+def render_forma(serie, alineacion="left"):
+    vacio = serie.isna() | (serie.astype(str) == "")
+    claves = _clave_forma(serie)
+    html = claves.map(lambda k: TABLA_FORMA.get((k, alineacion)))
+    raros = html.isna() & ~vacio
+    if raros.any():
+        html[raros] = serie[raros].map(lambda v: grafico_picos_forma(v, alineacion))
+    html[vacio] = ""
+    return html.astype(object)
+
+
+def forma_cache(valor, alineacion="left"):
+    if pd.isna(valor) or valor == "": return ""
+    html = TABLA_FORMA.get((str(valor).upper().replace(" ", "")[:5], alineacion))
+    return html if html is not None else grafico_picos_forma(valor, alineacion)
+
+
+def render_posesion(serie):
+    num = pd.to_numeric(serie, errors='coerce').to_numpy(dtype=float)
+    # str() de valores diminutos o enormes sale en notación científica y la regex original lee otra cifra
+    directo = np.isfinite(num) & ((num == 0) | (np.abs(num) >= 1e-4)) & (np.abs(num) < 1e16)
+    pct = np.clip(np.trunc(np.where(directo, num, 0)), 0, 100).astype(int)
+    tabla = np.array(TABLA_POSESION, dtype=object)
+    html = pd.Series(tabla[pct], index=serie.index, dtype=object)
+    if not directo.all():
+        html[~directo] = serie[~directo].map(html_barra_posesion)
+    return html
+
+
+def render_xg(serie):
+    return serie.map(formatear_xg_badge_cache).astype(object)
+
+
+def render_cuotas(df, columnas=("1", "X", "2")):
+    # badge_cuota por columna; el favorito es la cuota mínima de la fila
+    precios = df[list(columnas)].to_numpy(dtype=float)
+    minimo = precios.min(axis=1)
+    out = df.copy()
+    for j, c in enumerate(columnas):
+        valor = df[f"VAL_{c}"].to_numpy(dtype=bool) if f"VAL_{c}" in df.columns else np.zeros(len(df), dtype=bool)
+        out[c] = [badge_cuota_cache(float(p), bool(p == m), bool(v)) for p, m, v in zip(precios[:, j], minimo, valor)]
+    return out
+
+
+def render_diferencia(serie, signo):
+    # Diferencia de goles con el formato del origen: "+19" solo en las filas que lo traían (Champions)
+    num = pd.to_numeric(serie, errors='coerce').to_numpy(dtype=float)
+    return pd.Series([(f"{v:+.0f}" if s else f"{v:.0f}") if np.isfinite(v) else "" for v, s in zip(num, signo)],
+                     index=serie.index, dtype=object)
+
+
+def render_equipo(serie):
+    # Escudo local delante del nombre; sin recursos compilados el nombre queda igual
+    if recursos.manifiesto() is None: return serie
+    html = {}
+    for nombre in pd.unique(serie):
+        uri = recursos.escudo(nombre)
+        html[nombre] = f'<img src="{uri}" class="escudo">{nombre}' if uri else nombre
+    return serie.map(html).astype(object)
+
+
+# Etapa de presentación: el HTML solo se genera para las filas que se van a mostrar
+def renderizar_tabla(df):
+    df = df.copy()
+    for col in ('EQUIPO', 'LOCAL', 'VISITANTE'):
+        if col in df.columns: df[col] = render_equipo(df[col])
+    if 'ÚLTIMOS 5' in df.columns: df['ÚLTIMOS 5'] = render_last_5(df['ÚLTIMOS 5'])
+    if 'POSESIÓN' in df.columns: df['POSESIÓN'] = render_posesion(df['POSESIÓN'])
+    if 'xG' in df.columns: df['xG'] = render_xg(df['xG'])
+    if 'DG_SIGNO' in df.columns:
+        df['DG'] = render_diferencia(df['DG'], df['DG_SIGNO'].to_numpy(dtype=bool))
+        df = df.drop(columns='DG_SIGNO')
+    return df
+
+
+def render_porcentaje(serie):
+    num = pd.to_numeric(serie, errors='coerce').to_numpy(dtype=float)
+    return pd.Series([f"{p:.0%}" if np.isfinite(p) else "---" for p in num], index=serie.index, dtype=object)
+
+
+def render_tendencia(prob_over):
+    # Tendencia de goles según la probabilidad de +2.5 del modelo Poisson
+    # Sin modelo llega un ndarray de NaN: to_numeric devuelve entonces otro ndarray, no una Series
+    p = np.asarray(pd.to_numeric(prob_over, errors='coerce'), dtype=float)
+    return np.where(np.isnan(p), "---", np.where(
+        p > 0.5, [f"🔥 Over {x:.0%}" for x in np.nan_to_num(p)], [f"🛡️ Under {1 - x:.0%}" for x in np.nan_to_num(p)]))
+
+
+# ────────────────────────────────────────────────
+# HTML DE CADA VISTA (COMPARTIDO POR LA APP Y LAS HERRAMIENTAS)
+# ────────────────────────────────────────────────
+COLUMNAS_CUOTAS = ['FECHA', 'LOCAL', 'VISITANTE', '1', 'X', '2', 'TENDENCIA']
+
+
+def render_ventaja(serie):
+    num = pd.to_numeric(serie, errors='coerce').to_numpy(dtype=float)
+    return pd.Series([f"{v:+.1%}" if np.isfinite(v) else "---" for v in num], index=serie.index, dtype=object)
+
+
+def html_tabla(df):
+    # Clasificación, stats y fixture
+    df_view = renderizar_tabla(df)
+    styler = df_view.style.hide(axis="index")
+    if 'PTS' in df_view.columns: styler = styler.set_properties(subset=['PTS'], **{'background-color': '#1ed7de22', 'font-weight': 'bold', 'color': '#1ed7de'})
+    return styler.to_html(escape=False)
+
+
+def html_cuotas(df_odds):
+    df = render_cuotas(df_odds)[COLUMNAS_CUOTAS]
+    df['LOCAL'], df['VISITANTE'] = render_equipo(df['LOCAL']), render_equipo(df['VISITANTE'])
+    return df.style.hide(axis="index").to_html(escape=False)
+
+
+def html_escaner(df_valor):
+    # Escáner de todas las ligas: el pick es el resultado con más ventaja de cada partido
+    out = pd.DataFrame({
+        'LIGA': df_valor['LIGA'], 'FECHA': df_valor['FECHA'],
+        'PARTIDO': df_valor['LOCAL'] + " vs " + df_valor['VISITANTE'], 'PICK': df_valor['PICK'],
+        'CUOTA': [badge_cuota_cache(float(c), False, bool(v)) for c, v in zip(df_valor['CUOTA'], df_valor['VALOR'])],
+        'PROB. MERCADO': render_porcentaje(df_valor['PROB']), 'EDGE': render_ventaja(df_valor['EDGE']),
+        'PROB. MODELO': render_porcentaje(df_valor['MODELO']), 'EDGE MODELO': render_ventaja(df_valor['EDGE_MODELO']),
+        'CASAS': df_valor['CASAS'],
+    })
+    return out.style.hide(axis="index").to_html(escape=False)
+
+
+def sparkline_svg(valores, ancho=90, alto=22):
+    # Serie de la cuota media: bajada (el mercado la respalda) en cian, subida en rojo
+    v = np.asarray(valores, dtype=float)
+    if len(v) < 2: return ""
+    lo, hi = v.min(), v.max()
+    x = np.linspace(1, ancho - 1, len(v))
+    y = alto - 1 - (v - lo) / (hi - lo) * (alto - 2) if hi > lo else np.full(len(v), alto / 2)
+    puntos = " ".join(f"{a:.1f},{b:.1f}" for a, b in zip(x, y))
+    color = "#1ed7de" if v[-1] <= v[0] else "#821f1f"
+    return f'<svg width="{ancho}" height="{alto}" viewBox="0 0 {ancho} {alto}"><polyline points="{puntos}" fill="none" stroke="{color}" stroke-width="1.5"/></svg>'
+
+
+def _cambio_cuota(apertura, actual):
+    if not (np.isfinite(apertura) and np.isfinite(actual)): return "---"
+    flecha = "▼" if actual < apertura else "▲" if actual > apertura else "="
+    return f"{apertura:.2f} → {actual:.2f} {flecha}"
+
+
+def html_movimiento(df_odds, mov):
+    # Apertura → cuota actual (media de las casas) y sparkline de cada resultado, en el orden de df_odds
+    mov = mov.set_index("ID").reindex(df_odds["ID"].astype(str))
+    out = pd.DataFrame({'FECHA': df_odds['FECHA'].to_numpy(),
+                        'PARTIDO': (df_odds['LOCAL'] + " vs " + df_odds['VISITANTE']).to_numpy()})
+    for r in ("1", "X", "2"):
+        series = [s if isinstance(s, np.ndarray) else np.array([]) for s in mov[f"SERIE_{r}"]]
+        out[r] = [_cambio_cuota(a, b) for a, b in zip(mov[f"APERTURA_{r}"].to_numpy(dtype=float), mov[f"ACTUAL_{r}"].to_numpy(dtype=float))]
+        out[f"SERIE {r}"] = [sparkline_svg(s) for s in series]
+    return out.style.hide(axis="index").to_html(escape=False)
+
+
+def html_cierre(df_cierre):
+    # CLV: cuánto mejor era la apertura que el cierre (positivo = entrar pronto pagaba más)
+    out = pd.DataFrame({'INICIO': df_cierre['INICIO'].dt.strftime('%d/%m %H:%M').to_numpy(),
+                        'PARTIDO': (df_cierre['LOCAL'] + " vs " + df_cierre['VISITANTE']).to_numpy()})
+    for r in ("1", "X", "2"):
+        out[r] = [_cambio_cuota(a, b) for a, b in zip(df_cierre[f"APERTURA_{r}"].to_numpy(dtype=float), df_cierre[f"CIERRE_{r}"].to_numpy(dtype=float))]
+        out[f"CLV {r}"] = render_ventaja(df_cierre[f"CLV_{r}"]).to_numpy()
+    return out.style.hide(axis="index").to_html(escape=False)
+
+
+def insertar_probabilidades(df, modelo):
+    # Fixture: probabilidades del modelo Poisson junto a cada cruce (sin tocar el DataFrame recibido)
+    df = df.copy(deep=False)
+    prob = modelo.partidos(df['LOCAL'], df['VISITANTE']).set_axis(df.index)
+    pos = df.columns.get_loc('VISITANTE') + 1
+    for col, nombre in reversed([("1", "1"), ("X", "X"), ("2", "2"), ("O2.5", "+2.5"), ("BTTS", "AMBOS MARCAN")]):
+        df.insert(pos, nombre, render_porcentaje(prob[col]))
+    return df
+
+
+def tarjeta_pick(row):
+    # Tarjeta de un top pick (vista de jugadores)
+    conf_vis = min(float(row['Score_Pick']), 100.0)
+
+    # ASIGNACIÓN DE COLORES ACTUALIZADA (SEMÁFORO)
+    fiab_str = str(row['Fiabilidad']).upper()
+    if "ALTA" in fiab_str:
+        color_f = "#39FF14" # Verde Neón para Alta
+    elif "MEDIA" in fiab_str:
+        color_f = "#FFFF00" # Amarillo Neón para Media
+    elif "BAJA" in fiab_str:
+        color_f = "#FF3131" # Rojo Neón para Baja
+    else:
+        color_f = "#9ca3af"
+
+    return f"""
+                                <div class="top-pick-card">
+                                    <div class="card-header">
+                                        <span class="card-fiabilidad" style="color:{color_f}; border-color:{color_f}77;">{row['Fiabilidad']}</span>
+                                        <span style="font-size:0.7rem; color:#9ca3af;">PROYECCIÓN POR PARTIDO</span>
+                                    </div>
+                                    <div class="card-name">{row['Jugador']}</div>
+                                    <div class="card-team">{row['Equipo']}</div>
+                                    <div class="card-stats-grid">
+                                        <div class="card-stat-item">
+                                            <span class="card-stat-val">{row['Faltas_90']:.2f}</span>
+                                            <span class="card-stat-lbl">Faltas</span>
+                                        </div>
+                                        <div class="card-stat-item">
+                                            <span class="card-stat-val">{row['Tiros_90']:.2f}</span>
+                                            <div style="display: flex; flex-direction: column; align-items: center; gap: 4px;">
+                                                <span class="icono-tiro"></span>
+                                                <span class="card-stat-lbl">Tiros</span>
+                                            </div>
+                                        </div>
+                                        <div class="card-stat-item">
+                                            <span class="card-stat-val" style="color:#b59410;">{conf_vis:.1f}%</span>
+                                            <span class="card-stat-lbl">Confianza</span>
+                                        </div>
+                                    </div>
+                                </div>
+                                """
+
+
+def html_cascada(traza):
+    # Cascada del rerun: una barra por tramo, desplazada según su inicio y anidada por nivel
+    total = max(traza.total or 0, 1e-9) * 1000
+    filas = ""
+    for t in sorted(traza.tramos, key=lambda t: t["inicio_ms"]):
+        color = "#821f1f" if t.get("cache") == "miss" or t.get("api") == "peticion" else "#1ed7de"
+        detalle = " · ".join(str(t[k]) for k in ("archivo", "cache", "api", "liga") if t.get(k))
+        izq, ancho = t["inicio_ms"] / total * 100, max(t["ms"] / total * 100, 0.3)
+        filas += f'<div style="display:flex; align-items:center; gap:10px; font-size:0.75rem; margin:3px 0;"><span style="width:320px; flex-shrink:0; padding-left:{t["nivel"] * 14}px; color:#e5e7eb; overflow:hidden; white-space:nowrap; text-overflow:ellipsis;">{t["nombre"]} <span style="color:#9ca3af;">{detalle}</span></span><div style="position:relative; flex:1; height:12px; background:#2d3139; border-radius:3px;"><div style="position:absolute; left:{izq:.2f}%; width:{ancho:.2f}%; height:100%; background:{color}; border-radius:3px;"></div></div><span style="width:80px; text-align:right; color:#9ca3af;">{t["ms"]:.1f} ms</span></div>'
+    return f'<div style="background:#161b22; padding:15px; border-radius:8px; border:1px solid #1ed7de44; margin-bottom:20px;"><div style="color:#1ed7de; font-weight:bold; margin-bottom:8px;">Rerun: {total:.1f} ms</div>{filas}</div>'
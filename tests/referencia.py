@@ -0,0 +1,75 @@
+import re
+
+import pandas as pd
+
+from config import TRADUCCIONES
+from datos import limpiar_nombre_equipo
+from render import formatear_last_5, formatear_xg_badge, html_barra_posesion
+
+# ────────────────────────────────────────────────
+# CAMINO ORIGINAL DE app.py (REFERENCIA PARA LAS PRUEBAS DE HTML)
+# ────────────────────────────────────────────────
+# cargar_excel y el pintado de clasificación / stats / fixture tal como estaban antes de separar datos y
+# presentación, leyendo el xlsx local en lugar de la URL. Diferencias buscadas: limpiar_nombre_equipo ya no
+# se come siglas como "Utd" (índice de equipos) y las filas de cabecera que fbref repite a mitad de la tabla
+# de la Champions ("Squad", "Playing Time") ya no se pintan.
+
+
+def cargar_excel(ruta_local, tipo="general"):
+    df = pd.read_excel(ruta_local)
+    if 'Home' in df.columns and 'Away' in df.columns:
+        df = df.dropna(subset=['Home', 'Away'], how='all')
+    if tipo == "stats":
+        if 'Squad' in df.columns:
+            df['Squad'] = df['Squad'].apply(limpiar_nombre_equipo)
+        if len(df.columns) >= 17:
+            df = df.rename(columns={df.columns[16]: 'xG'})
+        df['xG_val'] = df['xG'].fillna(0)
+        if 'Poss' in df.columns:
+            df['Poss_num'] = df['Poss'].apply(lambda x: re.findall(r"\d+", str(x))[0] if re.findall(r"\d+", str(x)) else "0")
+            df['Poss'] = df['Poss'].apply(html_barra_posesion)
+        if 'xG' in df.columns: df['xG'] = df['xG'].apply(formatear_xg_badge)
+        cols_ok = ['Squad', 'MP', 'Poss', 'Poss_num', 'Gls', 'Ast', 'CrdY', 'CrdR', 'xG', 'xG_val']
+        df = df[[c for c in cols_ok if c in df.columns]]
+        df = df.rename(columns=TRADUCCIONES)
+    elif tipo == "clasificacion":
+        if 'Squad' in df.columns:
+            df['Squad'] = df['Squad'].apply(limpiar_nombre_equipo)
+        drop_c = ['Notes', 'Goalkeeper', 'Top Team Scorer', 'Attendance', 'Pts/MP', 'Pts/PJ']
+        df = df.drop(columns=[c for c in drop_c if c in df.columns])
+        df = df.rename(columns=TRADUCCIONES)
+        if 'EQUIPO' in df.columns:
+            df = df[df['EQUIPO'] != ""]
+        cols = list(df.columns)
+        if 'EQUIPO' in cols and 'PTS' in cols:
+            cols.remove('PTS')
+            idx = cols.index('EQUIPO')
+            cols.insert(idx + 1, 'PTS')
+            df = df[cols]
+    elif tipo == "fixture":
+        drop_f = ['Round', 'Day', 'Score', 'Referee', 'Match Report', 'Notes', 'Attendance', 'Wk']
+        df = df.drop(columns=[c for c in drop_f if c in df.columns])
+        df = df.rename(columns=TRADUCCIONES)
+        if 'LOCAL' in df.columns:
+            df['LOCAL'] = df['LOCAL'].apply(limpiar_nombre_equipo)
+        if 'VISITANTE' in df.columns:
+            df['VISITANTE'] = df['VISITANTE'].apply(limpiar_nombre_equipo)
+        df = df[df['LOCAL'] != ""]
+        if 'FECHA' in df.columns:
+            df['FECHA'] = df['FECHA'].apply(lambda x: str(x).split(' ')[0] if pd.notna(x) else "TBD")
+        if 'HORA' in df.columns:
+            df['HORA'] = df['HORA'].fillna("Por definir")
+    df = df.dropna(how='all').reset_index(drop=True)
+    if 'EQUIPO' in df.columns:
+        df = df[(df['EQUIPO'] != "") & (df['EQUIPO'] != 'Squad')].reset_index(drop=True)
+    return df
+
+
+def html_vista(df):
+    # Rama de clasificación / stats / fixture sin filtro
+    if 'ÚLTIMOS 5' in df.columns: df['ÚLTIMOS 5'] = df['ÚLTIMOS 5'].apply(formatear_last_5)
+    cols_to_drop = ['xG_val', 'Poss_num']
+    df_view = df.drop(columns=[c for c in cols_to_drop if c in df.columns])
+    styler = df_view.style.hide(axis="index")
+    if 'PTS' in df_view.columns: styler = styler.set_properties(subset=['PTS'], **{'background-color': '#1ed7de22', 'font-weight': 'bold', 'color': '#1ed7de'})
+    return styler.to_html(escape=False)
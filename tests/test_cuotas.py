@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+
+import cuotas
+import historial
+from herramientas.servidor_odds_falso import ServidorOddsFalso
+
+CLAVE = "clave-buena"
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    # Odds API falsa y cliente sin nada en caché; el historial va a un SQLite temporal
+    srv = ServidorOddsFalso(n_partidos=3, clave=CLAVE).iniciar()
+    monkeypatch.setattr(cuotas, "ODDS_URL", srv.url)
+    monkeypatch.setattr(cuotas, "segundo_plano", False)
+    monkeypatch.setattr(cuotas, "_cache", {})
+    monkeypatch.setattr(cuotas, "_accesos", {})
+    monkeypatch.setattr(cuotas, "cuota_api", {"restantes": None, "usados": None, "ultimo_coste": None, "actualizado": None})
+    monkeypatch.setattr(cuotas, "contadores", {"peticiones": 0, "aciertos_cache": 0, "errores": 0, "errores_historial": 0})
+    monkeypatch.setattr(historial, "RUTA", str(tmp_path / "historial.sqlite"))
+    yield srv
+    srv.detener()
+
+
+def test_peticiones_simultaneas_se_agrupan(api):
+    api.retraso = 0.3
+    resultados = []
+    hilos = [threading.Thread(target=lambda: resultados.append(cuotas.obtener("soccer_epl", CLAVE))) for _ in range(8)]
+    for h in hilos: h.start()
+    for h in hilos: h.join()
+    assert len(api.peticiones) == 1
+    assert len(resultados) == 8 and all(r is resultados[0] for r in resultados)
+    assert cuotas.contadores["aciertos_cache"] == 7
+
+
+def test_ttl(api):
+    primera = cuotas.obtener("soccer_epl", CLAVE)
+    assert cuotas.obtener("soccer_epl", CLAVE) is primera
+    assert len(api.peticiones) == 1
+    cuotas.obtener("soccer_epl", CLAVE, ttl=0)
+    assert len(api.peticiones) == 2
+
+
+def test_obtener_varias(api):
+    api.retraso = 0.2
+    out = cuotas.obtener_varias(["soccer_epl", "soccer_spain_la_liga", "soccer_epl", None], CLAVE)
+    assert set(out) == {"soccer_epl", "soccer_spain_la_liga"}
+    assert len(api.peticiones) == 2
+
+
+def test_cuota_minima(api):
+    api.creditos = cuotas.CUOTA_MINIMA + 1
+    datos = cuotas.obtener("soccer_epl", CLAVE)
+    assert cuotas.cuota_api["restantes"] == cuotas.CUOTA_MINIMA
+    assert cuotas.cuota_agotada()
+    # Con la cuota al mínimo se sirve la copia guardada aunque haya caducado
+    assert cuotas.obtener("soccer_epl", CLAVE, ttl=0) is datos
+    assert len(api.peticiones) == 1
+    # Sin copia guardada se sigue pidiendo
+    assert cuotas.obtener("soccer_spain_la_liga", CLAVE) is not None
+    assert len(api.peticiones) == 2
+
+
+def test_429_sin_creditos(api):
+    api.creditos = 0
+    assert cuotas.obtener("soccer_epl", CLAVE) is None
+    assert cuotas.cuota_api["restantes"] == 0
+    assert cuotas.contadores["errores"] == 1
+
+
+def test_401_clave_invalida(api):
+    assert cuotas.obtener("soccer_epl", "otra") is None
+    assert cuotas.contadores["errores"] == 1
+    # Un error con copia guardada devuelve la copia
+    datos = cuotas.obtener("soccer_epl", CLAVE)
+    assert cuotas.obtener("soccer_epl", "otra", ttl=0) is datos
+    assert cuotas.contadores["errores"] == 2
+
+
+def test_timeout(api, monkeypatch):
+    datos = cuotas.obtener("soccer_epl", CLAVE)
+    monkeypatch.setattr(cuotas, "TIMEOUT", 0.05)
+    api.retraso = 0.5
+    assert cuotas.obtener("soccer_epl", CLAVE, ttl=0) is datos
+    assert cuotas.obtener("soccer_spain_la_liga", CLAVE) is None
+    assert cuotas.contadores["errores"] == 2
+
+
+def test_sin_clave_no_pide(api):
+    assert cuotas.obtener("soccer_epl", None) is None
+    assert cuotas.obtener(None, CLAVE) is None
+    assert api.peticiones == []
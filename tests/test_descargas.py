@@ -0,0 +1,83 @@
+import os
+import time
+
+import pytest
+import requests
+
+import descargas
+from herramientas.servidor_datos_falso import ServidorDatosFalso
+
+
+@pytest.fixture
+def origen(tmp_path, monkeypatch):
+    # GitHub falso sobre una carpeta temporal y caché en disco vacía
+    carpeta = tmp_path / "origen"
+    (carpeta / "Estadisticas_Jugadores").mkdir(parents=True)
+    (carpeta / "CLASIFICACION_LIGA_X.xlsx").write_bytes(b"v1")
+    srv = ServidorDatosFalso(str(carpeta)).iniciar()
+    monkeypatch.setattr(descargas, "BASE_URL", srv.url)
+    monkeypatch.setattr(descargas, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(descargas, "DATOS_DIR", None)
+    monkeypatch.setattr(descargas, "segundo_plano", False)
+    monkeypatch.setattr(descargas, "_estado", {})
+    yield carpeta, srv
+    srv.detener()
+
+
+def test_etag_y_304(origen):
+    carpeta, srv = origen
+    version, ruta = descargas.revalidar("CLASIFICACION_LIGA_X.xlsx")
+    with open(ruta, "rb") as f:
+        assert f.read() == b"v1"
+    # Dentro del TTL no se pregunta al origen
+    assert descargas.revalidar("CLASIFICACION_LIGA_X.xlsx") == (version, ruta)
+    assert srv.resumen() == {200: 1}
+    # Forzada y sin cambios: petición condicional con 304 y misma versión
+    assert descargas.revalidar("CLASIFICACION_LIGA_X.xlsx", forzar=True) == (version, ruta)
+    assert srv.resumen() == {200: 1, 304: 1}
+    (carpeta / "CLASIFICACION_LIGA_X.xlsx").write_bytes(b"v2")
+    nueva, ruta = descargas.revalidar("CLASIFICACION_LIGA_X.xlsx", forzar=True)
+    assert nueva != version
+    with open(ruta, "rb") as f:
+        assert f.read() == b"v2"
+
+
+def test_404_recordado_hasta_ttl(origen, monkeypatch):
+    _, srv = origen
+    with pytest.raises(requests.HTTPError):
+        descargas.revalidar("SUPER_STATS_Y.xlsx")
+    with pytest.raises(FileNotFoundError):
+        descargas.revalidar("SUPER_STATS_Y.xlsx")
+    assert srv.resumen() == {404: 1}
+    assert srv.peticiones[0][0].endswith("/Estadisticas_Jugadores/SUPER_STATS_Y.xlsx")
+    # Pasado el TTL se vuelve a preguntar
+    monkeypatch.setattr(descargas, "TTL_REVALIDACION", 0)
+    with pytest.raises(requests.HTTPError):
+        descargas.revalidar("SUPER_STATS_Y.xlsx")
+    assert srv.resumen() == {404: 2}
+
+
+def test_sin_red_sirve_ultima_copia(origen, monkeypatch):
+    _, srv = origen
+    version, ruta = descargas.revalidar("CLASIFICACION_LIGA_X.xlsx")
+    srv.detener()
+    monkeypatch.setattr(descargas, "_estado", {})
+    assert descargas.revalidar("CLASIFICACION_LIGA_X.xlsx", forzar=True) == (version, ruta)
+    # Sin copia previa el error llega al llamador
+    with pytest.raises(requests.RequestException):
+        descargas.revalidar("CARTELERA_PROXIMOS_X.xlsx")
+
+
+def test_version_local(tmp_path, monkeypatch):
+    (tmp_path / "Estadisticas_Jugadores").mkdir()
+    archivo = tmp_path / "Estadisticas_Jugadores" / "SUPER_STATS_X.xlsx"
+    archivo.write_bytes(b"abc")
+    monkeypatch.setattr(descargas, "DATOS_DIR", str(tmp_path))
+    version, ruta = descargas._version_local("SUPER_STATS_X.xlsx")
+    assert ruta == str(archivo)
+    assert descargas.revalidar("SUPER_STATS_X.xlsx") == (version, ruta)
+    archivo.write_bytes(b"abcd")
+    os.utime(archivo, ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+    assert descargas._version_local("SUPER_STATS_X.xlsx")[0] != version
+    with pytest.raises(FileNotFoundError):
+        descargas._version_local("NO_EXISTE.xlsx")
@@ -0,0 +1,63 @@
+import copy
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import historial
+from cuotas import aplanar
+from herramientas.servidor_odds_falso import generar_partidos
+
+SPORT = "soccer_prueba"
+ANTES = datetime(2025, 12, 31, tzinfo=timezone.utc).timestamp()    # el primer partido empieza el 01/01/2026
+
+
+@pytest.fixture
+def ruta(tmp_path, monkeypatch):
+    monkeypatch.setattr(historial, "RUTA", str(tmp_path / "historial.sqlite"))
+    return historial.RUTA
+
+
+def _media(data, partido, nombre):
+    return np.mean([o["price"] for bk in data[partido]["bookmakers"] for o in bk["markets"][0]["outcomes"] if o["name"] == nombre])
+
+
+def test_guardar_movimiento_cierre_capturas(ruta):
+    apertura = generar_partidos(3, n_casas=4)
+    actual = copy.deepcopy(apertura)
+    for o in actual[0]["bookmakers"][0]["markets"][0]["outcomes"]:
+        o["price"] = round(o["price"] + 0.5, 2)
+
+    assert historial.guardar(SPORT, *aplanar(apertura), instante=ANTES) == 3 * 4 * 3
+    # Solo se guardan los precios que cambian
+    assert historial.guardar(SPORT, *aplanar(actual), instante=ANTES + 60) == 3
+    assert historial.guardar(SPORT, *aplanar(actual), instante=ANTES + 120) == 0
+
+    caps = historial.capturas(SPORT)
+    assert list(caps.columns) == ["sport_key", "ts", "partidos", "cambios"]
+    assert caps["cambios"].tolist() == [36, 3, 0]
+    assert caps["ts"].is_monotonic_increasing
+
+    ids = [p["id"] for p in apertura]
+    mov = historial.movimiento(SPORT, ids)
+    local = apertura[0]["home_team"]
+    assert mov.loc[0, "APERTURA_1"] == pytest.approx(_media(apertura, 0, local))
+    assert mov.loc[0, "ACTUAL_1"] == pytest.approx(_media(actual, 0, local))
+    assert len(mov.loc[0, "SERIE_1"]) == 2
+    # Un partido sin cambios: apertura = actual y serie de un punto
+    assert mov.loc[1, "APERTURA_X"] == mov.loc[1, "ACTUAL_X"]
+    assert len(mov.loc[1, "SERIE_X"]) == 1
+
+    cierre = historial.cierre(SPORT, ahora=pd.Timestamp("2026-02-01", tz="UTC"))
+    assert set(cierre["ID"]) == set(ids)
+    fila = cierre.set_index("ID").loc[ids[0]]
+    assert fila["CIERRE_1"] == pytest.approx(_media(actual, 0, local))
+    assert fila["CLV_1"] == pytest.approx(fila["APERTURA_1"] / fila["CIERRE_1"] - 1)
+    # Antes del primer inicio no hay nada cerrado
+    assert historial.cierre(SPORT, ahora=pd.Timestamp("2025-12-31", tz="UTC")) is None
+
+
+def test_capturas_vacio(ruta):
+    assert historial.capturas().empty
+    assert historial.movimiento(SPORT, ["x"])["APERTURA_1"].isna().all()
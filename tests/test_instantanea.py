@@ -0,0 +1,50 @@
+import pytest
+
+import descargas
+import instantanea
+from herramientas.servidor_datos_falso import ServidorDatosFalso
+
+ARCHIVO = "CLASIFICACION_LIGA_X.xlsx"
+
+
+@pytest.fixture
+def origen(tmp_path, monkeypatch):
+    # GitHub falso con un xlsx y un manifiesto compilado a partir de él
+    carpeta = tmp_path / "origen"
+    carpeta.mkdir()
+    (carpeta / ARCHIVO).write_bytes(b"v1")
+    srv = ServidorDatosFalso(str(carpeta)).iniciar()
+    monkeypatch.setattr(descargas, "BASE_URL", srv.url)
+    monkeypatch.setattr(descargas, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(descargas, "DATOS_DIR", None)
+    monkeypatch.setattr(descargas, "segundo_plano", False)
+    monkeypatch.setattr(descargas, "_estado", {})
+    entrada = {"tabla": "t.arrow", "tipo": "clasificacion", "origen": instantanea.huella(carpeta / ARCHIVO)}
+    monkeypatch.setattr(instantanea, "manifiesto", lambda: {"tablas": {ARCHIVO: entrada}})
+    yield carpeta, srv, entrada
+    srv.detener()
+
+
+def test_remoto_tabla_al_dia(origen):
+    _, _, entrada = origen
+    assert instantanea._entrada(ARCHIVO, "clasificacion") == entrada
+    assert instantanea._entrada(ARCHIVO, "stats") is None
+
+
+def test_remoto_xlsx_mas_nuevo_que_la_tabla(origen):
+    carpeta, srv, _ = origen
+    assert instantanea._entrada(ARCHIVO, "clasificacion") is not None
+    # Excel publicado sin recompilar la instantánea: en la siguiente revalidación se vuelve al xlsx
+    (carpeta / ARCHIVO).write_bytes(b"v2")
+    descargas.revalidar(ARCHIVO, forzar=True)
+    assert instantanea._entrada(ARCHIVO, "clasificacion") is None
+    assert srv.resumen() == {200: 2}
+
+
+def test_local_compara_el_hash(origen, monkeypatch):
+    carpeta, _, entrada = origen
+    monkeypatch.setattr(descargas, "DATOS_DIR", str(carpeta))
+    assert instantanea._entrada(ARCHIVO, "clasificacion") == entrada
+    (carpeta / ARCHIVO).write_bytes(b"v2 local")
+    monkeypatch.setattr(descargas, "_estado", {})
+    assert instantanea._entrada(ARCHIVO, "clasificacion") is None
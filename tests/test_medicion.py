@@ -0,0 +1,29 @@
+import json
+import logging
+
+import medicion
+
+
+def test_fragmento_solo_abre_su_traza(caplog):
+    cerradas = []
+
+    @medicion.medido("fragmento:prueba", cerradas.append)
+    def panel():
+        with medicion.tramo("to_html:prueba"):
+            return 1
+
+    # Rerun solo del fragmento: sin traza del script, el fragmento abre la suya, la registra y la cierra
+    with caplog.at_level(logging.INFO, logger=medicion.log.name):
+        assert panel() == 1
+    assert len(cerradas) == 1 and cerradas[0].meta == {"fragmento": "fragmento:prueba"}
+    assert [t["nombre"] for t in cerradas[0].tramos] == ["to_html:prueba", "fragmento:prueba"]
+    linea = json.loads(caplog.records[-1].getMessage())
+    assert linea["fragmento"] == "fragmento:prueba" and len(linea["tramos"]) == 2
+    assert medicion._traza.get() is None
+
+    # Dentro de un rerun completo el fragmento es un tramo más de la traza del script
+    traza = medicion.iniciar_traza()
+    assert panel() == 1
+    medicion.cerrar_traza(traza)
+    assert len(cerradas) == 1
+    assert [t["nombre"] for t in traza.tramos] == ["to_html:prueba", "fragmento:prueba"]
@@ -0,0 +1,75 @@
+import os
+import re
+from collections import OrderedDict
+
+import pytest
+
+import paginas
+from config import LIGAS_LISTA
+
+DATOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "datos_fbref")
+
+
+@pytest.fixture
+def carpeta(tmp_path, monkeypatch):
+    monkeypatch.setattr(paginas, "_memoria", OrderedDict())
+    return str(tmp_path)
+
+
+def test_memoria_lru(carpeta, monkeypatch):
+    monkeypatch.setattr(paginas, "MAX_MEMORIA", 2)
+    a, b, c = (paginas.clave("La Liga", v, [1]) for v in ("clas", "stats", "fix"))
+    paginas.guardar(a, {"tabla": "a"}, carpeta)
+    paginas.guardar(b, {"tabla": "b"}, carpeta)
+    assert paginas.leer(a, carpeta) == {"tabla": "a"}      # a pasa a ser la más reciente
+    paginas.guardar(c, {"tabla": "c"}, carpeta)
+    assert list(paginas._memoria) == [a, c]
+    # b sigue en disco
+    assert paginas.leer(b, carpeta) == {"tabla": "b"}
+    assert list(paginas._memoria) == [c, b]
+
+
+def test_version_nueva_borra_las_anteriores(carpeta):
+    vieja, nueva = paginas.clave("La Liga", "clas", [1]), paginas.clave("La Liga", "clas", [2])
+    otra_vista, otra_liga = paginas.clave("La Liga", "stats", [1]), paginas.clave("Serie A", "clas", [1])
+    for c in (vieja, otra_vista, otra_liga):
+        paginas.guardar(c, {"tabla": c}, carpeta)
+    paginas.guardar(nueva, {"tabla": nueva}, carpeta)
+    assert sorted(os.listdir(carpeta)) == sorted(f"{c}.json" for c in (nueva, otra_vista, otra_liga))
+    assert vieja not in paginas._memoria
+    assert paginas.leer(vieja, carpeta) is None
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch, carpeta):
+    # La app sobre el checkout local, sin refresco en segundo plano y con las páginas en una carpeta vacía
+    from streamlit.testing.v1 import AppTest
+    import descargas
+    monkeypatch.setenv("INSIDEBET_REFRESCO", "0")
+    monkeypatch.setattr(descargas, "DATOS_DIR", DATOS)
+    monkeypatch.setattr(descargas, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(descargas, "segundo_plano", False)
+    monkeypatch.setattr(descargas, "_estado", {})
+    monkeypatch.setattr(paginas, "CARPETA", os.path.join(carpeta, "paginas"))
+    at = AppTest.from_file(os.path.join(os.path.dirname(DATOS), "app.py"), default_timeout=120)
+    at.run()
+    return at
+
+
+def _html_vista(at, liga, vista):
+    at.session_state.liga_sel, at.session_state.vista_activa = liga, vista
+    at.run()
+    assert not at.exception
+    return [re.sub(r"T_[0-9a-f]{5}", "T_x", m.value) for m in at.markdown if "<table" in m.value or "top-pick-card" in m.value]
+
+
+@pytest.mark.parametrize("liga", LIGAS_LISTA)
+def test_pagina_igual_que_la_vista_en_vivo(app, liga, monkeypatch):
+    # Cada vista servida desde paginas.construir pinta el mismo HTML que la vista generada en la sesión
+    prerenderizadas = {v: _html_vista(app, liga, v) for v in paginas.VISTAS}
+    # Sin SUPER_STATS (Champions) no hay página de jugadores
+    assert len(os.listdir(paginas.CARPETA)) >= len(paginas.VISTAS) - 1
+    monkeypatch.setattr(paginas, "obtener", lambda *args, **kwargs: None)
+    for vista in paginas.VISTAS:
+        en_vivo = _html_vista(app, liga, vista)
+        assert en_vivo and prerenderizadas[vista] == en_vivo, vista
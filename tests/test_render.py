@@ -0,0 +1,66 @@
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import MAPEO_ARCHIVOS
+import datos
+import referencia
+import render
+
+DATOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "datos_fbref")
+
+
+def _leer(archivo, tipo):
+    return datos.leer(os.path.join(DATOS, archivo), tipo)
+
+
+def _sin_id(html):
+    return re.sub(r"T_[0-9a-f]{5}", "T_x", html)
+
+
+@pytest.mark.parametrize("liga", ["La_Liga", "Champions_League"])
+def test_diferencia_de_goles_como_el_origen(liga, monkeypatch):
+    # Las ligas publican la DG como número ("34") y la Champions como texto con signo ("+19"):
+    # la capa de datos la guarda numérica y la clasificación se pinta igual que antes
+    monkeypatch.setattr(render.recursos, "manifiesto", lambda: None)
+    archivo = f"CLASIFICACION_LIGA_{liga}.xlsx"
+    df = _leer(archivo, "clasificacion")
+    assert pd.api.types.is_numeric_dtype(df['DG'])
+    html = render.html_tabla(df)
+    assert "DG_SIGNO" not in html
+    assert _sin_id(html) == _sin_id(referencia.html_vista(referencia.cargar_excel(os.path.join(DATOS, archivo), "clasificacion")))
+    assert render.render_diferencia(pd.Series([19, -3, 0, None]), [True, False, False, False]).tolist() == ["+19", "-3", "0", ""]
+    assert render.render_diferencia(pd.Series([34, -4]), [False, False]).tolist() == ["34", "-4"]
+
+
+@pytest.mark.parametrize("prefijo, tipo", [
+    ("CLASIFICACION_LIGA_", "clasificacion"), ("RESUMEN_STATS_", "stats"), ("CARTELERA_PROXIMOS_", "fixture"),
+])
+@pytest.mark.parametrize("liga", list(MAPEO_ARCHIVOS.values()))
+def test_html_tabla_igual_que_el_original(liga, prefijo, tipo, monkeypatch):
+    # Sin recursos compilados (sin escudos) el HTML debe ser idéntico byte a byte al del cargar_excel
+    # original con las funciones de formato aplicadas celda a celda, salvo el id del Styler
+    monkeypatch.setattr(render.recursos, "manifiesto", lambda: None)
+    ruta = os.path.join(DATOS, f"{prefijo}{liga}.xlsx")
+    esperado = referencia.html_vista(referencia.cargar_excel(ruta, tipo))
+    assert _sin_id(render.html_tabla(datos.leer(ruta, tipo))) == _sin_id(esperado)
+
+
+def test_tendencia_sin_modelo():
+    # Picks & Cuotas sin modelo de goles (p. ej. sin clasificación): la tendencia queda en "---"
+    from cuotas import procesar_cuotas
+    from herramientas.servidor_odds_falso import generar_partidos
+    equipos = _leer("CLASIFICACION_LIGA_La_Liga.xlsx", "clasificacion")['EQUIPO'].tolist()
+    df_odds = procesar_cuotas(generar_partidos(4, equipos), None)
+    assert df_odds is not None and len(df_odds) == 4
+    df_odds['TENDENCIA'] = render.render_tendencia(np.full(len(df_odds), np.nan))
+    assert list(df_odds['TENDENCIA']) == ["---"] * 4
+    assert "---" in render.html_cuotas(df_odds)
+
+
+def test_tendencia_con_modelo():
+    tendencia = render.render_tendencia(pd.Series([0.7, 0.2, None]))
+    assert list(tendencia) == ["🔥 Over 70%", "🛡️ Under 80%", "---"]